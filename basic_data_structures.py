@@ -1,10 +1,23 @@
+import sys
+import time
+
 from controllers import StructureController
-from views import main_menu_view, add_value_view, invalid_selection_view, remove_value_view, move_value_view
+from views import main_menu_view, add_value_view, invalid_selection_view, remove_value_view, move_value_view, \
+    batch_summary_view, path_view
 
 if __name__ == '__main__':
 
     controller = StructureController()
 
+    # Batch mode: python basic_data_structures.py <commands file, or - for stdin>
+    if len(sys.argv) > 1:
+        commands = sys.stdin if sys.argv[1] == '-' else open(sys.argv[1])
+        with commands:
+            start = time.perf_counter()
+            operations = controller.run_batch(commands)
+            batch_summary_view(operations, time.perf_counter() - start)
+        sys.exit()
+
     while True:
         user_selection = main_menu_view()
         if controller.is_selection_valid(user_selection):
@@ -15,6 +28,8 @@ if __name__ == '__main__':
                 controller.main_menu_selection(user_selection, extra_value=remove_value_view())
             elif user_selection in (9, 10, ):
                 controller.main_menu_selection(user_selection, extra_value=move_value_view())
+            elif user_selection in (16, 17, ):
+                controller.main_menu_selection(user_selection, extra_value=path_view())
             else:
                 controller.main_menu_selection(user_selection)
         else:
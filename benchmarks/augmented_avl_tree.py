@@ -0,0 +1,30 @@
+import random
+import sys
+import time
+
+from models.augmented_avl_tree import AugmentedAVLTree, SUM
+
+
+def sum_by_traversal(tree, low, high):
+    return sum(value for value in tree if low <= value <= high)
+
+
+def main(size, queries):
+    values = random.sample(range(size * 10), size)
+    tree = AugmentedAVLTree.from_iterable(values, SUM)
+    ranges = []
+    for _ in range(queries):
+        low = random.randrange(size * 10)
+        ranges.append((low, low + random.randrange(size * 5)))
+
+    print('Range sums over ' + str(size) + ' keys, ' + str(queries) + ' queries')
+    for name, query in (('traversal', lambda low, high: sum_by_traversal(tree, low, high)),
+                        ('aggregate', tree.aggregate)):
+        start = time.perf_counter()
+        for low, high in ranges:
+            query(low, high)
+        print('{:<12}{:>10.4f} s'.format(name, time.perf_counter() - start))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000, int(sys.argv[2]) if len(sys.argv) > 2 else 100)
@@ -0,0 +1,33 @@
+import random
+import sys
+import timeit
+
+from models.avl_tree import AVLTree
+
+
+def build_incremental(values):
+    tree = AVLTree()
+    for value in values:
+        tree.add_element(value)
+    return tree
+
+
+def main(size):
+    values = random.sample(range(size * 10), size)
+    ordered = sorted(values)
+
+    timings = [
+        ('add_element (random)', lambda: build_incremental(values)),
+        ('add_element (sorted)', lambda: build_incremental(ordered)),
+        ('from_iterable', lambda: AVLTree.from_iterable(values)),
+        ('from_sorted', lambda: AVLTree.from_sorted(ordered)),
+    ]
+
+    print('AVLTree construction, ' + str(size) + ' keys')
+    for name, function in timings:
+        seconds = min(timeit.repeat(function, number=1, repeat=3))
+        print('{:<24}{:>10.4f} s'.format(name, seconds))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,38 @@
+import random
+import sys
+import time
+
+from models.avl_tree import AVLTree
+
+
+def trees(size, other_size):
+    first = AVLTree.from_iterable(random.sample(range(size * 4), size))
+    second = AVLTree.from_iterable(random.sample(range(size * 4), other_size))
+    return first, second
+
+
+def merge_by_insertion(first, second):
+    for value in second:
+        first.add_element(value)
+
+
+def timed(name, operation, size, other_size):
+    first, second = trees(size, other_size)
+    start = time.perf_counter()
+    operation(first, second)
+    print('{:<28}{:>10.4f} s'.format(name, time.perf_counter() - start))
+
+
+def main(size, processes):
+    for other_size in (size // 1000, size // 10, size):
+        print('AVLTree set operations, ' + str(size) + ' x ' + str(other_size) + ' keys')
+        timed('add_element per key', merge_by_insertion, size, other_size)
+        timed('union', AVLTree.union, size, other_size)
+        timed('intersection', AVLTree.intersection, size, other_size)
+        timed('difference', AVLTree.difference, size, other_size)
+        timed('parallel_union (' + str(processes) + ' procs)',
+              lambda first, second: first.parallel_union(second, processes), size, other_size)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000, int(sys.argv[2]) if len(sys.argv) > 2 else 4)
@@ -0,0 +1,40 @@
+import random
+import sys
+import time
+
+from models.b_plus_tree import BPlusTree
+
+
+def timed(name, function):
+    start = time.perf_counter()
+    function()
+    print('{:<28}{:>10.4f} s'.format(name, time.perf_counter() - start))
+
+
+def main(size, degree):
+    keys = random.sample(range(size * 10), size)
+    pairs = sorted((key, str(key)) for key in keys)
+    starts = [random.randrange(size * 10) for _ in range(1000)]
+    tree = BPlusTree.bulkload(pairs, degree)
+
+    def insert_all():
+        incremental = BPlusTree(degree)
+        for key in keys:
+            incremental.insert(key, str(key))
+
+    def scan(reverse):
+        for start in starts:
+            pairs_from_start = tree.irange(None, start, True) if reverse else tree.irange(start)
+            for _ in zip(range(100), pairs_from_start):
+                pass
+
+    print('BPlusTree(' + str(degree) + '), ' + str(size) + ' pairs')
+    timed('insert per pair', insert_all)
+    timed('bulkload', lambda: BPlusTree.bulkload(pairs, degree))
+    timed('get per key', lambda: [tree.get(key) for key in keys])
+    timed('1000 forward scans of 100', lambda: scan(False))
+    timed('1000 reverse scans of 100', lambda: scan(True))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000, int(sys.argv[2]) if len(sys.argv) > 2 else 32)
@@ -0,0 +1,47 @@
+import random
+import sys
+import time
+
+from models.b_tree import BTree
+
+
+# Keys of a batch land close together, like appends with a few late arrivals.
+def nearly_sorted_batch(base, batch_size):
+    batch = list(range(base, base + batch_size * 2, 2))
+    for _ in range(batch_size // 20):
+        i, j = random.randrange(batch_size), random.randrange(batch_size)
+        batch[i], batch[j] = batch[j], batch[i]
+    return batch
+
+
+def main(size, batch_size):
+    batches = [nearly_sorted_batch(random.randrange(size * 2), batch_size) for _ in range(size // batch_size)]
+
+    print(str(len(batches)) + ' nearly sorted batches of ' + str(batch_size) + ' keys')
+    for degree in (4, 32):
+        trees = []
+        for name in ('insert', 'insert_many'):
+            tree = BTree(degree)
+            start = time.perf_counter()
+            for batch in batches:
+                if name == 'insert':
+                    for key in batch:
+                        tree.insert(key)
+                else:
+                    tree.insert_many(batch)
+            print('{:<24}{:>10.4f} s'.format(name + ' (degree ' + str(degree) + ')', time.perf_counter() - start))
+            trees.append(tree)
+
+        for name, tree in zip(('discard', 'remove_many'), trees):
+            start = time.perf_counter()
+            for batch in batches:
+                if name == 'discard':
+                    for key in batch:
+                        tree.discard(key)
+                else:
+                    tree.remove_many(batch)
+            print('{:<24}{:>10.4f} s'.format(name + ' (degree ' + str(degree) + ')', time.perf_counter() - start))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000, int(sys.argv[2]) if len(sys.argv) > 2 else 1000)
@@ -0,0 +1,24 @@
+import sys
+import time
+
+from models.b_tree import BTree
+
+
+def main(size, degree):
+    keys = range(0, size * 2, 2)
+    print('BTree(' + str(degree) + ') construction, ' + str(size) + ' sorted keys')
+
+    start = time.perf_counter()
+    BTree(degree, keys)
+    print('{:<24}{:>10.4f} s'.format('insert per key', time.perf_counter() - start))
+
+    for fill_factor in (1.0, 0.75, 0.5):
+        start = time.perf_counter()
+        tree = BTree.bulkload(keys, degree, fill_factor)
+        seconds = time.perf_counter() - start
+        tree.check_structure()
+        print('{:<24}{:>10.4f} s'.format('bulkload (fill ' + str(fill_factor) + ')', seconds))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000, int(sys.argv[2]) if len(sys.argv) > 2 else 32)
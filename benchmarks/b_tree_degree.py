@@ -0,0 +1,58 @@
+import random
+import sys
+import time
+
+from models.b_tree import BTree
+
+
+# The search BTree.Node used before switching to bisect, kept for comparison.
+def linear_search(self, obj):
+    keys = self.keys
+    i = 0
+    while i < len(keys):
+        if obj == keys[i]:
+            return (True, i)
+        elif obj > keys[i]:
+            i += 1
+        else:
+            break
+    return (False, i)
+
+
+def throughput(degree, keys):
+    start = time.perf_counter()
+    tree = BTree(degree)
+    for key in keys:
+        tree.insert(key)
+    inserts = len(keys) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for key in keys:
+        key in tree
+    lookups = len(keys) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for key in keys:
+        tree.remove(key)
+    removes = len(keys) / (time.perf_counter() - start)
+
+    return inserts, lookups, removes
+
+
+def main(size):
+    keys = random.sample(range(size * 10), size)
+    bisect_search = BTree.Node.search
+
+    for name, search in (('linear search', linear_search), ('binary search', bisect_search)):
+        BTree.Node.search = search
+        print(name + ', ' + str(size) + ' random keys (ops/sec)')
+        print('{:>8}{:>14}{:>14}{:>14}'.format('degree', 'insert', 'lookup', 'remove'))
+        for degree in (2, 4, 8, 16, 32, 64, 128, 256, 512):
+            print('{:>8}{:>14.0f}{:>14.0f}{:>14.0f}'.format(degree, *throughput(degree, keys)))
+        print()
+
+    BTree.Node.search = bisect_search
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,37 @@
+import itertools
+import random
+import sys
+import time
+
+from models.b_tree import BTree
+
+
+def main(size, queries):
+    tree = BTree.bulkload(range(size), 32)
+    positions = [random.randrange(size) for _ in range(queries)]
+    ranges = [sorted((random.randrange(size), random.randrange(size))) for _ in range(queries)]
+
+    print(str(queries) + ' queries on a ' + str(size) + '-key BTree')
+    start = time.perf_counter()
+    for index in positions:
+        next(itertools.islice(tree, index, None))
+    print('{:<24}{:>10.4f} s'.format('select by iteration', time.perf_counter() - start))
+
+    start = time.perf_counter()
+    for index in positions:
+        tree[index]
+    print('{:<24}{:>10.4f} s'.format('select', time.perf_counter() - start))
+
+    start = time.perf_counter()
+    for lo, hi in ranges:
+        sum(1 for _ in tree.irange(lo, hi))
+    print('{:<24}{:>10.4f} s'.format('count by irange', time.perf_counter() - start))
+
+    start = time.perf_counter()
+    for lo, hi in ranges:
+        tree.count_range(lo, hi)
+    print('{:<24}{:>10.4f} s'.format('count_range', time.perf_counter() - start))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000, int(sys.argv[2]) if len(sys.argv) > 2 else 200)
@@ -0,0 +1,33 @@
+import os
+import random
+import sys
+import time
+
+from models.b_tree import BTree
+
+
+def main(size, max_processes):
+    keys = [random.getrandbits(62) for _ in range(size)]
+
+    print(str(size) + ' unsorted keys, degree 32')
+    start = time.perf_counter()
+    BTree.bulkload(sorted(set(keys)), 32)
+    print('{:<16}{:>10.4f} s'.format('sort+bulkload', time.perf_counter() - start))
+
+    processes = 1
+    while processes <= max_processes:
+        start = time.perf_counter()
+        BTree.parallel_build(keys, 32, processes)
+        print('{:<16}{:>10.4f} s'.format(str(processes) + ' processes', time.perf_counter() - start))
+        processes *= 2
+
+    left = BTree.bulkload(range(size), 32)
+    right = BTree.bulkload(range(size, size + size // 3), 32)
+    start = time.perf_counter()
+    left.concat(right)
+    print('{:<16}{:>10.6f} s'.format('concat', time.perf_counter() - start))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1)
@@ -0,0 +1,37 @@
+import itertools
+import random
+import sys
+import time
+
+from models.b_tree import BTree
+
+
+def page_by_full_iteration(tree, start, page_size):
+    return list(itertools.islice((key for key in tree if key >= start), page_size))
+
+
+def page_by_irange(tree, start, page_size):
+    return list(itertools.islice(tree.irange(start), page_size))
+
+
+def main(size, pages, page_size):
+    tree = BTree.bulkload(range(size), 32)
+    starts = [random.randrange(size) for _ in range(pages)]
+
+    print(str(pages) + ' pages of ' + str(page_size) + ' keys from a ' + str(size) + '-key BTree')
+    for name, page in (('full iteration', page_by_full_iteration), ('irange', page_by_irange)):
+        start = time.perf_counter()
+        for key in starts:
+            page(tree, key, page_size)
+        print('{:<16}{:>10.4f} s'.format(name, time.perf_counter() - start))
+
+    start = time.perf_counter()
+    for key in starts:
+        tree.floor(key)
+        tree.ceiling(key)
+    print('{:<16}{:>10.4f} s'.format('floor+ceiling', time.perf_counter() - start))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000, int(sys.argv[2]) if len(sys.argv) > 2 else 100,
+         int(sys.argv[3]) if len(sys.argv) > 3 else 100)
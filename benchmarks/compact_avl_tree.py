@@ -0,0 +1,37 @@
+import random
+import sys
+import time
+import tracemalloc
+
+from models.avl_tree import AVLTree
+from models.compact_avl_tree import CompactAVLTree
+
+
+def measure(name, tree_class, values):
+    tracemalloc.start()
+    start = time.perf_counter()
+    tree = tree_class()
+    for value in values:
+        tree.add_element(value)
+    insert_seconds = time.perf_counter() - start
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for value in values:
+        value in tree
+    lookup_seconds = time.perf_counter() - start
+
+    print('{:<16}{:>10.4f} s insert{:>10.4f} s lookup{:>10.1f} bytes/key'.format(
+        name, insert_seconds, lookup_seconds, memory / len(values)))
+
+
+def main(size):
+    values = random.sample(range(size * 10), size)
+    print('AVLTree vs CompactAVLTree, ' + str(size) + ' keys')
+    measure('AVLTree', AVLTree, values)
+    measure('CompactAVLTree', CompactAVLTree, values)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
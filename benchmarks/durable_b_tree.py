@@ -0,0 +1,45 @@
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+from models.b_tree import BTree
+from models.durable_b_tree import DurableBTree
+
+
+def main(size):
+    keys = random.sample(range(size * 10), size)
+
+    start = time.perf_counter()
+    tree = BTree(32)
+    for key in keys:
+        tree.insert(key)
+    print('{:<28}{:>12.0f} inserts/sec'.format('BTree (no log)', size / (time.perf_counter() - start)))
+
+    for batch_size in (1, 8, 64, 512, 4096):
+        directory = tempfile.mkdtemp()
+        start = time.perf_counter()
+        with DurableBTree.open(directory, 32, batch_size=batch_size, batch_interval=0.01) as tree:
+            for key in keys:
+                tree.insert(key)
+            tree.commit()
+            seconds = time.perf_counter() - start
+            syncs = tree.log.syncs
+        print('{:<28}{:>12.0f} inserts/sec{:>8} fsyncs'.format(
+            'DurableBTree batch ' + str(batch_size), size / seconds, syncs))
+
+        start = time.perf_counter()
+        DurableBTree.open(directory, 32).close()
+        print('{:<28}{:>12.4f} s'.format('  replay log on open', time.perf_counter() - start))
+
+        with DurableBTree.open(directory, 32) as tree:
+            tree.checkpoint()
+        start = time.perf_counter()
+        DurableBTree.open(directory, 32).close()
+        print('{:<28}{:>12.4f} s'.format('  load checkpoint on open', time.perf_counter() - start))
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,28 @@
+import os
+import sys
+import time
+import tracemalloc
+
+from generic_utils.export import write_dot, write_json_lines
+from models.avl_tree import AVLTree
+from models.b_tree import BTree
+
+
+def main(size):
+    trees = (('AVLTree', AVLTree.from_sorted(range(size))), ('BTree', BTree.bulkload(range(size), 16)))
+
+    print(str(size) + '-key trees exported to ' + os.devnull)
+    with open(os.devnull, 'w') as stream:
+        for name, tree in trees:
+            for format_name, write in (('JSON Lines', write_json_lines), ('DOT', write_dot)):
+                tracemalloc.start()
+                start = time.perf_counter()
+                write(tree, stream)
+                elapsed = time.perf_counter() - start
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                print('{:<20}{:>10.4f} s{:>10.2f} MB peak'.format(name + ' ' + format_name, elapsed, peak / 2 ** 20))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
@@ -0,0 +1,34 @@
+import bisect
+import random
+import sys
+import time
+
+from models.b_tree import BTree
+
+
+def main(size, lookups):
+    keys = sorted(random.sample(range(size * 4), size))
+    tree = BTree.bulkload(keys, 32)
+    frozen = tree.freeze()
+    queries = [random.randrange(size * 4) for _ in range(lookups)]
+
+    print(str(lookups) + ' lookups in ' + str(size) + ' keys (lookups per second)')
+    for name, contains in (('BTree', tree.__contains__), ('frozen', frozen.__contains__)):
+        start = time.perf_counter()
+        for key in queries:
+            contains(key)
+        print('{:<24}{:>12.0f}'.format(name, lookups / (time.perf_counter() - start)))
+
+    start = time.perf_counter()
+    frozen.contains_many(queries)
+    print('{:<24}{:>12.0f}'.format('frozen contains_many', lookups / (time.perf_counter() - start)))
+
+    start = time.perf_counter()
+    for key in queries:
+        index = bisect.bisect_left(keys, key)
+        index < size and keys[index] == key
+    print('{:<24}{:>12.0f}'.format('bisect on sorted list', lookups / (time.perf_counter() - start)))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000, int(sys.argv[2]) if len(sys.argv) > 2 else 200000)
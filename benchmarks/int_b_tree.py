@@ -0,0 +1,45 @@
+import random
+import sys
+import time
+import tracemalloc
+
+from models.b_tree import BTree
+from models.int_b_tree import IntBTree
+
+
+# Fresh int objects on every call, so the traced memory includes the keys a BTree keeps alive.
+def random_keys(size):
+    generator = random.Random(size)
+    return (generator.getrandbits(64) - 2 ** 63 for _ in range(size))
+
+
+def main(size, degree):
+    print(str(size) + ' random 64-bit keys, degree ' + str(degree))
+    for tree_type in (BTree, IntBTree):
+        tracemalloc.start()
+        tree = tree_type(degree)
+        for key in random_keys(size):
+            tree.insert(key)
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print('{:<16}{:>10.1f} MB'.format(tree_type.__name__ + ' memory', memory / 2 ** 20))
+
+        keys = list(random_keys(size))
+        tree = tree_type(degree)
+        start = time.perf_counter()
+        for key in keys:
+            tree.insert(key)
+        print('{:<16}{:>10.4f} s'.format(tree_type.__name__ + ' insert', time.perf_counter() - start))
+
+        start = time.perf_counter()
+        for key in keys:
+            key in tree
+        print('{:<16}{:>10.4f} s'.format(tree_type.__name__ + ' lookup', time.perf_counter() - start))
+
+        start = time.perf_counter()
+        for key in keys:
+            tree.remove(key)
+        print('{:<16}{:>10.4f} s'.format(tree_type.__name__ + ' remove', time.perf_counter() - start))
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000, int(sys.argv[2]) if len(sys.argv) > 2 else 64)
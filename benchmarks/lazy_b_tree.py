@@ -0,0 +1,53 @@
+import random
+import sys
+import time
+
+from models.b_tree import BTree
+from models.lazy_b_tree import LazyBTree
+
+
+def main(size, degree):
+    keys = list(range(size))
+    doomed = random.sample(keys, size // 2)
+    queries = [random.randrange(size) for _ in range(size // 2)]
+
+    print('Deleting ' + str(len(doomed)) + ' of ' + str(size) + ' keys, degree ' + str(degree))
+    eager = BTree.bulkload(keys, degree)
+    start = time.perf_counter()
+    for key in doomed:
+        eager.remove(key)
+    print('{:<28}{:>10.4f} s'.format('BTree remove', time.perf_counter() - start))
+
+    lazy = LazyBTree.bulkload(keys, degree)
+    lazy.compact_threshold = None
+    start = time.perf_counter()
+    for key in doomed:
+        lazy.remove(key)
+    print('{:<28}{:>10.4f} s'.format('LazyBTree remove', time.perf_counter() - start))
+
+    for name, tree in (('BTree lookups', eager), ('lookups before compaction', lazy)):
+        start = time.perf_counter()
+        for key in queries:
+            key in tree
+        print('{:<28}{:>10.4f} s'.format(name, time.perf_counter() - start))
+    start = time.perf_counter()
+    for _ in lazy:
+        pass
+    print('{:<28}{:>10.4f} s'.format('scan before compaction', time.perf_counter() - start))
+
+    start = time.perf_counter()
+    lazy.compact()
+    print('{:<28}{:>10.4f} s'.format('compact', time.perf_counter() - start))
+
+    start = time.perf_counter()
+    for key in queries:
+        key in lazy
+    print('{:<28}{:>10.4f} s'.format('lookups after compaction', time.perf_counter() - start))
+    start = time.perf_counter()
+    for _ in lazy:
+        pass
+    print('{:<28}{:>10.4f} s'.format('scan after compaction', time.perf_counter() - start))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500000, int(sys.argv[2]) if len(sys.argv) > 2 else 16)
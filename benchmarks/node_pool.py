@@ -0,0 +1,85 @@
+import gc
+import random
+import sys
+import time
+
+from models.avl_tree import AVLTree
+from models.node import Node
+from models.node_pool import NodePool
+from models.queue import Queue
+from models.stack import Stack
+
+
+class GCPauses:
+
+    def __init__(self):
+        self.pauses = []
+        self.started = None
+
+    def __call__(self, phase, info):
+        if phase == 'start':
+            self.started = time.perf_counter()
+        elif self.started is not None:
+            self.pauses.append(time.perf_counter() - self.started)
+
+
+# Counts every Node created while active, whoever creates it, by wrapping Node.__init__.
+class NodeCounter:
+
+    def __enter__(self):
+        self.count = 0
+        self.original = Node.__init__
+        original = self.original
+
+        def counting_init(node, value, **kwargs):
+            self.count += 1
+            original(node, value, **kwargs)
+
+        Node.__init__ = counting_init
+        return self
+
+    def __exit__(self, *exc_info):
+        Node.__init__ = self.original
+
+
+# Reset-then-refill: fill a stack, a queue and an AVL tree, drain the stack and queue, clear all.
+def run(cycles, size, pooled, values):
+    pools = [NodePool() if pooled else None for _ in range(3)]
+    stack, queue, tree = Stack(pools[0]), Queue(pools[1]), AVLTree(pools[2])
+
+    pauses = GCPauses()
+    gc.collect()
+    gc.callbacks.append(pauses)
+    start = time.perf_counter()
+    for _ in range(cycles):
+        for value in values:
+            stack.push(value)
+            queue.receive(value)
+            tree.add_element(value)
+        for _ in range(size // 2):
+            stack.pop()
+            queue.send()
+        stack.clear()
+        queue.clear()
+        tree.clear()
+    elapsed = time.perf_counter() - start
+    gc.callbacks.remove(pauses)
+    return elapsed, pauses.pauses
+
+
+def main(cycles, size):
+    print(str(cycles) + ' reset-and-refill cycles of ' + str(size) + ' values')
+    values = [random.randrange(10 ** 9) for _ in range(size)]
+    for pooled in (False, True):
+        elapsed, pauses = run(cycles, size, pooled, values)
+        # Counted on a second run, so the wrapper does not slow down the timed one
+        with NodeCounter() as counter:
+            run(cycles, size, pooled, values)
+        allocations = counter.count
+        print('{:<10}{:>10.4f} s{:>12} nodes allocated{:>8} GC runs{:>10.2f} ms max pause{:>10.2f} ms total'.format(
+            'pooled' if pooled else 'unpooled', elapsed, allocations, len(pauses),
+            max(pauses, default=0) * 1000, sum(pauses) * 1000))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50, int(sys.argv[2]) if len(sys.argv) > 2 else 20000)
@@ -0,0 +1,45 @@
+import os
+import random
+import sys
+import tempfile
+import time
+
+from models.paged_b_tree import PagedBTree
+
+
+def lookups(tree, keys):
+    start = time.perf_counter()
+    for key in keys:
+        key in tree
+    return len(keys) / (time.perf_counter() - start)
+
+
+def main(size, cache_pages):
+    path = os.path.join(tempfile.mkdtemp(), 'b_tree.db')
+    keys = random.sample(range(size * 10), size)
+    queries = random.sample(keys, min(size, 50000))
+
+    start = time.perf_counter()
+    with PagedBTree.open(path, cache_pages=cache_pages) as tree:
+        for key in keys:
+            tree.insert(key)
+    print('{:<34}{:>12.0f} ops/sec'.format('insert + close', size / (time.perf_counter() - start)))
+
+    start = time.perf_counter()
+    tree = PagedBTree.open(path, cache_pages=cache_pages)
+    print('{:<34}{:>12.6f} s'.format('open existing file', time.perf_counter() - start))
+    print('{:<34}{:>12.0f} ops/sec'.format('cold lookups (empty pool)', lookups(tree, queries)))
+    print('{:<34}{:>12.0f} ops/sec'.format('warm lookups', lookups(tree, queries)))
+    tree.close()
+
+    tree = PagedBTree.open(path, cache_pages=size)
+    lookups(tree, queries)
+    print('{:<34}{:>12.0f} ops/sec'.format('warm lookups (whole tree cached)', lookups(tree, queries)))
+    tree.close()
+
+    print(str(size) + ' keys, ' + str(os.path.getsize(path)) + ' bytes on disk, pool of ' + str(cache_pages) + ' pages')
+    os.remove(path)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000, int(sys.argv[2]) if len(sys.argv) > 2 else 64)
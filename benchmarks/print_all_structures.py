@@ -0,0 +1,42 @@
+import os
+import sys
+import time
+import tracemalloc
+
+from models.avl_tree import AVLTree
+from models.int_b_tree import IntBTree
+from models.list import List
+from models.queue import Queue
+from models.stack import Stack
+from views import print_all_structures
+
+
+def main(size):
+    structures = List(), Queue(), Stack(), AVLTree.from_sorted(range(size)), IntBTree.bulkload(range(size), 16)
+    for value in range(size, 0, -1):
+        structures[0].insert_beginning(value)
+        structures[1].receive(value)
+        structures[2].push(value)
+
+    print(str(size) + ' values per structure, written to ' + os.devnull)
+    with open(os.devnull, 'w') as stream:
+        tracemalloc.start()
+        start = time.perf_counter()
+        stream.write(''.join(str(structure) for structure in structures))
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print('{:<16}{:>10.4f} s{:>10.1f} MB peak'.format('str()', elapsed, peak / 2 ** 20))
+
+        for limit in (None, 20):
+            tracemalloc.start()
+            start = time.perf_counter()
+            print_all_structures(*structures, stream=stream, limit=limit)
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print('{:<16}{:>10.4f} s{:>10.1f} MB peak'.format('limit ' + str(limit), elapsed, peak / 2 ** 20))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
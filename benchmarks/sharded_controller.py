@@ -0,0 +1,32 @@
+import os
+import random
+import sys
+import time
+
+from sharded_controller import ShardedController
+
+
+def main(operations, instances, max_shards):
+    names = ['instance-' + str(i) for i in range(instances)]
+    requests = [(random.choice(names), random.choice(('add-btree ', 'add-avl ')) + str(random.randrange(10 ** 9)))
+                for _ in range(operations)]
+
+    print(str(operations) + ' tree inserts over ' + str(instances) + ' instances, batches of 10000')
+    shards = 1
+    while shards <= max_shards:
+        with ShardedController(shards) as controller:
+            start = time.perf_counter()
+            for i in range(0, operations, 10000):
+                controller.execute_many(requests[i:i + 10000])
+            elapsed = time.perf_counter() - start
+            start = time.perf_counter()
+            controller.contains('btree', 42)
+            lookup = time.perf_counter() - start
+        print('{:<12}{:>12.0f} ops/s{:>12.4f} s global contains'.format(str(shards) + ' shards', operations / elapsed,
+                                                                     lookup))
+        shards *= 2
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000, int(sys.argv[2]) if len(sys.argv) > 2 else 64,
+         int(sys.argv[3]) if len(sys.argv) > 3 else os.cpu_count() or 1)
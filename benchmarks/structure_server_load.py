@@ -0,0 +1,60 @@
+import asyncio
+import random
+import sys
+import time
+from collections import deque
+
+from structure_server import DEFAULT_PORT, connect, parse_address
+
+
+# Tree inserts only: the list, stack and queue check for duplicates by a linear scan, which would
+# make the server look slower the longer the benchmark runs.
+def random_command():
+    return random.choice(('add-btree ', 'add-avl ')) + str(random.randrange(10 ** 9)) + '\n'
+
+
+# Keeps up to depth requests in flight on one connection and records the latency of each.
+async def run_client(address, requests, depth, latencies):
+    reader, writer = await connect(address)
+    sent_at = deque()
+
+    async def send_all():
+        for start in range(0, requests, depth):
+            count = min(depth, requests - start)
+            while len(sent_at) + count > depth:
+                await asyncio.sleep(0)
+            now = time.perf_counter()
+            writer.write(''.join(random_command() for _ in range(count)).encode('utf-8'))
+            sent_at.extend([now] * count)
+            await writer.drain()
+
+    sender = asyncio.ensure_future(send_all())
+    for _ in range(requests):
+        status, length = (await reader.readline()).split()
+        await reader.readexactly(int(length))
+        latencies.append(time.perf_counter() - sent_at.popleft())
+    await sender
+    writer.close()
+
+
+async def run(address, clients, requests, depth):
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(run_client(address, requests, depth, latencies) for _ in range(clients)))
+    return time.perf_counter() - start, sorted(latencies)
+
+
+def main(address, clients, requests, depth):
+    elapsed, latencies = asyncio.run(run(address, clients, requests, depth))
+    print(str(clients) + ' clients x ' + str(requests) + ' requests, pipeline depth ' + str(depth))
+    print('{:<16}{:>12.0f} req/s'.format('throughput', len(latencies) / elapsed))
+    for percentile in (50, 95, 99):
+        latency = latencies[min(len(latencies) * percentile // 100, len(latencies) - 1)]
+        print('{:<16}{:>12.3f} ms'.format('p' + str(percentile) + ' latency', latency * 1000))
+
+
+if __name__ == '__main__':
+    # python -m benchmarks.structure_server_load [port | unix socket path] [clients] [requests] [depth]
+    main(parse_address(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_PORT,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 4, int(sys.argv[3]) if len(sys.argv) > 3 else 20000,
+         int(sys.argv[4]) if len(sys.argv) > 4 else 64)
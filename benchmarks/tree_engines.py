@@ -0,0 +1,78 @@
+import random
+import sys
+import time
+import tracemalloc
+
+from models.avl_tree import AVLTree
+from models.b_tree import BTree
+from models.red_black_tree import RedBlackTree
+from models.treap import Treap
+
+ENGINES = [
+    ('AVLTree', AVLTree, 'add_element'),
+    ('RedBlackTree', RedBlackTree, 'add_element'),
+    ('Treap', Treap, 'add_element'),
+    ('BTree(4)', lambda: BTree(4), 'insert'),
+    ('BTree(32)', lambda: BTree(32), 'insert'),
+]
+
+
+def distributions(size):
+    sequential = list(range(size))
+
+    shuffled = list(range(size))
+    random.shuffle(shuffled)
+
+    # Most keys fall in a narrow hot range and a long tail is spread far away from it
+    skewed = list(dict.fromkeys(int(random.lognormvariate(0, 2) * size) for _ in range(size * 2)))[:size]
+
+    return [('sequential', sequential), ('random', shuffled), ('skewed', skewed)]
+
+
+def lookups(keys, count):
+    # Zipf-like: the first keys inserted are asked for far more often than the rest
+    return [keys[min(int(random.paretovariate(1.2)) - 1, len(keys) - 1)] for _ in range(count)]
+
+
+def build(factory, insert_name, keys):
+    tree = factory()
+    insert = getattr(tree, insert_name)
+    for key in keys:
+        insert(key)
+    return tree
+
+
+# Inserts are timed on a separate build from the memory measurement, since tracing slows down
+# every allocation and would penalize the engines that allocate a node per key.
+def measure(factory, insert_name, keys, queries):
+    start = time.perf_counter()
+    tree = build(factory, insert_name, keys)
+    insert_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for key in queries:
+        key in tree
+    lookup_seconds = time.perf_counter() - start
+    del tree
+
+    tracemalloc.start()
+    tree = build(factory, insert_name, keys)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    return insert_seconds, lookup_seconds, memory / len(keys)
+
+
+def main(size):
+    for name, keys in distributions(size):
+        queries = lookups(keys, size)
+        print(name + ' keys, ' + str(len(keys)) + ' inserts, ' + str(len(queries)) + ' lookups')
+        for engine, factory, insert_name in ENGINES:
+            insert_seconds, lookup_seconds, bytes_per_key = measure(factory, insert_name, keys, queries)
+            print('{:<14}{:>10.4f} s insert{:>10.4f} s lookup{:>10.1f} bytes/key'.format(
+                engine, insert_seconds, lookup_seconds, bytes_per_key))
+        print()
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,59 @@
+import random
+import sys
+import threading
+import time
+
+from models.b_tree import BTree
+from models.versioned_b_tree import VersionedBTree
+
+
+def run(size, readers, seconds, locked):
+    keys = random.sample(range(size * 10), size)
+    tree = (BTree if locked else VersionedBTree).bulkload(sorted(keys), 32)
+    lock = threading.Lock()
+    stop = threading.Event()
+    counts = {'read': 0, 'write': 0}
+
+    def reader():
+        while not stop.is_set():
+            if locked:  # The old way: hold the tree lock for the whole scan
+                with lock:
+                    scanned = sum(1 for _ in tree)
+            else:
+                scanned = sum(1 for _ in tree.snapshot())
+            counts['read'] += scanned
+
+    def writer():
+        while not stop.is_set():
+            key = random.randrange(size * 10)
+            if locked:
+                with lock:
+                    tree.insert(key)
+                    tree.discard(random.randrange(size * 10))
+            else:
+                tree.insert(key)
+                tree.discard(random.randrange(size * 10))
+            counts['write'] += 2
+
+    threads = [threading.Thread(target=reader) for _ in range(readers)] + [threading.Thread(target=writer)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    name = 'BTree + global lock' if locked else 'VersionedBTree snapshots'
+    print('{:<26}{:>14.0f} keys read/sec{:>12.0f} writes/sec'.format(
+        name, counts['read'] / seconds, counts['write'] / seconds))
+
+
+def main(size, readers, seconds):
+    print(str(readers) + ' scanning readers and 1 writer over ' + str(size) + ' keys')
+    run(size, readers, seconds, True)
+    run(size, readers, seconds, False)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000, int(sys.argv[2]) if len(sys.argv) > 2 else 2,
+         float(sys.argv[3]) if len(sys.argv) > 3 else 3)
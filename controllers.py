@@ -1,21 +1,55 @@
+import io
+from contextlib import redirect_stdout
+
 from generic_utils.exists import exists
+from generic_utils.snapshot import save_structures, load_structures
 from models.avl_tree import AVLTree
 from models.list import List
+from models.node_pool import NodePool
 from models.queue import Queue
 from models.stack import Stack
-from models.b_tree import BTree
+from models.int_b_tree import IntBTree
 from views import print_all_structures, invalid_selection_view, repeated_value, not_in_list, print_tree_orders, \
-    int_only_tree_error
+    int_only_tree_error, invalid_command_view, snapshot_error
+
+# Batch command name -> (menu selection, whether it takes a value)
+BATCH_COMMANDS = {
+    'add-list': (1, True),
+    'add-stack': (2, True),
+    'add-queue': (3, True),
+    'remove-list': (4, True),
+    'move-queue-list': (5, False),
+    'move-queue-stack': (6, False),
+    'move-stack-list': (7, False),
+    'move-stack-queue': (8, False),
+    'move-list-queue': (9, True),
+    'move-list-stack': (10, True),
+    'add-avl': (11, True),
+    'show-avl': (12, False),
+    'add-btree': (13, True),
+    'print': (14, False),
+    'reset': (15, False),
+    'save': (16, True),
+    'load': (17, True),
+}
+
+# Errors the structures raise on bad input, e.g. comparing a str with the None that popping an
+# empty stack returns. Batch and captured execution report them instead of stopping.
+COMMAND_ERRORS = (TypeError, ValueError)
 
 
 class StructureController:
 
-    def __init__(self):
-        self.main_list = List()
-        self.main_queue = Queue()
-        self.main_stack = Stack()
-        self.avl_tree = AVLTree()
-        self.b_tree = BTree(4)
+    # With pooled, the list, queue, stack and AVL tree each recycle their nodes through a NodePool,
+    # which pays off when the structures are reset and refilled over and over. print_limit bounds
+    # how much of each structure option 14 prints.
+    def __init__(self, pooled=False, print_limit=None):
+        self.print_limit = print_limit
+        self.main_list = List(NodePool() if pooled else None)
+        self.main_queue = Queue(NodePool() if pooled else None)
+        self.main_stack = Stack(NodePool() if pooled else None)
+        self.avl_tree = AVLTree(NodePool() if pooled else None)
+        self.b_tree = IntBTree(4)
 
     @staticmethod
     def add_to_structure(value, structure):
@@ -129,14 +163,87 @@ class StructureController:
                 int_only_tree_error()
 
         elif selection == 14:
-            print_all_structures(self.main_list, self.main_queue, self.main_stack, self.avl_tree, self.b_tree)
+            print_all_structures(self.main_list, self.main_queue, self.main_stack, self.avl_tree, self.b_tree,
+                                 limit=self.print_limit)
 
         elif selection == 15:
-            self.main_list = List()
-            self.main_queue = Queue()
-            self.main_stack = Stack()
-            self.avl_tree = AVLTree()
-            self.b_tree = BTree(4)
+            self.main_list.clear()
+            self.main_queue.clear()
+            self.main_stack.clear()
+            self.avl_tree.clear()
+            self.b_tree.clear()
+
+        elif selection == 16:
+            try:
+                self.save(extra_value)
+            except (OSError, TypeError) as error:
+                snapshot_error(error)
+
+        elif selection == 17:
+            try:
+                self.load(extra_value)
+            except (OSError, ValueError) as error:
+                snapshot_error(error)
 
         else:
             invalid_selection_view()
+
+    def save(self, path):
+        save_structures(path, self.main_list, self.main_queue, self.main_stack, self.avl_tree, self.b_tree)
+
+    # The loaded structures keep the node pools of the current ones, which give their nodes back
+    # once the snapshot has been read successfully.
+    def load(self, path):
+        structures = load_structures(path, (self.main_list.pool, self.main_queue.pool, self.main_stack.pool,
+                                            self.avl_tree.pool))
+        self.main_list.clear()
+        self.main_queue.clear()
+        self.main_stack.clear()
+        self.avl_tree.clear()
+        self.main_list, self.main_queue, self.main_stack, self.avl_tree, self.b_tree = structures
+
+    # Runs one command per line (e.g. "add-list 5", "move-queue-stack") through the same menu logic,
+    # skipping blank lines and # comments. A line that fails is reported with its number and the
+    # batch goes on. Returns how many commands were executed.
+    def run_batch(self, lines):
+        executed = 0
+        for line_number, line in enumerate(lines, 1):
+            words = line.split()
+            if not words or words[0].startswith('#'):
+                continue
+
+            try:
+                valid = self.execute_command(line)
+            except COMMAND_ERRORS as error:
+                invalid_command_view(line_number, line.strip(), error)
+                continue
+            if valid:
+                executed += 1
+            else:
+                invalid_command_view(line_number, line.strip())
+        return executed
+
+    # Executes a single batch command. Returns False if the line is not a valid command.
+    def execute_command(self, line):
+        words = line.split()
+        command = BATCH_COMMANDS.get(words[0]) if words else None
+        if command is None or len(words) != (2 if command[1] else 1):
+            return False
+
+        selection, takes_value = command
+        self.main_menu_selection(selection, extra_value=words[1] if takes_value else None)
+        return True
+
+    # Like execute_command, but returns (valid, output) with the text the menu would have printed,
+    # and reports the errors the structures raise on bad input as an invalid command.
+    def execute_captured(self, line):
+        output = io.StringIO()
+        try:
+            with redirect_stdout(output):
+                valid = self.execute_command(line)
+            if not valid:
+                output.write('Invalid command.')
+        except COMMAND_ERRORS as error:
+            valid = False
+            output.write(str(error))
+        return valid, output.getvalue()
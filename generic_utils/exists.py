@@ -1,4 +1,7 @@
 from models.avl_tree import AVLTree
+from models.b_tree import BTree
+from models.binary_search_tree import BinarySearchTree
+from models.compact_avl_tree import CompactAVLTree
 from models.list import List
 from models.queue import Queue
 from models.stack import Stack
@@ -18,6 +21,9 @@ def exists(value, structure):
     elif isinstance(structure, AVLTree):
         return __exists_binary_tree_recursive(structure.root, value)
 
+    elif isinstance(structure, (CompactAVLTree, BinarySearchTree, BTree)):
+        return value in structure
+
 
 def __exists_binary_tree_recursive(node, value):
     if not node:
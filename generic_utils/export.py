@@ -0,0 +1,121 @@
+import json
+
+from generic_utils.snapshot import linked_values
+from models.avl_tree import AVLTree
+from models.b_tree import BTree
+from models.lazy_b_tree import LazyBTree
+from models.list import List
+from models.queue import Queue
+from models.stack import Stack
+
+# Every exporter below is a generator of lines walking the structure with an explicit stack, so
+# neither deep trees nor big ones are a problem: memory stays O(height) plus one line.
+
+
+# One JSON object per line. AVL trees give one object per node with its parent's id and which side
+# of the parent it hangs on, B-trees one per node with its keys; anything else one per value.
+def json_lines(structure):
+    if isinstance(structure, AVLTree):
+        return _avl_json_lines(structure.root)
+    elif isinstance(structure, BTree):
+        return _b_tree_json_lines(structure.root, _tombstones(structure))
+    elif isinstance(structure, (List, Queue, Stack)):
+        return _value_json_lines(linked_values(structure.head))
+    return _value_json_lines(structure)
+
+
+# Graphviz DOT for an AVLTree or a BTree.
+def dot_lines(tree):
+    if isinstance(tree, AVLTree):
+        return _avl_dot_lines(tree.root)
+    elif isinstance(tree, BTree):
+        return _b_tree_dot_lines(tree.root, _tombstones(tree))
+    raise TypeError('Only AVL trees and B trees can be exported as DOT.')
+
+
+def write_json_lines(structure, stream):
+    stream.writelines(json_lines(structure))
+
+
+def write_dot(tree, stream):
+    stream.writelines(dot_lines(tree))
+
+
+# Tombstoned keys of a LazyBTree are still in its nodes; the B-tree exporters leave them out, so
+# exporting never has to change the tree.
+def _tombstones(tree):
+    return tree.tombstones if isinstance(tree, LazyBTree) else ()
+
+
+def _json(record):
+    return json.dumps(record, default=str) + '\n'
+
+
+def _value_json_lines(values):
+    for index, value in enumerate(values):
+        yield _json({'index': index, 'value': value})
+
+
+def _avl_json_lines(root):
+    pending = [(root, None, None)] if root else []
+    next_id = 0
+    while pending:
+        node, parent, side = pending.pop()
+        yield _json({'id': next_id, 'parent': parent, 'side': side, 'value': node.value,
+                     'balance_factor': node.balance_factor})
+        if node.right:
+            pending.append((node.right, next_id, 'right'))
+        if node.left:
+            pending.append((node.left, next_id, 'left'))
+        next_id += 1
+
+
+def _b_tree_json_lines(root, tombstones):
+    pending = [(root, None, None)]
+    next_id = 0
+    while pending:
+        node, parent, index = pending.pop()
+        yield _json({'id': next_id, 'parent': parent, 'child_index': index, 'leaf': node.is_leaf(),
+                     'keys': [key for key in node.keys if key not in tombstones]})
+        if not node.is_leaf():
+            pending.extend((child, next_id, i) for i, child in reversed(list(enumerate(node.children))))
+        next_id += 1
+
+
+# Graphviz takes UTF-8 as is but would show \uXXXX escapes literally.
+def _label(text):
+    return json.dumps(str(text), ensure_ascii=False)
+
+
+def _avl_dot_lines(root):
+    yield 'digraph AVLTree {\n'
+    pending = [(root, None, None)] if root else []
+    next_id = 0
+    while pending:
+        node, parent, side = pending.pop()
+        yield '  n%d [label=%s];\n' % (next_id, _label(str(node.value) + '\nbf=' + str(node.balance_factor)))
+        if parent is not None:
+            yield '  n%d -> n%d [label="%s"];\n' % (parent, next_id, side)
+        if node.right:
+            pending.append((node.right, next_id, 'R'))
+        if node.left:
+            pending.append((node.left, next_id, 'L'))
+        next_id += 1
+    yield '}\n'
+
+
+def _b_tree_dot_lines(root, tombstones):
+    yield 'digraph BTree {\n'
+    yield '  node [shape=box];\n'
+    pending = [(root, None)]
+    next_id = 0
+    while pending:
+        node, parent = pending.pop()
+        keys = ' | '.join(str(key) for key in node.keys if key not in tombstones)
+        yield '  n%d [label=%s];\n' % (next_id, _label(keys))
+        if parent is not None:
+            yield '  n%d -> n%d;\n' % (parent, next_id)
+        if not node.is_leaf():
+            pending.extend((child, next_id) for child in reversed(node.children))
+        next_id += 1
+    yield '}\n'
@@ -0,0 +1,115 @@
+import struct
+
+from models.avl_tree import AVLTree
+from models.int_b_tree import IntBTree
+from models.list import List
+from models.node import Node
+from models.queue import Queue
+from models.stack import Stack
+
+MAGIC = b'BDS\x01'
+COUNT = struct.Struct('<Q')
+INT64 = struct.Struct('<q')
+LENGTH = struct.Struct('<I')
+B_TREE_DEGREE = 4
+
+# Every value is a one byte tag followed by its payload
+SMALL_INT, BIG_INT, STRING, NONE = b'q', b'i', b's', b'n'
+
+
+# Writes the list, queue, stack, AVL tree and B tree to path, each as a value count followed by its
+# values in traversal order: head to tail for the linked structures, ascending for the trees.
+# Values are written one at a time through the file buffer, nothing is collected in memory.
+def save_structures(path, list, queue, stack, avl_tree, b_tree):
+    with open(path, 'wb') as stream:
+        stream.write(MAGIC)
+        for head in (list.head, queue.head, stack.head):
+            write_values(stream, sum(1 for _ in linked_values(head)), linked_values(head))
+        write_values(stream, sum(1 for _ in avl_tree), avl_tree)
+        write_values(stream, len(b_tree), b_tree)
+
+
+# Returns (list, queue, stack, avl_tree, b_tree) as saved by save_structures. The linked structures
+# are relinked node by node and the trees are bulk-built from the sorted values, all in linear time.
+# pools optionally gives the NodePool of the list, queue, stack and AVL tree, in that order; their
+# nodes are then taken from it, and the loaded structures keep recycling through it.
+def load_structures(path, pools=(None, None, None, None)):
+    list_pool, queue_pool, stack_pool, avl_pool = pools
+    with open(path, 'rb') as stream:
+        if stream.read(len(MAGIC)) != MAGIC:
+            raise ValueError('Not a structures snapshot.')
+
+        list, queue, stack = List(list_pool), Queue(queue_pool), Stack(stack_pool)
+        list.head, _ = link_values(read_values(stream), list_pool)
+        queue.head, queue.tail = link_values(read_values(stream), queue_pool)
+        stack.head, _ = link_values(read_values(stream), stack_pool)
+        avl_tree = AVLTree.from_sorted(read_values(stream, (SMALL_INT, BIG_INT)), avl_pool)
+        b_tree = IntBTree.bulkload(read_values(stream, (SMALL_INT, )), B_TREE_DEGREE)
+        return list, queue, stack, avl_tree, b_tree
+
+
+def write_values(stream, count, values):
+    stream.write(COUNT.pack(count))
+    for value in values:
+        if value is None:
+            stream.write(NONE)
+        elif isinstance(value, str):
+            encoded = value.encode('utf-8')
+            stream.write(STRING + LENGTH.pack(len(encoded)) + encoded)
+        elif isinstance(value, int) and -2 ** 63 <= value < 2 ** 63:
+            stream.write(SMALL_INT + INT64.pack(value))
+        elif isinstance(value, int):
+            encoded = value.to_bytes((value.bit_length() + 8) // 8, 'little', signed=True)
+            stream.write(BIG_INT + LENGTH.pack(len(encoded)) + encoded)
+        else:
+            raise TypeError('Cannot save values of type ' + type(value).__name__ + '.')
+
+
+# Yields the values of one section. Reads exactly as far as the section goes. With tags, any value
+# of another type makes the snapshot corrupt, e.g. the trees only hold integers.
+def read_values(stream, tags=None):
+    count, = COUNT.unpack(_read_exactly(stream, COUNT.size))
+    for _ in range(count):
+        tag = _read_exactly(stream, 1)
+        if tags is not None and tag not in tags:
+            raise ValueError('Corrupt snapshot.')
+        if tag == NONE:
+            yield None
+        elif tag == SMALL_INT:
+            yield INT64.unpack(_read_exactly(stream, INT64.size))[0]
+        else:
+            length, = LENGTH.unpack(_read_exactly(stream, LENGTH.size))
+            encoded = _read_exactly(stream, length)
+            if tag == STRING:
+                yield encoded.decode('utf-8')
+            elif tag == BIG_INT:
+                yield int.from_bytes(encoded, 'little', signed=True)
+            else:
+                raise ValueError('Corrupt snapshot.')
+
+
+def linked_values(head):
+    while head:
+        yield head.value
+        head = head.next_node
+
+
+# Chains the values into nodes (taken from pool, if given) in the given order and returns
+# (head, tail).
+def link_values(values, pool=None):
+    head = tail = None
+    for value in values:
+        node = pool.acquire(value, next_node=None) if pool is not None else Node(value, next_node=None)
+        if tail:
+            tail.next_node = node
+        else:
+            head = node
+        tail = node
+    return head, tail
+
+
+def _read_exactly(stream, size):
+    data = stream.read(size)
+    if len(data) != size:
+        raise ValueError('Truncated snapshot.')
+    return data
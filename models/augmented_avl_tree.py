@@ -0,0 +1,143 @@
+import math
+import operator
+
+from models.avl_tree import AVLTree
+
+
+class Monoid:
+
+    # combine must be associative and identity must be its neutral element. lift maps a stored
+    # value to the monoid, e.g. every value counts as 1 for COUNT.
+    def __init__(self, identity, combine, lift=None):
+        self.identity = identity
+        self.combine = combine
+        self.lift = lift if lift else lambda value: value
+
+
+SUM = Monoid(0, operator.add)
+MIN = Monoid(math.inf, min)
+MAX = Monoid(-math.inf, max)
+COUNT = Monoid(0, operator.add, lambda value: 1)
+
+
+# AVL tree whose nodes also keep the aggregate of their whole subtree under a monoid, which is
+# refreshed along the insertion path, in every rotation and in every relink of the join-based
+# set operations, so range queries are O(log n).
+class AugmentedAVLTree(AVLTree):
+
+    def __init__(self, monoid=SUM):
+        super().__init__()
+        self.monoid = monoid
+
+    @classmethod
+    def from_sorted(cls, iterable, monoid=SUM):
+        tree = cls(monoid)
+        tree._fill_sorted(iterable)
+        return tree
+
+    @classmethod
+    def from_iterable(cls, iterable, monoid=SUM):
+        return cls.from_sorted(sorted(iterable), monoid)
+
+    def add_element(self, value):
+        node = super().add_element(value)
+
+        # Rotations already fixed the nodes they moved off the path, the rest are ancestors
+        aux = node
+        while aux:
+            self._update_aggregate(aux)
+            aux = aux.parent
+
+        return node
+
+    def left_rotate(self, node):
+        super().left_rotate(node)
+        self._update_aggregate(node)
+        self._update_aggregate(node.parent)
+
+    def right_rotate(self, node):
+        super().right_rotate(node)
+        self._update_aggregate(node)
+        self._update_aggregate(node.parent)
+
+    # Aggregate of every value in [low, high], in key order.
+    def aggregate(self, low, high):
+        combine, lift = self.monoid.combine, self.monoid.lift
+
+        # Find the topmost node inside the range, both boundaries split off from there
+        split = self.root
+        while split and not low <= split.value <= high:
+            split = split.right if split.value < low else split.left
+        if not split:
+            return self.monoid.identity
+
+        left_result = self.monoid.identity
+        node = split.left
+        while node:
+            if node.value >= low:
+                left_result = combine(combine(lift(node.value), self._aggregate_of(node.right)), left_result)
+                node = node.left
+            else:
+                node = node.right
+
+        right_result = self.monoid.identity
+        node = split.right
+        while node:
+            if node.value <= high:
+                right_result = combine(right_result, combine(self._aggregate_of(node.left), lift(node.value)))
+                node = node.right
+            else:
+                node = node.left
+
+        return combine(combine(left_result, lift(split.value)), right_result)
+
+    def total(self):
+        return self._aggregate_of(self.root)
+
+    # join, union and intersection move nodes of the other operand into the result, so their
+    # aggregates must be over the same monoid.
+    @classmethod
+    def join(cls, left, value, right):
+        left._check_operand(right)
+        return super().join(left, value, right)
+
+    def union(self, other):
+        self._check_operand(other)
+        super().union(other)
+
+    def intersection(self, other):
+        self._check_operand(other)
+        super().intersection(other)
+
+    def _check_operand(self, other):
+        if not isinstance(other, AugmentedAVLTree):
+            raise TypeError('Both trees must be augmented trees.')
+        if other.monoid is not self.monoid:
+            raise ValueError('Both trees must aggregate over the same monoid.')
+
+    def _empty(self):
+        return type(self)(self.monoid)
+
+    def _new_node(self, value, parent):
+        node = super()._new_node(value, parent)
+        node.aggregate = self.monoid.lift(value)
+        return node
+
+    def _build_balanced(self, values, start, end, parent):
+        node, height = super()._build_balanced(values, start, end, parent)
+        if node:
+            self._update_aggregate(node)  # Both children were built (and aggregated) first
+        return node, height
+
+    def _link(self, left, left_height, node, right, right_height):
+        linked = super()._link(left, left_height, node, right, right_height)
+        self._update_aggregate(node)
+        return linked
+
+    def _aggregate_of(self, node):
+        return node.aggregate if node else self.monoid.identity
+
+    def _update_aggregate(self, node):
+        combine = self.monoid.combine
+        node.aggregate = combine(combine(self._aggregate_of(node.left), self.monoid.lift(node.value)),
+                                 self._aggregate_of(node.right))
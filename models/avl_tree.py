@@ -1,9 +1,22 @@
+from multiprocessing import Pool
+import bisect
+import os
+
+from models.binary_search_tree import BinarySearchTree
 from models.node import Node
 
 
-class AVLTree:
+class AVLTree(BinarySearchTree):
+
+    # Nodes added by add_element come from pool (a NodePool) if one is given, and clear() gives
+    # them back.
+    def __init__(self, pool=None):
+        super().__init__()
+        self.pool = pool
 
-    def __init__(self):
+    def clear(self):
+        if self.pool is not None:
+            self.pool.release_tree(self.root)
         self.root = None
 
     def __str__(self):
@@ -28,6 +41,40 @@ class AVLTree:
 
         return main_str
 
+    @classmethod
+    def from_sorted(cls, iterable, pool=None):
+        tree = cls(pool)
+        tree._fill_sorted(iterable)
+        return tree
+
+    @classmethod
+    def from_iterable(cls, iterable):
+        return cls.from_sorted(sorted(iterable))
+
+    # Replaces the contents with the sorted values, in linear time.
+    def _fill_sorted(self, iterable):
+        values = list(iterable)
+        for i in range(1, len(values)):
+            if values[i] < values[i - 1]:
+                raise ValueError('Provided values are not sorted.')
+
+        self.root = self._build_balanced(values, 0, len(values), None)[0]
+
+    # Builds the subtree for values[start:end] and returns (node, height). The middle element
+    # becomes the root, so every balance factor ends up in [-1, 1]. Like _link, subclasses that
+    # keep extra data in their nodes override it to fill that in.
+    def _build_balanced(self, values, start, end, parent):
+        if start >= end:
+            return None, 0
+
+        middle = (start + end) // 2
+        node = self._new_node(values[middle], parent)
+        node.left, left_height = self._build_balanced(values, start, middle, node)
+        node.right, right_height = self._build_balanced(values, middle + 1, end, node)
+        node.balance_factor = right_height - left_height
+
+        return node, max(left_height, right_height) + 1
+
     @staticmethod
     def get_level(node):
         count = 0
@@ -37,38 +84,268 @@ class AVLTree:
 
         return count
 
+    # Returns the node that now holds the value.
     def add_element(self, value):
         if not self.root:
-            self.root = Node(value, left=None, right=None, parent=None, balance_factor=0)
+            self.root = self._new_node(value, None)
+            return self.root
 
         else:
-            self.__add_element_recursive(self.root, value)
+            return self.__add_element_recursive(self.root, value)
 
     def __add_element_recursive(self, parent, value):
         if value > parent.value:
             if parent.right:
-                self.__add_element_recursive(parent.right, value)
+                return self.__add_element_recursive(parent.right, value)
             else:
-                node = Node(value, left=None, right=None, parent=parent, balance_factor=0)
+                node = self._new_node(value, parent)
                 parent.right = node
                 self.__update_balance_factor(node)
+                return node
         elif parent.left:
-            self.__add_element_recursive(parent.left, value)
+            return self.__add_element_recursive(parent.left, value)
         else:
-            node = Node(value, left=None, right=None, parent=parent, balance_factor=0)
+            node = self._new_node(value, parent)
             parent.left = node
             self.__update_balance_factor(node)
+            return node
+
+    def _new_node(self, value, parent):
+        if self.pool is not None:
+            return self.pool.acquire(value, left=None, right=None, parent=parent, balance_factor=0)
+        return Node(value, left=None, right=None, parent=parent, balance_factor=0)
+
+    # ---- Join-based set operations ----
+    # All of these work on whole subtrees and cost O(m log(n/m + 1)) for trees of sizes m <= n.
+    # The nodes of the operands are reused for the result, so the operands are consumed.
+
+    @classmethod
+    def join(cls, left, value, right):
+        # Every value in left must be smaller than value, and every value in right must be greater.
+        node = left._new_node(value, None)
+        tree = left._empty()
+        tree.root = tree._join(left.root, cls._root_height(left.root), node,
+                               right.root, cls._root_height(right.root))[0]
+        tree.__detach_root()
+        left.root = None
+        right.root = None
+        return tree
+
+    def split(self, value):
+        # Returns (smaller, found, greater) and leaves this tree empty.
+        smaller, greater = self._empty(), self._empty()
+        smaller.root, _, found, greater.root, _ = self._split(self.root, self._root_height(self.root), value)
+        smaller.__detach_root()
+        greater.__detach_root()
+        self.root = None
+        return smaller, found is not None, greater
+
+    def union(self, other):
+        # Keeps the union in this tree; other is left empty.
+        self.root = self._union(self.root, self._root_height(self.root),
+                                other.root, self._root_height(other.root))[0]
+        self.__detach_root()
+        other.root = None
+
+    def intersection(self, other):
+        # Keeps the intersection in this tree; other is left empty.
+        self.root = self._intersection(self.root, self._root_height(self.root),
+                                       other.root, self._root_height(other.root))[0]
+        self.__detach_root()
+        other.root = None
+
+    def difference(self, other):
+        # Removes the values of other from this tree; other is only read.
+        self.root = self._difference(self.root, self._root_height(self.root),
+                                     other.root, self._root_height(other.root))[0]
+        self.__detach_root()
+
+    def parallel_union(self, other, processes=None):
+        # Splits both key sets into as many ranges as there are workers, unions every range in a
+        # separate process and stitches the disjoint results back together. Other is left empty.
+        mine, theirs = list(self), list(other)
+        if not mine or not theirs:
+            self.union(other)
+            return
 
-    def is_empty(self):
-        if not self.root:
-            return True
-        else:
-            return False
+        parts = processes or os.cpu_count() or 1
+        with Pool(parts) as pool:
+            bounds = [mine[len(mine) * i // parts] for i in range(1, parts)]
+            my_cuts = [0] + [bisect.bisect_left(mine, bound) for bound in bounds] + [len(mine)]
+            their_cuts = [0] + [bisect.bisect_left(theirs, bound) for bound in bounds] + [len(theirs)]
+            chunks = [(mine[my_cuts[i]:my_cuts[i + 1]], theirs[their_cuts[i]:their_cuts[i + 1]])
+                      for i in range(parts)]
+            results = pool.starmap(_union_values, chunks)
+
+        self._fill_sorted(value for result in results for value in result)
+        other.root = None
+
+    # An empty tree configured like this one, for the results of join and split.
+    def _empty(self):
+        return type(self)(self.pool)
+
+    def __detach_root(self):
+        if self.root:
+            self.root.parent = None
 
-    def height(self, node):
+    @staticmethod
+    def _root_height(node):
+        # O(log n): the balance factor always points at the taller subtree.
+        height = 0
+        while node:
+            height += 1
+            node = node.right if node.balance_factor > 0 else node.left
+        return height
+
+    @staticmethod
+    def _child_heights(node, height):
+        # Also valid for the transient +-2 factors that show up mid-rotation.
+        if node.balance_factor <= 0:
+            return height - 1, height - 1 + node.balance_factor
+        return height - 1 - node.balance_factor, height - 1
+
+    # Every relink of the join-based operations goes through here, so subclasses that keep extra
+    # data in their nodes override it to recompute that data for node.
+    def _link(self, left, left_height, node, right, right_height):
+        node.left = left
+        node.right = right
+        if left:
+            left.parent = node
+        if right:
+            right.parent = node
+        node.balance_factor = right_height - left_height
+        return node, max(left_height, right_height) + 1
+
+    def _rotate_left(self, node, height):
+        left_height, right_height = self._child_heights(node, height)
+        aux = node.right
+        aux_left_height, aux_right_height = self._child_heights(aux, right_height)
+        node, height = self._link(node.left, left_height, node, aux.left, aux_left_height)
+        return self._link(node, height, aux, aux.right, aux_right_height)
+
+    def _rotate_right(self, node, height):
+        left_height, right_height = self._child_heights(node, height)
+        aux = node.left
+        aux_left_height, aux_right_height = self._child_heights(aux, left_height)
+        node, height = self._link(aux.right, aux_right_height, node, node.right, right_height)
+        return self._link(aux.left, aux_left_height, aux, node, height)
+
+    def _join_right(self, left, left_height, node, right, right_height):
+        # Descends the right spine of the taller left tree until the heights are close enough.
+        outer_height, inner_height = self._child_heights(left, left_height)
+        outer, inner = left.left, left.right
+
+        if inner_height <= right_height + 1:
+            joined, joined_height = self._link(inner, inner_height, node, right, right_height)
+            if joined_height > outer_height + 1:
+                joined, joined_height = self._rotate_right(joined, joined_height)
+                left, left_height = self._link(outer, outer_height, left, joined, joined_height)
+                return self._rotate_left(left, left_height)
+        else:
+            joined, joined_height = self._join_right(inner, inner_height, node, right, right_height)
+
+        left, left_height = self._link(outer, outer_height, left, joined, joined_height)
+        if joined_height > outer_height + 1:
+            return self._rotate_left(left, left_height)
+        return left, left_height
+
+    def _join_left(self, left, left_height, node, right, right_height):
+        inner_height, outer_height = self._child_heights(right, right_height)
+        inner, outer = right.left, right.right
+
+        if inner_height <= left_height + 1:
+            joined, joined_height = self._link(left, left_height, node, inner, inner_height)
+            if joined_height > outer_height + 1:
+                joined, joined_height = self._rotate_left(joined, joined_height)
+                right, right_height = self._link(joined, joined_height, right, outer, outer_height)
+                return self._rotate_right(right, right_height)
+        else:
+            joined, joined_height = self._join_left(left, left_height, node, inner, inner_height)
+
+        right, right_height = self._link(joined, joined_height, right, outer, outer_height)
+        if joined_height > outer_height + 1:
+            return self._rotate_right(right, right_height)
+        return right, right_height
+
+    def _join(self, left, left_height, node, right, right_height):
+        if left_height > right_height + 1:
+            return self._join_right(left, left_height, node, right, right_height)
+        elif right_height > left_height + 1:
+            return self._join_left(left, left_height, node, right, right_height)
+        else:
+            return self._link(left, left_height, node, right, right_height)
+
+    def _split_last(self, node, height):
+        # Returns (rest, rest_height, last_node) for the subtree rooted at node.
+        left_height, right_height = self._child_heights(node, height)
+        if not node.right:
+            return node.left, left_height, node
+        rest, rest_height, last = self._split_last(node.right, right_height)
+        return self._join(node.left, left_height, node, rest, rest_height) + (last, )
+
+    def _join_without_key(self, left, left_height, right, right_height):
+        if not left:
+            return right, right_height
+        left, left_height, node = self._split_last(left, left_height)
+        return self._join(left, left_height, node, right, right_height)
+
+    def _split(self, node, height, value):
+        # Returns (smaller, smaller_height, found_node, greater, greater_height).
         if not node:
-            return 0
-        return max(self.height(node.left), self.height(node.right)) + 1
+            return None, 0, None, None, 0
+
+        left, right = node.left, node.right
+        left_height, right_height = self._child_heights(node, height)
+
+        if value == node.value:
+            return left, left_height, node, right, right_height
+        elif value < node.value:
+            smaller, smaller_height, found, greater, greater_height = self._split(left, left_height, value)
+            greater, greater_height = self._join(greater, greater_height, node, right, right_height)
+        else:
+            smaller, smaller_height, found, greater, greater_height = self._split(right, right_height, value)
+            smaller, smaller_height = self._join(left, left_height, node, smaller, smaller_height)
+
+        return smaller, smaller_height, found, greater, greater_height
+
+    def _union(self, first, first_height, second, second_height):
+        if not first:
+            return second, second_height
+        if not second:
+            return first, first_height
+
+        left, right = first.left, first.right
+        left_height, right_height = self._child_heights(first, first_height)
+        smaller, smaller_height, _, greater, greater_height = self._split(second, second_height, first.value)
+
+        left, left_height = self._union(left, left_height, smaller, smaller_height)
+        right, right_height = self._union(right, right_height, greater, greater_height)
+        return self._join(left, left_height, first, right, right_height)
+
+    def _intersection(self, first, first_height, second, second_height):
+        if not first or not second:
+            return None, 0
+
+        left, right = first.left, first.right
+        left_height, right_height = self._child_heights(first, first_height)
+        smaller, smaller_height, found, greater, greater_height = self._split(second, second_height, first.value)
+
+        left, left_height = self._intersection(left, left_height, smaller, smaller_height)
+        right, right_height = self._intersection(right, right_height, greater, greater_height)
+        if found:
+            return self._join(left, left_height, first, right, right_height)
+        return self._join_without_key(left, left_height, right, right_height)
+
+    def _difference(self, first, first_height, second, second_height):
+        if not first or not second:
+            return first, first_height
+
+        left_height, right_height = self._child_heights(second, second_height)
+        smaller, smaller_height, _, greater, greater_height = self._split(first, first_height, second.value)
+
+        smaller, smaller_height = self._difference(smaller, smaller_height, second.left, left_height)
+        greater, greater_height = self._difference(greater, greater_height, second.right, right_height)
+        return self._join_without_key(smaller, smaller_height, greater, greater_height)
 
     def __update_balance_factor(self, node):
         if node.balance_factor < -1 or node.balance_factor > 1:
@@ -100,84 +377,19 @@ class AVLTree:
                 self.right_rotate(node)
 
     def left_rotate(self, node):
-        aux = node.right
-        node.right = aux.left
-
-        if aux.left:
-            aux.left.parent = node
-
-        aux.parent = node.parent
-
-        if not node.parent:
-            self.root = aux
-        elif node == node.parent.left:
-            node.parent.left = aux
-        else:
-            node.parent.right = aux
-
-        aux.left = node
-        node.parent = aux
-
+        super().left_rotate(node)
+        aux = node.parent
         node.balance_factor = node.balance_factor - 1 - max(0, aux.balance_factor)
         aux.balance_factor = aux.balance_factor - 1 + min(0, node.balance_factor)
 
     def right_rotate(self, node):
-        aux = node.left
-        node.left = aux.right
-
-        if aux.right:
-            aux.right.parent = node
-
-        aux.parent = node.parent
-
-        if not node.parent:
-            self.root = aux
-        elif node == node.parent.right:
-            node.parent.right = aux
-        else:
-            node.parent.left = aux
-
-        aux.right = node
-        node.parent = aux
-
+        super().right_rotate(node)
+        aux = node.parent
         node.balance_factor = node.balance_factor + 1 - min(0, aux.balance_factor)
         aux.balance_factor = aux.balance_factor + 1 + max(0, node.balance_factor)
 
-    def pre_order(self):
-        return self.__pre_order_recursive(self.root)
-
-    def __pre_order_recursive(self, node):
-        main_str = ''
-
-        if node:
-            main_str += str(node.value) + ' - '
-            main_str += self.__pre_order_recursive(node.left)
-            main_str += self.__pre_order_recursive(node.right)
-
-        return main_str
-
-    def in_order(self):
-        return self.__in_order_recursive(self.root)
 
-    def __in_order_recursive(self, node):
-        main_str = ''
-
-        if node:
-            main_str += self.__in_order_recursive(node.left)
-            main_str += str(node.value) + ' - '
-            main_str += self.__in_order_recursive(node.right)
-
-        return main_str
-
-    def post_order(self):
-        return self.__post_order_recursive(self.root)
-
-    def __post_order_recursive(self, node):
-        main_str = ''
-
-        if node:
-            main_str += self.__post_order_recursive(node.left)
-            main_str += self.__post_order_recursive(node.right)
-            main_str += str(node.value) + ' - '
-
-        return main_str
+def _union_values(first, second):
+    tree = AVLTree.from_sorted(first)
+    tree.union(AVLTree.from_sorted(second))
+    return list(tree)
@@ -0,0 +1,395 @@
+import bisect
+import numbers
+
+from models.b_tree import BTree
+
+
+# Ordered key/value map. Internal nodes are plain BTree.Node objects holding separator keys only;
+# every (key, value) pair lives in a leaf, and the leaves form a doubly linked list so that range
+# scans cost O(log n + k) in either direction. Duplicate keys are allowed and keep insertion order.
+#
+# Separators are inclusive bounds: every key under children[i] is <= keys[i] and every key under
+# children[i + 1] is >= keys[i], which lets runs of equal keys span several leaves.
+class BPlusTree(object):
+
+    # The degree is the minimum number of children each non-root internal node must have.
+    def __init__(self, degree, pairs=None):
+        if not isinstance(degree, numbers.Integral):
+            raise TypeError()
+        if degree < 2:
+            raise ValueError("Degree must be at least 2")
+        self.minkeys = degree - 1  # Also the minimum number of pairs in a non-root leaf
+        self.maxkeys = degree * 2 - 1
+
+        self.clear()
+        if pairs is not None:
+            for key, value in pairs:
+                self.insert(key, value)
+
+    def __len__(self):
+        return self.size
+
+    def clear(self):
+        self.root = BPlusTree.Leaf()
+        self.size = 0
+
+    # Builds a tree from (key, value) pairs sorted by key in linear time: packed leaves first,
+    # then the internal levels through the same builder as BTree.bulkload.
+    @classmethod
+    def bulkload(cls, sorted_pairs, degree, fill_factor=1.0):
+        if not 0 < fill_factor <= 1:
+            raise ValueError("Fill factor must be in (0, 1]")
+        tree = cls(degree)
+        pairs = list(sorted_pairs)
+        for i in range(1, len(pairs)):
+            if pairs[i][0] < pairs[i - 1][0]:
+                raise ValueError("Pairs must be sorted by key")
+        if len(pairs) <= tree.maxkeys:
+            for key, value in pairs:
+                tree.root.keys.append(key)
+                tree.root.values.append(value)
+            tree.size = len(pairs)
+            return tree
+
+        target = min(max(int(round(tree.maxkeys * fill_factor)), tree.minkeys), tree.maxkeys)
+        groups = min(-(-len(pairs) // target), len(pairs) // tree.minkeys)
+        base, extra = divmod(len(pairs), groups)
+
+        leaves = []
+        start = 0
+        for i in range(groups):
+            end = start + base + (1 if i < extra else 0)
+            leaf = BPlusTree.Leaf()
+            leaf.keys = [pair[0] for pair in pairs[start:end]]
+            leaf.values = [pair[1] for pair in pairs[start:end]]
+            if leaves:
+                leaves[-1].next = leaf
+                leaf.prev = leaves[-1]
+            leaves.append(leaf)
+            start = end
+
+        separators = [leaf.keys[0] for leaf in leaves[1:]]
+        tree.root = BTree._build_levels(separators, leaves, tree.minkeys, tree.maxkeys, target)
+        tree.size = len(pairs)
+        return tree
+
+    # ---- Lookups ----
+
+    def __contains__(self, key):
+        leaf, index = self._first_at_least(key)
+        return leaf is not None and leaf.keys[index] == key
+
+    def get(self, key, default=None):
+        leaf, index = self._first_at_least(key)
+        if leaf is not None and leaf.keys[index] == key:
+            return leaf.values[index]
+        return default
+
+    def getlist(self, key):
+        return [value for _, value in self.irange(key, key)]
+
+    def __getitem__(self, key):
+        leaf, index = self._first_at_least(key)
+        if leaf is None or leaf.keys[index] != key:
+            raise KeyError(str(key))
+        return leaf.values[index]
+
+    # Yields (key, value) for every key in [low, high]; None leaves that side unbounded.
+    def irange(self, low=None, high=None, reverse=False):
+        if not reverse:
+            if low is None:
+                leaf, index = self._first_leaf(), 0
+            else:
+                leaf, index = self._first_at_least(low)
+            while leaf is not None:
+                keys, values = leaf.keys, leaf.values
+                while index < len(keys):
+                    if high is not None and keys[index] > high:
+                        return
+                    yield keys[index], values[index]
+                    index += 1
+                leaf, index = leaf.next, 0
+        else:
+            if high is None:
+                leaf = self._last_leaf()
+                index = len(leaf.keys) - 1
+            else:
+                leaf, index = self._last_at_most(high)
+            while leaf is not None:
+                keys, values = leaf.keys, leaf.values
+                while index >= 0:
+                    if low is not None and keys[index] < low:
+                        return
+                    yield keys[index], values[index]
+                    index -= 1
+                leaf = leaf.prev
+                if leaf is not None:
+                    index = len(leaf.keys) - 1
+
+    def items(self):
+        return self.irange()
+
+    def keys(self):
+        return (key for key, _ in self.irange())
+
+    def values(self):
+        return (value for _, value in self.irange())
+
+    # Note: Not fail-fast on concurrent modification.
+    def __iter__(self):
+        return self.keys()
+
+    def __reversed__(self):
+        return (key for key, _ in self.irange(reverse=True))
+
+    # ---- Modification ----
+
+    def insert(self, key, value):
+        # Descend with bisect_right so that a new duplicate lands after the existing ones
+        path = []
+        node = self.root
+        while not node.is_leaf():
+            index = bisect.bisect_right(node.keys, key)
+            path.append((node, index))
+            node = node.children[index]
+
+        index = bisect.bisect_right(node.keys, key)
+        node.keys.insert(index, key)
+        node.values.insert(index, value)
+        self.size += 1
+
+        # Split overflowing nodes on the way back up
+        if len(node.keys) > self.maxkeys:
+            middle = len(node.keys) // 2
+            right = BPlusTree.Leaf()
+            right.keys = node.keys[middle:]
+            right.values = node.values[middle:]
+            del node.keys[middle:]
+            del node.values[middle:]
+            right.next = node.next
+            right.prev = node
+            if node.next is not None:
+                node.next.prev = right
+            node.next = right
+            separator = right.keys[0]
+
+            while True:
+                if not path:
+                    self.root = BTree.Node(self.maxkeys, False)  # Increment tree height
+                    self.root.keys.append(separator)
+                    self.root.children.extend((node, right))
+                    return
+                parent, index = path.pop()
+                parent.keys.insert(index, separator)
+                parent.children.insert(index + 1, right)
+                if len(parent.keys) <= self.maxkeys:
+                    return
+
+                node = parent
+                middle = len(node.keys) // 2
+                right = BTree.Node(self.maxkeys, False)
+                separator = node.keys[middle]
+                right.keys.extend(node.keys[middle + 1:])
+                right.children.extend(node.children[middle + 1:])
+                del node.keys[middle:]
+                del node.children[middle + 1:]
+
+    # Map assignment: replaces the value of the first pair with this key, or inserts a new pair if
+    # there is none. Use insert() to add a duplicate.
+    def __setitem__(self, key, value):
+        leaf, index = self._first_at_least(key)
+        if leaf is not None and leaf.keys[index] == key:
+            leaf.values[index] = value
+        else:
+            self.insert(key, value)
+
+    # Removes the first pair with the given key and returns its value.
+    def remove(self, key):
+        path = self._path_to_first_at_least(key)
+        leaf, index = path.pop()
+        if index >= len(leaf.keys) or leaf.keys[index] != key:
+            raise KeyError(str(key))
+
+        del leaf.keys[index]
+        value = leaf.values.pop(index)
+        self.size -= 1
+        self._rebalance(leaf, path)
+        return value
+
+    def discard(self, key):
+        try:
+            self.remove(key)
+        except KeyError:
+            pass
+
+    def __delitem__(self, key):
+        self.remove(key)
+
+    # ---- Helpers ----
+
+    def _first_leaf(self):
+        node = self.root
+        while not node.is_leaf():
+            node = node.children[0]
+        return node
+
+    def _last_leaf(self):
+        node = self.root
+        while not node.is_leaf():
+            node = node.children[-1]
+        return node
+
+    # Returns (leaf, index) of the first pair whose key is >= key, or (None, None).
+    def _first_at_least(self, key):
+        node = self.root
+        while not node.is_leaf():
+            node = node.children[bisect.bisect_left(node.keys, key)]
+        index = bisect.bisect_left(node.keys, key)
+        if index == len(node.keys):
+            node, index = node.next, 0
+        return (node, index) if node is not None else (None, None)
+
+    # Returns (leaf, index) of the last pair whose key is <= key, or (None, -1).
+    def _last_at_most(self, key):
+        node = self.root
+        while not node.is_leaf():
+            node = node.children[bisect.bisect_right(node.keys, key)]
+        index = bisect.bisect_right(node.keys, key) - 1
+        if index < 0:
+            node = node.prev
+            index = len(node.keys) - 1 if node is not None else -1
+        return node, index
+
+    # Like _first_at_least, but returns the whole (node, child index) path down to the leaf,
+    # moving the path over to the next leaf when the key's first pair starts there.
+    def _path_to_first_at_least(self, key):
+        path = []
+        node = self.root
+        while not node.is_leaf():
+            index = bisect.bisect_left(node.keys, key)
+            path.append((node, index))
+            node = node.children[index]
+        index = bisect.bisect_left(node.keys, key)
+
+        if index == len(node.keys) and node.next is not None:
+            # Climb to the first ancestor with a child further right, then take its leftmost leaf
+            depth = len(path) - 1
+            while path[depth][1] == len(path[depth][0].children) - 1:
+                depth -= 1
+            del path[depth + 1:]
+            parent, child_index = path.pop()
+            path.append((parent, child_index + 1))
+            node = parent.children[child_index + 1]
+            while not node.is_leaf():
+                path.append((node, 0))
+                node = node.children[0]
+            index = 0
+
+        path.append((node, index))
+        return path
+
+    # Restores the minimum size of node after a removal by borrowing from or merging with a
+    # sibling, repeating on the parent whenever a merge leaves it underfull.
+    def _rebalance(self, node, path):
+        while path and len(node.keys) < self.minkeys:
+            parent, index = path.pop()
+            left = parent.children[index - 1] if index > 0 else None
+            right = parent.children[index + 1] if index + 1 < len(parent.children) else None
+
+            if left is not None and len(left.keys) > self.minkeys:  # Borrow from left sibling
+                if node.is_leaf():
+                    node.keys.insert(0, left.keys.pop())
+                    node.values.insert(0, left.values.pop())
+                    parent.keys[index - 1] = node.keys[0]
+                else:
+                    node.keys.insert(0, parent.keys[index - 1])
+                    node.children.insert(0, left.children.pop())
+                    parent.keys[index - 1] = left.keys.pop()
+                return
+            elif right is not None and len(right.keys) > self.minkeys:  # Borrow from right sibling
+                if node.is_leaf():
+                    node.keys.append(right.keys.pop(0))
+                    node.values.append(right.values.pop(0))
+                    parent.keys[index] = right.keys[0]
+                else:
+                    node.keys.append(parent.keys[index])
+                    node.children.append(right.children.pop(0))
+                    parent.keys[index] = right.keys.pop(0)
+                return
+
+            if left is None:  # Merge right sibling into node instead of node into left sibling
+                left, node, index = node, right, index + 1
+            if node.is_leaf():
+                left.keys.extend(node.keys)
+                left.values.extend(node.values)
+                left.next = node.next
+                if node.next is not None:
+                    node.next.prev = left
+            else:
+                left.keys.append(parent.keys[index - 1])
+                left.keys.extend(node.keys)
+                left.children.extend(node.children)
+            del parent.keys[index - 1]
+            del parent.children[index]
+            node = parent
+
+        if not self.root.is_leaf() and len(self.root.keys) == 0:
+            self.root = self.root.children[0]  # Decrement tree height
+
+    # For unit tests
+    def check_structure(self):
+        count, _ = self._check_node(self.root, True, None, None)
+        if count != self.size:
+            raise AssertionError("Size mismatch")
+
+        # The leaf chain must visit every pair in order, with consistent back links
+        previous, chained = None, 0
+        leaf = self._first_leaf()
+        while leaf is not None:
+            if leaf.prev is not previous:
+                raise AssertionError("Broken leaf links")
+            chained += len(leaf.keys)
+            previous, leaf = leaf, leaf.next
+        if chained != self.size or previous is not self._last_leaf():
+            raise AssertionError("Broken leaf links")
+
+    # Returns (pair count, leaf depth) for the subtree, checking sizes and bounds on the way.
+    def _check_node(self, node, isroot, low, high):
+        keys = node.keys
+        if len(keys) > self.maxkeys or (not isroot and len(keys) < self.minkeys):
+            raise AssertionError("Invalid number of keys")
+        if any(keys[i] > keys[i + 1] for i in range(len(keys) - 1)):
+            raise AssertionError("Invalid key ordering")
+        if keys and ((low is not None and keys[0] < low) or (high is not None and keys[-1] > high)):
+            raise AssertionError("Key outside of separator bounds")
+
+        if node.is_leaf():
+            if len(node.values) != len(keys):
+                raise AssertionError("One value per key required")
+            return len(keys), 0
+
+        if (isroot and len(keys) == 0) or len(node.children) != len(keys) + 1:
+            raise AssertionError("Invalid number of children")
+        bounds = [low] + keys + [high]
+        count, depth = 0, None
+        for (i, child) in enumerate(node.children):
+            child_count, child_depth = self._check_node(child, False, bounds[i], bounds[i + 1])
+            if depth is not None and child_depth != depth:
+                raise AssertionError("Leaves at different depths")
+            count += child_count
+            depth = child_depth
+        return count, depth + 1
+
+    # ---- Helper class ----
+
+    class Leaf(object):
+
+        def __init__(self):
+            self.keys = []
+            self.values = []  # Always the same length as keys
+            self.children = None
+            self.next = None
+            self.prev = None
+
+        def is_leaf(self):
+            return True
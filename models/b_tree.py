@@ -21,11 +21,22 @@
 #   Software.
 #
 
+import bisect
 import numbers
+import os
+import random
+from multiprocessing import Pool
+
+from models.eytzinger_index import EytzingerIndex
 
 
 class BTree(object):
 
+    # Checks node invariants on every step of insert and remove. Off by default since they cost
+    # more than the (logarithmic) node search itself; turn it on when debugging. Nodes read the flag
+    # from BTree itself, so setting it here covers every subclass.
+    check_invariants = False
+
     # The degree is the minimum number of children each non-root internal node must have.
     def __init__(self, degree, coll=None):
         if not isinstance(degree, numbers.Integral):
@@ -44,9 +55,205 @@ class BTree(object):
         return self.size
 
     def clear(self):
-        self.root = BTree.Node(self.maxkeys, True)
+        self.root = self.Node(self.maxkeys, True)
         self.size = 0
 
+    # Builds a tree from strictly increasing keys in linear time, one level at a time from the
+    # leaves up, instead of inserting (and splitting) key by key. fill_factor sets how full the
+    # nodes are packed, as a fraction of maxkeys; nodes never go below minkeys.
+    @classmethod
+    def bulkload(cls, sorted_iterable, degree, fill_factor=1.0):
+        if not 0 < fill_factor <= 1:
+            raise ValueError("Fill factor must be in (0, 1]")
+        tree = cls(degree)
+        keys = list(sorted_iterable)
+        for i in range(1, len(keys)):
+            if not keys[i - 1] < keys[i]:
+                raise ValueError("Keys must be sorted and distinct")
+
+        target = min(max(int(round(tree.maxkeys * fill_factor)), tree.minkeys), tree.maxkeys)
+        tree.root = cls._build_levels(keys, None, tree.minkeys, tree.maxkeys, target)
+        tree.size = len(keys)
+        return tree
+
+    # Packs keys (and, above the leaves, the children between them) into nodes of about target
+    # keys each. The keys left between consecutive nodes become the next level up, until
+    # everything fits in a single root node. Children may be any node type; new nodes are cls.Node.
+    # Subtree sizes are only counted over the levels built here.
+    @classmethod
+    def _build_levels(cls, keys, children, minkeys, maxkeys, target):
+        sizes = None if children is None else [0] * len(children)
+        while len(keys) > maxkeys:
+            count = len(keys) + 1
+            groups = min(-(-count // (target + 1)), count // (minkeys + 1))
+            base, extra = divmod(count - groups, groups)
+
+            nodes, separators = [], []
+            start = 0
+            for i in range(groups):
+                end = start + base + (1 if i < extra else 0)
+                node = cls.Node(maxkeys, children is None)
+                node.keys.extend(keys[start:end])
+                node.size = end - start
+                if children is not None:
+                    node.children = children[start:end + 1]
+                    node.size += sum(sizes[start:end + 1])
+                nodes.append(node)
+                if i < groups - 1:
+                    separators.append(keys[end])
+                start = end + 1
+
+            keys, children, sizes = separators, nodes, [node.size for node in nodes]
+
+        root = cls.Node(maxkeys, children is None)
+        root.keys.extend(keys)
+        root.size = len(keys)
+        if children is not None:
+            root.children = children
+            root.size += sum(sizes)
+        return root
+
+    # Builds a tree from unsorted keys (duplicates allowed) on several cores: the keys are split
+    # into as many value ranges as there are workers, every range is sorted and bulk-loaded in a
+    # separate process, and the resulting trees are concatenated in order.
+    @classmethod
+    def parallel_build(cls, iterable, degree, processes=None, fill_factor=1.0):
+        keys = list(iterable)
+        parts = processes or os.cpu_count() or 1
+        if parts == 1 or len(keys) < parts * 64:
+            return cls.bulkload(sorted(set(keys)), degree, fill_factor)
+
+        sample = sorted(random.sample(keys, parts * 64))
+        bounds = sorted(set(sample[len(sample) * i // parts] for i in range(1, parts)))
+        ranges = [[] for _ in range(len(bounds) + 1)]
+        for key in keys:
+            ranges[bisect.bisect_right(bounds, key)].append(key)
+
+        with Pool(parts) as pool:
+            results = pool.starmap(_bulkload_range, [(cls, keys, degree, fill_factor) for keys in ranges])
+
+        tree = cls(degree)
+        for root, size in results:
+            part = cls(degree)
+            part.root, part.size = root, size
+            tree.concat(part)
+        return tree
+
+    # Moves all keys of other into this tree in O(log n), by grafting the shorter tree onto the
+    # side of the taller one. Every key of other must be smaller than all keys of this tree or
+    # greater than all of them. Other is left empty.
+    def concat(self, other):
+        low, high = self._concat_order(other)
+        if len(other) == 0:
+            return
+        if len(self) == 0:
+            self.root, self.size = other.root, other.size
+            other.clear()
+            return
+
+        size = self.size + other.size
+        separator = high.min()
+        BTree._remove(high, separator)
+        self.root = self._join_roots(low.root, separator, high.root)
+        self.size = size
+        other.clear()
+
+    # Returns the tree with the lower keys and the tree with the higher keys, or raises if the
+    # two trees cannot be concatenated.
+    def _concat_order(self, other):
+        if type(other) is not type(self):
+            raise TypeError("Trees must have the same type")
+        if other.maxkeys != self.maxkeys:
+            raise ValueError("Trees must have the same degree")
+        if other is self:
+            raise ValueError("Cannot concatenate a tree with itself")
+        if len(self) == 0 or len(other) == 0 or self.max() < other.min():
+            return self, other
+        elif other.max() < self.min():
+            return other, self
+        raise ValueError("Key ranges overlap")
+
+    # Joins two subtrees and a separator lying between their keys. The shorter subtree is merged
+    # with the outermost node of the same height on the taller one's facing spine, and any
+    # overflow is split upwards along that spine. Returns the new root.
+    def _join_roots(self, left, separator, right):
+        left_height, right_height = BTree._height(left), BTree._height(right)
+        path = []
+        if left_height >= right_height:
+            root, added = left, right.size + 1
+            node = left
+            for _ in range(left_height - right_height):
+                path.append(node)
+                node = node.children[-1]
+            parts = self._merge_nodes(node, separator, right)
+        else:
+            root, added = right, left.size + 1
+            node = right
+            for _ in range(right_height - left_height):
+                path.append(node)
+                node = node.children[0]
+            parts = self._merge_nodes(left, separator, node)
+        for node in path:
+            node.size += added
+
+        while len(path) > 0:
+            parent = path.pop()
+            index = len(parent.keys) if left_height >= right_height else 0
+            parent.children[index] = parts[0]
+            if len(parts) == 1:
+                return root
+            parent.keys.insert(index, parts[1])
+            parent.children.insert(index + 1, parts[2])
+            if len(parent.keys) <= self.maxkeys:
+                return root
+            parts = self._split_node(parent)
+
+        if len(parts) == 1:
+            return parts[0]
+        root = self.Node(self.maxkeys, False)  # Increment tree height
+        root.keys.append(parts[1])
+        root.children.extend((parts[0], parts[2]))
+        root.size = parts[0].size + 1 + parts[2].size
+        return root
+
+    # Returns [node] holding the keys and children of both nodes around the separator, or
+    # [left, key, right] if that is too many keys for one node.
+    def _merge_nodes(self, left, separator, right):
+        node = self.Node(self.maxkeys, left.is_leaf())
+        node.keys.extend(left.keys)
+        node.keys.append(separator)
+        node.keys.extend(right.keys)
+        if not node.is_leaf():
+            node.children.extend(left.children)
+            node.children.extend(right.children)
+        node.size = left.size + 1 + right.size
+        if len(node.keys) <= self.maxkeys:
+            return [node]
+        return self._split_node(node)
+
+    # Moves the upper half of an overfull node to a new node and returns (node, middle key, new node).
+    def _split_node(self, node):
+        middle = len(node.keys) // 2
+        right = self.Node(self.maxkeys, node.is_leaf())
+        separator = node.keys[middle]
+        right.keys.extend(node.keys[middle + 1:])
+        del node.keys[middle:]
+        right.size = len(right.keys)
+        if not node.is_leaf():
+            right.children.extend(node.children[middle + 1:])
+            del node.children[middle + 1:]
+            right.size += sum(child.size for child in right.children)
+        node.size -= right.size + 1
+        return node, separator, right
+
+    @staticmethod
+    def _height(node):
+        height = 0
+        while not node.is_leaf():
+            height += 1
+            node = node.children[0]
+        return height
+
     def __contains__(self, obj):
         # Walk down the tree
         node = self.root
@@ -64,23 +271,29 @@ class BTree(object):
         root = self.root
         if len(root.keys) == self.maxkeys:
             child = root
-            self.root = root = BTree.Node(self.maxkeys, False)  # Increment tree height
+            self.root = root = self.Node(self.maxkeys, False)  # Increment tree height
             root.children.append(child)
+            root.size = child.size
             root.split_child(self.minkeys, self.maxkeys, 0)
 
-        # Walk down the tree
+        # Walk down the tree, remembering the nodes whose subtree sizes grow if obj is new
         node = root
+        path = []
         while True:
             # Search for index in current node
-            assert len(node.keys) < self.maxkeys
-            assert node is root or len(node.keys) >= self.minkeys
+            if self.check_invariants:
+                assert len(node.keys) < self.maxkeys
+                assert node is root or len(node.keys) >= self.minkeys
             found, index = node.search(obj)
             if found:
                 return  # Key already exists in tree
+            path.append(node)
 
             if node.is_leaf():  # Simple insertion into leaf
                 node.keys.insert(index, obj)
                 self.size += 1
+                for node in path:
+                    node.size += 1
                 return  # Successfully added
 
             else:  # Handle internal node
@@ -102,18 +315,24 @@ class BTree(object):
 
     # Returns whether an object was removed.
     def _remove(self, obj):
-        # Walk down the tree
+        # Walk down the tree, remembering the nodes whose subtree sizes shrink if obj is found
         root = self.root
         found, index = root.search(obj)
         node = root
+        path = []
         while True:
-            assert len(node.keys) <= self.maxkeys
-            assert node is root or len(node.keys) > self.minkeys
+            if self.check_invariants:
+                assert len(node.keys) <= self.maxkeys
+                assert node is root or len(node.keys) > self.minkeys
+            path.append(node)
             if node.is_leaf():
                 if found:  # Simple removal from leaf
                     node.remove_key(index)
-                    assert self.size > 0
+                    if self.check_invariants:
+                        assert self.size > 0
                     self.size -= 1
+                    for node in path:
+                        node.size -= 1
                 return found
 
             else:  # Internal node
@@ -121,18 +340,25 @@ class BTree(object):
                     left, right = node.children[index: index + 2]
                     if len(left.keys) > self.minkeys:  # Replace key with predecessor
                         node.keys[index] = left.remove_max(self.minkeys)
-                        assert self.size > 0
+                        if self.check_invariants:
+                            assert self.size > 0
                         self.size -= 1
+                        for node in path:
+                            node.size -= 1
                         return True
                     elif len(right.keys) > self.minkeys:
                         node.keys[index] = right.remove_min(self.minkeys)
-                        assert self.size > 0
+                        if self.check_invariants:
+                            assert self.size > 0
                         self.size -= 1
+                        for node in path:
+                            node.size -= 1
                         return True
                     else:  # Merge key and right node into left node, then recurse
                         node.merge_children(self.minkeys, index)
                         if node is root and len(root.keys) == 0:
-                            assert len(root.children) == 1
+                            if self.check_invariants:
+                                assert len(root.children) == 1
                             self.root = root = left  # Decrement tree height
                         node = left
                         index = self.minkeys  # Index known due to merging; no need to search
@@ -140,11 +366,146 @@ class BTree(object):
                 else:  # Key might be found in some child
                     child = node.ensure_child_remove(self.minkeys, index)
                     if node is root and len(root.keys) == 0:
-                        assert len(root.children) == 1
+                        if self.check_invariants:
+                            assert len(root.children) == 1
                         self.root = root = root.children[0]  # Decrement tree height
                     node = child
                     found, index = node.search(obj)
 
+    # Inserts a batch of objects and returns how many were new. The batch is sorted first, so that
+    # consecutive keys can resume from the previous descent path (a finger) instead of the root:
+    # the path is only unwound as far as needed to reach a subtree that can hold the next key.
+    # Full nodes are split bottom-up along that path.
+    def insert_many(self, objs):
+        path = []  # Entries are [node, index of the child taken, upper bound of the node's keys]
+        added = 0
+        for obj in sorted(set(objs)):
+            node, found, index = self._finger_descend(path, obj)
+            if found:
+                continue
+            node.keys.insert(index, obj)
+            self.size += 1
+            added += 1
+            for entry in path:
+                entry[0].size += 1
+
+            # Split overflowing nodes bottom-up, then resume from the lowest node left intact
+            level = len(path) - 1
+            while len(path[level][0].keys) > self.maxkeys:
+                node, separator, right = self._split_node(path[level][0])
+                if level == 0:
+                    self.root = self.Node(self.maxkeys, False)  # Increment tree height
+                    self.root.keys.append(separator)
+                    self.root.children.extend((node, right))
+                    self.root.size = node.size + 1 + right.size
+                    del path[:]
+                    break
+                parent, child_index, _ = path[level - 1]
+                parent.keys.insert(child_index, separator)
+                parent.children.insert(child_index + 1, right)
+                level -= 1
+            del path[level + 1:]
+        return added
+
+    # Removes every object of a batch that is present and returns how many were removed. Like
+    # insert_many it works through the sorted batch along a finger path, and it repairs underfull
+    # nodes bottom-up (borrowing from a sibling or merging with one) instead of top-down.
+    def remove_many(self, objs):
+        path = []
+        removed = 0
+        for obj in sorted(set(objs)):
+            node, found, index = self._finger_descend(path, obj)
+            if not found:
+                continue
+            removed += 1
+            self.size -= 1
+            level = len(path) - 1
+
+            if node.is_leaf():
+                node.remove_key(index)
+            else:  # Replace with the predecessor, which sits at the end of a leaf
+                path[-1][1] = index
+                upper = obj
+                child = node.children[index]
+                while True:
+                    path.append([child, len(child.keys), upper])
+                    if child.is_leaf():
+                        break
+                    child = child.children[-1]
+                node.keys[index] = child.keys.pop()
+            for entry in path:
+                entry[0].size -= 1
+
+            top = self._repair_underflow(path, len(path) - 1)
+            if top is None:
+                del path[:]
+            else:
+                del path[min(top, level) + 1:]
+        return removed
+
+    # Unwinds the finger path until its last node may contain obj (objects come in increasing
+    # order, so only the upper bound matters), then descends from there to the node holding obj
+    # or the leaf where it belongs. Returns (node, found, index) with node last on the path.
+    def _finger_descend(self, path, obj):
+        while len(path) > 1 and path[-1][2] is not None and obj >= path[-1][2]:
+            path.pop()
+        if not path:
+            path.append([self.root, 0, None])
+
+        while True:
+            node, _, upper = path[-1]
+            found, index = node.search(obj)
+            path[-1][1] = index
+            if found or node.is_leaf():
+                return node, found, index
+            path.append([node.children[index], 0, node.keys[index] if index < len(node.keys) else upper])
+
+    # Fixes the node at path[level] if it dropped below minkeys, and its ancestors in turn.
+    # Returns the highest level whose node changed, or None if the tree height shrank.
+    def _repair_underflow(self, path, level):
+        while level > 0 and len(path[level][0].keys) < self.minkeys:
+            node = path[level][0]
+            parent, index, _ = path[level - 1]
+            left = parent.children[index - 1] if index > 0 else None
+            right = parent.children[index + 1] if index < len(parent.keys) else None
+
+            if left is not None and len(left.keys) > self.minkeys:  # Borrow through the parent
+                node.keys.insert(0, parent.keys[index - 1])
+                parent.keys[index - 1] = left.keys.pop()
+                moved = 1
+                if not node.is_leaf():
+                    node.children.insert(0, left.children.pop())
+                    moved += node.children[0].size
+                node.size += moved
+                left.size -= moved
+                return level - 1
+            elif right is not None and len(right.keys) > self.minkeys:
+                node.keys.append(parent.keys[index])
+                parent.keys[index] = right.keys.pop(0)
+                moved = 1
+                if not node.is_leaf():
+                    node.children.append(right.children.pop(0))
+                    moved += node.children[-1].size
+                node.size += moved
+                right.size -= moved
+                return level - 1
+
+            if left is not None:  # Merge into the left sibling
+                index -= 1
+            left, right = parent.children[index: index + 2]
+            if not left.is_leaf():
+                left.children.extend(right.children)
+            del parent.children[index + 1]
+            left.keys.append(parent.remove_key(index))
+            left.keys.extend(right.keys)
+            left.size += 1 + right.size
+            level -= 1
+
+        if not self.root.is_leaf() and len(self.root.keys) == 0:
+            self.root = self.root.children[0]  # Decrement tree height
+            return None
+        return level
+
     # Note: Not fail-fast on concurrent modification.
     def __iter__(self):
         # Initialization
@@ -163,7 +524,8 @@ class BTree(object):
         while len(stack) > 0:
             node, index = stack.pop()
             if node.is_leaf():
-                assert index == 0
+                if self.check_invariants:
+                    assert index == 0
                 for obj in node.keys:
                     yield obj
             else:
@@ -173,6 +535,163 @@ class BTree(object):
                     stack.append((node, index))
                 push_left_path(node.children[index])
 
+    def __reversed__(self):
+        return self.irange(reverse=True)
+
+    # Lazily generates the keys in [lo, hi] (None means unbounded), in descending order if reverse.
+    # Only the initial descent costs O(log n); after that each key comes off the explicit stack,
+    # so a caller can pull one page at a time. Note: Not fail-fast on concurrent modification.
+    def irange(self, lo=None, hi=None, reverse=False):
+        # Stack entries are (leaf, start) for leaves, and (node, i) for internal nodes, meaning
+        # that node.keys[i] is the next key once the child currently being walked is done.
+        stack = []
+        node = self.root
+        while True:
+            if not reverse:
+                index = 0 if lo is None else bisect.bisect_left(node.keys, lo)
+            else:
+                index = len(node.keys) if hi is None else bisect.bisect_right(node.keys, hi)
+            if node.is_leaf():
+                stack.append((node, index))
+                break
+            if not reverse and index < len(node.keys):
+                stack.append((node, index))
+            elif reverse and index > 0:
+                stack.append((node, index - 1))
+            node = node.children[index]
+
+        while len(stack) > 0:
+            node, index = stack.pop()
+            keys = node.keys
+            if node.is_leaf():
+                if not reverse:
+                    for i in range(index, len(keys)):
+                        if hi is not None and keys[i] > hi:
+                            return
+                        yield keys[i]
+                else:
+                    for i in range(index - 1, -1, -1):
+                        if lo is not None and keys[i] < lo:
+                            return
+                        yield keys[i]
+            elif not reverse:
+                if hi is not None and keys[index] > hi:
+                    return
+                yield keys[index]
+                if index + 1 < len(keys):
+                    stack.append((node, index + 1))
+                node = node.children[index + 1]
+                while not node.is_leaf():
+                    stack.append((node, 0))
+                    node = node.children[0]
+                stack.append((node, 0))
+            else:
+                if lo is not None and keys[index] < lo:
+                    return
+                yield keys[index]
+                if index > 0:
+                    stack.append((node, index - 1))
+                node = node.children[index]
+                while not node.is_leaf():
+                    stack.append((node, len(node.keys) - 1))
+                    node = node.children[-1]
+                stack.append((node, len(node.keys)))
+
+    def min(self):
+        if self.size == 0:
+            raise ValueError("Empty tree")
+        node = self.root
+        while not node.is_leaf():
+            node = node.children[0]
+        return node.keys[0]
+
+    def max(self):
+        if self.size == 0:
+            raise ValueError("Empty tree")
+        node = self.root
+        while not node.is_leaf():
+            node = node.children[-1]
+        return node.keys[-1]
+
+    # Returns the greatest key <= obj, or None if there is none.
+    def floor(self, obj):
+        best = None
+        node = self.root
+        while True:
+            index = bisect.bisect_right(node.keys, obj)
+            if index > 0:
+                best = node.keys[index - 1]
+                if best == obj:
+                    return best
+            if node.is_leaf():
+                return best
+            node = node.children[index]
+
+    # Returns the smallest key >= obj, or None if there is none.
+    def ceiling(self, obj):
+        best = None
+        node = self.root
+        while True:
+            index = bisect.bisect_left(node.keys, obj)
+            if index < len(node.keys):
+                best = node.keys[index]
+                if best == obj:
+                    return best
+            if node.is_leaf():
+                return best
+            node = node.children[index]
+
+    # Returns an immutable, read-optimized copy of the current keys (see EytzingerIndex).
+    def freeze(self):
+        return EytzingerIndex(self)
+
+    # Returns the number of keys < obj, in O(log n) using the subtree sizes kept in every node.
+    def rank(self, obj):
+        return self._count_below(obj, False)
+
+    # Returns the key at the given position in sorted order, counting from 0.
+    def select(self, index):
+        if not 0 <= index < self.size:
+            raise IndexError("Index out of range")
+        node = self.root
+        while not node.is_leaf():
+            for (i, child) in enumerate(node.children):
+                if index < child.size:
+                    break
+                index -= child.size
+                if index == 0:
+                    return node.keys[i]
+                index -= 1
+            node = child
+        return node.keys[index]
+
+    # Supports negative indexes like a list.
+    def __getitem__(self, index):
+        if not isinstance(index, numbers.Integral):
+            raise TypeError("Index must be an integer")
+        if index < 0:
+            index += len(self)
+        return self.select(index)
+
+    # Returns the number of keys in [lo, hi] (None means unbounded), without visiting them.
+    def count_range(self, lo=None, hi=None):
+        below_hi = self.size if hi is None else self._count_below(hi, True)
+        below_lo = 0 if lo is None else self._count_below(lo, False)
+        return max(below_hi - below_lo, 0)
+
+    # Counts the keys < obj, or <= obj if inclusive.
+    def _count_below(self, obj, inclusive):
+        count = 0
+        node = self.root
+        while True:
+            index = bisect.bisect_right(node.keys, obj) if inclusive else bisect.bisect_left(node.keys, obj)
+            count += index
+            if node.is_leaf():
+                return count
+            for child in node.children[:index]:
+                count += child.size
+            node = node.children[index]
+
     # For unit tests
     def check_structure(self):
         # Check size and root node properties
@@ -201,9 +720,11 @@ class BTree(object):
 
         # Note: Once created, a node's structure never changes between a leaf and internal node.
         def __init__(self, maxkeys, leaf):
-            assert maxkeys >= 3 and maxkeys % 2 == 1
+            if BTree.check_invariants:
+                assert maxkeys >= 3 and maxkeys % 2 == 1
             self.keys = []  # Length is in [0, maxkeys] for root node, [minkeys, maxkeys] for all other nodes
             self.children = None if leaf else []  # If internal node, then length always equals len(keys)+1
+            self.size = 0  # Number of keys in the subtree rooted at this node
 
         # -- Methods for getting info --
 
@@ -211,20 +732,12 @@ class BTree(object):
             return self.children is None
 
         # Searches this node's keys list and returns (True, i) if obj equals keys[i],
-        # otherwise returns (False, i) if children[i] should be explored. For simplicity,
-        # the implementation uses linear search. It's possible to replace it with binary search for speed.
+        # otherwise returns (False, i) if children[i] should be explored. Uses binary search.
         def search(self, obj):
             keys = self.keys
-            i = 0
-            while i < len(keys):
-                if obj == keys[i]:
-                    assert 0 <= i < len(keys)
-                    return (True, i)  # Key found
-                elif obj > keys[i]:
-                    i += 1
-                else:
-                    break
-            assert 0 <= i <= len(keys)
+            i = bisect.bisect_left(keys, obj)
+            if i < len(keys) and keys[i] == obj:
+                return (True, i)  # Key found
             return (False, i)  # Not found, caller should recurse on child
 
         # -- Methods for insertion --
@@ -232,10 +745,12 @@ class BTree(object):
         # For the child node at the given index, this moves the right half of keys and children to a new node,
         # and adds the middle key and new child to this node. The left half of child's data is not moved.
         def split_child(self, minkeys, maxkeys, index):
-            assert not self.is_leaf() and 0 <= index <= len(self.keys) < maxkeys
+            if BTree.check_invariants:
+                assert not self.is_leaf() and 0 <= index <= len(self.keys) < maxkeys
             left = self.children[index]
-            assert len(left.keys) == maxkeys
-            right = BTree.Node(maxkeys, left.is_leaf())
+            if BTree.check_invariants:
+                assert len(left.keys) == maxkeys
+            right = type(left)(maxkeys, left.is_leaf())
             self.children.insert(index + 1, right)
 
             # Handle children
@@ -248,6 +763,12 @@ class BTree(object):
             right.keys.extend(left.keys[minkeys + 1:])
             del left.keys[minkeys:]
 
+            # Handle subtree sizes
+            right.size = len(right.keys)
+            if not right.is_leaf():
+                right.size += sum(child.size for child in right.children)
+            left.size -= right.size + 1
+
         # -- Methods for removal --
 
         # Performs modifications to ensure that this node's child at the given index has at least
@@ -256,31 +777,42 @@ class BTree(object):
         # A reference to the appropriate child is returned, which is helpful if the old child no longer exists.
         def ensure_child_remove(self, minkeys, index):
             # Preliminaries
-            assert not self.is_leaf() and 0 <= index < len(self.children)
+            if BTree.check_invariants:
+                assert not self.is_leaf() and 0 <= index < len(self.children)
             child = self.children[index]
             if len(child.keys) > minkeys:  # Already satisfies the condition
                 return child
-            assert len(child.keys) == minkeys
+            if BTree.check_invariants:
+                assert len(child.keys) == minkeys
 
             # Get siblings
             left = self.children[index - 1] if index >= 1 else None
             right = self.children[index + 1] if index < len(self.keys) else None
             internal = not child.is_leaf()
-            assert left is not None or right is not None  # At least one sibling exists because degree >= 2
-            assert left is None or left.is_leaf() != internal  # Sibling must be same type (internal/leaf) as child
-            assert right is None or right.is_leaf() != internal  # Sibling must be same type (internal/leaf) as child
+            if BTree.check_invariants:
+                assert left is not None or right is not None  # At least one sibling exists because degree >= 2
+                assert left is None or left.is_leaf() != internal  # Sibling must be same type (internal/leaf) as child
+                assert right is None or right.is_leaf() != internal  # Sibling must be same type (internal/leaf) as child
 
             if left is not None and len(left.keys) > minkeys:  # Steal rightmost item from left sibling
+                moved = 1
                 if internal:
                     child.children.insert(0, left.children.pop(-1))
+                    moved += child.children[0].size
                 child.keys.insert(0, self.keys[index - 1])
                 self.keys[index - 1] = left.remove_key(len(left.keys) - 1)
+                child.size += moved
+                left.size -= moved
                 return child
             elif right is not None and len(right.keys) > minkeys:  # Steal leftmost item from right sibling
+                moved = 1
                 if internal:
                     child.children.append(right.children.pop(0))
+                    moved += child.children[-1].size
                 child.keys.append(self.keys[index])
                 self.keys[index] = right.remove_key(0)
+                child.size += moved
+                right.size -= moved
                 return child
             elif left is not None:  # Merge child into left sibling
                 self.merge_children(minkeys, index - 1)
@@ -294,21 +826,26 @@ class BTree(object):
         # Merges the child node at index+1 into the child node at index,
         # assuming the current node is not empty and both children have minkeys.
         def merge_children(self, minkeys, index):
-            assert not self.is_leaf() and 0 <= index < len(self.keys)
+            if BTree.check_invariants:
+                assert not self.is_leaf() and 0 <= index < len(self.keys)
             left, right = self.children[index: index + 2]
-            assert len(left.keys) == len(right.keys) == minkeys
+            if BTree.check_invariants:
+                assert len(left.keys) == len(right.keys) == minkeys
             if not left.is_leaf():
                 left.children.extend(right.children)
             del self.children[index + 1]
             left.keys.append(self.remove_key(index))
             left.keys.extend(right.keys)
+            left.size += 1 + right.size
 
         # Removes and returns the minimum key among the whole subtree rooted at this node.
         # Requires this node to be preprocessed to have at least minkeys+1 keys.
         def remove_min(self, minkeys):
             node = self
             while True:
-                assert len(node.keys) > minkeys
+                if BTree.check_invariants:
+                    assert len(node.keys) > minkeys
+                node.size -= 1
                 if node.is_leaf():
                     return node.remove_key(0)
                 else:
@@ -319,7 +856,9 @@ class BTree(object):
         def remove_max(self, minkeys):
             node = self
             while True:
-                assert len(node.keys) > minkeys
+                if BTree.check_invariants:
+                    assert len(node.keys) > minkeys
+                node.size -= 1
                 if node.is_leaf():
                     return node.remove_key(len(node.keys) - 1)
                 else:
@@ -327,7 +866,8 @@ class BTree(object):
 
         # Removes and returns this node's key at the given index.
         def remove_key(self, index):
-            assert 0 <= index < len(self.keys)
+            if BTree.check_invariants:
+                assert 0 <= index < len(self.keys)
             return self.keys.pop(index)
 
         # -- Miscellaneous methods --
@@ -348,7 +888,7 @@ class BTree(object):
                 raise AssertionError("Invalid number of keys")
 
             # Check keys for strict increasing order
-            tempkeys = [min] + keys + [max]
+            tempkeys = [min] + list(keys) + [max]
             for i in range(len(tempkeys) - 1):
                 x = tempkeys[i]
                 y = tempkeys[i + 1]
@@ -366,559 +906,11 @@ class BTree(object):
                         raise TypeError()
                     count += child.check_structure(minkeys, maxkeys, False,
                                                    leafdepth - 1, tempkeys[i], tempkeys[i + 1])
+            if self.size != count:
+                raise AssertionError("Invalid subtree size")
             return count
 
 
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-# import bisect
-# import itertools
-# import operator
-#
-#
-# class _BNode(object):
-#     __slots__ = ["tree", "contents", "children"]
-#
-#     def __init__(self, tree, contents=None, children=None):
-#         self.tree = tree
-#         self.contents = contents or []
-#         self.children = children or []
-#         if self.children:
-#             assert len(self.contents) + 1 == len(self.children), \
-#                     "one more child than data item required"
-#
-#     def __repr__(self):
-#         name = getattr(self, "children", 0) and "Branch" or "Leaf"
-#         return "<%s %s>" % (name, ", ".join(map(str, self.contents)))
-#
-#     def lateral(self, parent, parent_index, dest, dest_index):
-#         if parent_index > dest_index:
-#             dest.contents.append(parent.contents[dest_index])
-#             parent.contents[dest_index] = self.contents.pop(0)
-#             if self.children:
-#                 dest.children.append(self.children.pop(0))
-#         else:
-#             dest.contents.insert(0, parent.contents[parent_index])
-#             parent.contents[parent_index] = self.contents.pop()
-#             if self.children:
-#                 dest.children.insert(0, self.children.pop())
-#
-#     def shrink(self, ancestors):
-#         parent = None
-#
-#         if ancestors:
-#             parent, parent_index = ancestors.pop()
-#             # try to lend to the left neighboring sibling
-#             if parent_index:
-#                 left_sib = parent.children[parent_index - 1]
-#                 if len(left_sib.contents) < self.tree.order:
-#                     self.lateral(
-#                             parent, parent_index, left_sib, parent_index - 1)
-#                     return
-#
-#             # try the right neighbor
-#             if parent_index + 1 < len(parent.children):
-#                 right_sib = parent.children[parent_index + 1]
-#                 if len(right_sib.contents) < self.tree.order:
-#                     self.lateral(
-#                             parent, parent_index, right_sib, parent_index + 1)
-#                     return
-#
-#         center = len(self.contents) // 2
-#         sibling, push = self.split()
-#
-#         if not parent:
-#             parent, parent_index = self.tree.BRANCH(
-#                     self.tree, children=[self]), 0
-#             self.tree._root = parent
-#
-#         # pass the median up to the parent
-#         parent.contents.insert(parent_index, push)
-#         parent.children.insert(parent_index + 1, sibling)
-#         if len(parent.contents) > parent.tree.order:
-#             parent.shrink(ancestors)
-#
-#     def grow(self, ancestors):
-#         parent, parent_index = ancestors.pop()
-#
-#         minimum = self.tree.order // 2
-#         left_sib = right_sib = None
-#
-#         # try to borrow from the right sibling
-#         if parent_index + 1 < len(parent.children):
-#             right_sib = parent.children[parent_index + 1]
-#             if len(right_sib.contents) > minimum:
-#                 right_sib.lateral(parent, parent_index + 1, self, parent_index)
-#                 return
-#
-#         # try to borrow from the left sibling
-#         if parent_index:
-#             left_sib = parent.children[parent_index - 1]
-#             if len(left_sib.contents) > minimum:
-#                 left_sib.lateral(parent, parent_index - 1, self, parent_index)
-#                 return
-#
-#         # consolidate with a sibling - try left first
-#         if left_sib:
-#             left_sib.contents.append(parent.contents[parent_index - 1])
-#             left_sib.contents.extend(self.contents)
-#             if self.children:
-#                 left_sib.children.extend(self.children)
-#             parent.contents.pop(parent_index - 1)
-#             parent.children.pop(parent_index)
-#         else:
-#             self.contents.append(parent.contents[parent_index])
-#             self.contents.extend(right_sib.contents)
-#             if self.children:
-#                 self.children.extend(right_sib.children)
-#             parent.contents.pop(parent_index)
-#             parent.children.pop(parent_index + 1)
-#
-#         if len(parent.contents) < minimum:
-#             if ancestors:
-#                 # parent is not the root
-#                 parent.grow(ancestors)
-#             elif not parent.contents:
-#                 # parent is root, and its now empty
-#                 self.tree._root = left_sib or self
-#
-#     def split(self):
-#         center = len(self.contents) // 2
-#         median = self.contents[center]
-#         sibling = type(self)(
-#                 self.tree,
-#                 self.contents[center + 1:],
-#                 self.children[center + 1:])
-#         self.contents = self.contents[:center]
-#         self.children = self.children[:center + 1]
-#         return sibling, median
-#
-#     def insert(self, index, item, ancestors):
-#         self.contents.insert(index, item)
-#         if len(self.contents) > self.tree.order:
-#             self.shrink(ancestors)
-#
-#     def remove(self, index, ancestors):
-#         minimum = self.tree.order // 2
-#
-#         if self.children:
-#             # try promoting from the right subtree first,
-#             # but only if it won't have to resize
-#             additional_ancestors = [(self, index + 1)]
-#             descendent = self.children[index + 1]
-#             while descendent.children:
-#                 additional_ancestors.append((descendent, 0))
-#                 descendent = descendent.children[0]
-#             if len(descendent.contents) > minimum:
-#                 ancestors.extend(additional_ancestors)
-#                 self.contents[index] = descendent.contents[0]
-#                 descendent.remove(0, ancestors)
-#                 return
-#
-#             # fall back to the left child
-#             additional_ancestors = [(self, index)]
-#             descendent = self.children[index]
-#             while descendent.children:
-#                 additional_ancestors.append(
-#                         (descendent, len(descendent.children) - 1))
-#                 descendent = descendent.children[-1]
-#             ancestors.extend(additional_ancestors)
-#             self.contents[index] = descendent.contents[-1]
-#             descendent.remove(len(descendent.children) - 1, ancestors)
-#         else:
-#             self.contents.pop(index)
-#             if len(self.contents) < minimum and ancestors:
-#                 self.grow(ancestors)
-#
-#
-# class _BPlusLeaf(_BNode):
-#     __slots__ = ["tree", "contents", "data", "next"]
-#
-#     def __init__(self, tree, contents=None, data=None, next=None):
-#         self.tree = tree
-#         self.contents = contents or []
-#         self.data = data or []
-#         self.next = next
-#         assert len(self.contents) == len(self.data), "one data per key"
-#
-#     def insert(self, index, key, data, ancestors):
-#         self.contents.insert(index, key)
-#         self.data.insert(index, data)
-#
-#         if len(self.contents) > self.tree.order:
-#             self.shrink(ancestors)
-#
-#     def lateral(self, parent, parent_index, dest, dest_index):
-#         if parent_index > dest_index:
-#             dest.contents.append(self.contents.pop(0))
-#             dest.data.append(self.data.pop(0))
-#             parent.contents[dest_index] = self.contents[0]
-#         else:
-#             dest.contents.insert(0, self.contents.pop())
-#             dest.data.insert(0, self.data.pop())
-#             parent.contents[parent_index] = dest.contents[0]
-#
-#     def split(self):
-#         center = len(self.contents) // 2
-#         median = self.contents[center - 1]
-#         sibling = type(self)(
-#                 self.tree,
-#                 self.contents[center:],
-#                 self.data[center:],
-#                 self.next)
-#         self.contents = self.contents[:center]
-#         self.data = self.data[:center]
-#         self.next = sibling
-#         return sibling, sibling.contents[0]
-#
-#     def remove(self, index, ancestors):
-#         minimum = self.tree.order // 2
-#         if index >= len(self.contents):
-#             self, index = self.next, 0
-#
-#         key = self.contents[index]
-#
-#         # if any leaf that could accept the key can do so
-#         # without any rebalancing necessary, then go that route
-#         current = self
-#         while current is not None and current.contents[0] == key:
-#             if len(current.contents) > minimum:
-#                 if current.contents[0] == key:
-#                     index = 0
-#                 else:
-#                     index = bisect.bisect_left(current.contents, key)
-#                 current.contents.pop(index)
-#                 current.data.pop(index)
-#                 return
-#             current = current.next
-#
-#         self.grow(ancestors)
-#
-#     def grow(self, ancestors):
-#         minimum = self.tree.order // 2
-#         parent, parent_index = ancestors.pop()
-#         left_sib = right_sib = None
-#
-#         # try borrowing from a neighbor - try right first
-#         if parent_index + 1 < len(parent.children):
-#             right_sib = parent.children[parent_index + 1]
-#             if len(right_sib.contents) > minimum:
-#                 right_sib.lateral(parent, parent_index + 1, self, parent_index)
-#                 return
-#
-#         # fallback to left
-#         if parent_index:
-#             left_sib = parent.children[parent_index - 1]
-#             if len(left_sib.contents) > minimum:
-#                 left_sib.lateral(parent, parent_index - 1, self, parent_index)
-#                 return
-#
-#         # join with a neighbor - try left first
-#         if left_sib:
-#             left_sib.contents.extend(self.contents)
-#             left_sib.data.extend(self.data)
-#             parent.remove(parent_index - 1, ancestors)
-#             return
-#
-#         # fallback to right
-#         self.contents.extend(right_sib.contents)
-#         self.data.extend(right_sib.data)
-#         parent.remove(parent_index, ancestors)
-#
-#
-# class BTree(object):
-#     BRANCH = LEAF = _BNode
-#
-#     def __init__(self, order):
-#         self.order = order
-#         self._root = self._bottom = self.LEAF(self)
-#
-#     def _path_to(self, item):
-#         current = self._root
-#         ancestry = []
-#
-#         while getattr(current, "children", None):
-#             index = bisect.bisect_left(current.contents, item)
-#             ancestry.append((current, index))
-#             if index < len(current.contents) \
-#                     and current.contents[index] == item:
-#                 return ancestry
-#             current = current.children[index]
-#
-#         index = bisect.bisect_left(current.contents, item)
-#         ancestry.append((current, index))
-#         present = index < len(current.contents)
-#         present = present and current.contents[index] == item
-#
-#         return ancestry
-#
-#     def _present(self, item, ancestors):
-#         last, index = ancestors[-1]
-#         return index < len(last.contents) and last.contents[index] == item
-#
-#     def insert(self, item):
-#         current = self._root
-#         ancestors = self._path_to(item)
-#         node, index = ancestors[-1]
-#         while getattr(node, "children", None):
-#             node = node.children[index]
-#             index = bisect.bisect_left(node.contents, item)
-#             ancestors.append((node, index))
-#         node, index = ancestors.pop()
-#         node.insert(index, item, ancestors)
-#
-#     def remove(self, item):
-#         current = self._root
-#         ancestors = self._path_to(item)
-#
-#         if self._present(item, ancestors):
-#             node, index = ancestors.pop()
-#             node.remove(index, ancestors)
-#         else:
-#             raise ValueError("%r not in %s" % (item, self.__class__.__name__))
-#
-#     def __contains__(self, item):
-#         return self._present(item, self._path_to(item))
-#
-#     def __iter__(self):
-#         def _recurse(node):
-#             if node.children:
-#                 for child, item in zip(node.children, node.contents):
-#                     for child_item in _recurse(child):
-#                         yield child_item
-#                     yield item
-#                 for child_item in _recurse(node.children[-1]):
-#                     yield child_item
-#             else:
-#                 for item in node.contents:
-#                     yield item
-#
-#         for item in _recurse(self._root):
-#             yield item
-#
-#     def __repr__(self):
-#         def recurse(node, accum, depth):
-#             accum.append(("  " * depth) + repr(node))
-#             for node in getattr(node, "children", []):
-#                 recurse(node, accum, depth + 1)
-#
-#         accum = []
-#         recurse(self._root, accum, 0)
-#         return "\n".join(accum)
-#
-#     @classmethod
-#     def bulkload(cls, items, order):
-#         tree = object.__new__(cls)
-#         tree.order = order
-#
-#         leaves = tree._build_bulkloaded_leaves(items)
-#         tree._build_bulkloaded_branches(leaves[0], leaves[1])
-#
-#         return tree
-#
-#     def _build_bulkloaded_leaves(self, items):
-#         minimum = self.order // 2
-#         leaves, seps = [[]], []
-#
-#         for item in items:
-#             if len(leaves[-1]) < self.order:
-#                 leaves[-1].append(item)
-#             else:
-#                 seps.append(item)
-#                 leaves.append([])
-#
-#         if len(leaves[-1]) < minimum and seps:
-#             last_two = leaves[-2] + [seps.pop()] + leaves[-1]
-#             leaves[-2] = last_two[:minimum]
-#             leaves[-1] = last_two[minimum + 1:]
-#             seps.append(last_two[minimum])
-#
-#         return [self.LEAF(self, contents=node) for node in leaves], seps
-#
-#     def _build_bulkloaded_branches(self, leaves, seps):
-#         minimum = self.order // 2
-#         levels = [leaves]
-#
-#         while len(seps) > self.order + 1:
-#             items, nodes, seps = seps, [[]], []
-#
-#             for item in items:
-#                 if len(nodes[-1]) < self.order:
-#                     nodes[-1].append(item)
-#                 else:
-#                     seps.append(item)
-#                     nodes.append([])
-#
-#             if len(nodes[-1]) < minimum and seps:
-#                 last_two = nodes[-2] + [seps.pop()] + nodes[-1]
-#                 nodes[-2] = last_two[:minimum]
-#                 nodes[-1] = last_two[minimum + 1:]
-#                 seps.append(last_two[minimum])
-#
-#             offset = 0
-#             for i, node in enumerate(nodes):
-#                 children = levels[-1][offset:offset + len(node) + 1]
-#                 nodes[i] = self.BRANCH(self, contents=node, children=children)
-#                 offset += len(node) + 1
-#
-#             levels.append(nodes)
-#
-#         self._root = self.BRANCH(self, contents=seps, children=levels[-1])
-#
-#
-# class BPlusTree(BTree):
-#     LEAF = _BPlusLeaf
-#
-#     def _get(self, key):
-#         node, index = self._path_to(key)[-1]
-#
-#         if index == len(node.contents):
-#             if node.next:
-#                 node, index = node.next, 0
-#             else:
-#                 return
-#
-#         while node.contents[index] == key:
-#             yield node.data[index]
-#             index += 1
-#             if index == len(node.contents):
-#                 if node.next:
-#                     node, index = node.next, 0
-#                 else:
-#                     return
-#
-#     def _path_to(self, item):
-#         path = super(BPlusTree, self)._path_to(item)
-#         node, index = path[-1]
-#         while hasattr(node, "children"):
-#             node = node.children[index]
-#             index = bisect.bisect_left(node.contents, item)
-#             path.append((node, index))
-#         return path
-#
-#     def get(self, key, default=None):
-#         try:
-#             return self._get(key).next()
-#         except StopIteration:
-#             return default
-#
-#     def getlist(self, key):
-#         return list(self._get(key))
-#
-#     def insert(self, key, data):
-#         path = self._path_to(key)
-#         node, index = path.pop()
-#         node.insert(index, key, data, path)
-#
-#     def remove(self, key):
-#         path = self._path_to(key)
-#         node, index = path.pop()
-#         node.remove(index, path)
-#
-#     __getitem__ = get
-#     __setitem__ = insert
-#     __delitem__ = remove
-#
-#     def __contains__(self, key):
-#         for item in self._get(key):
-#             return True
-#         return False
-#
-#     def iteritems(self):
-#         node = self._root
-#         while hasattr(node, "children"):
-#             node = node.children[0]
-#
-#         while node:
-#             for pair in itertools.izip(node.contents, node.data):
-#                 yield pair
-#             node = node.next
-#
-#     def iterkeys(self):
-#         return itertools.imap(operator.itemgetter(0), self.iteritems())
-#
-#     def itervalues(self):
-#         return itertools.imap(operator.itemgetter(1), self.iteritems())
-#
-#     __iter__ = iterkeys
-#
-#     def items(self):
-#         return list(self.iteritems())
-#
-#     def keys(self):
-#         return list(self.iterkeys())
-#
-#     def values(self):
-#         return list(self.itervalues())
-#
-#     def _build_bulkloaded_leaves(self, items):
-#         minimum = self.order // 2
-#         leaves, seps = [[]], []
-#
-#         for item in items:
-#             if len(leaves[-1]) >= self.order:
-#                 seps.append(item)
-#                 leaves.append([])
-#             leaves[-1].append(item)
-#
-#         if len(leaves[-1]) < minimum and seps:
-#             last_two = leaves[-2] + leaves[-1]
-#             leaves[-2] = last_two[:minimum]
-#             leaves[-1] = last_two[minimum:]
-#             seps.append(last_two[minimum])
-#
-#         leaves = [self.LEAF(
-#                 self,
-#                 contents=[p[0] for p in pairs],
-#                 data=[p[1] for p in pairs])
-#             for pairs in leaves]
-#
-#         for i in xrange(len(leaves) - 1):
-#             leaves[i].next = leaves[i + 1]
-#
-#         return leaves, [s[0] for s in seps]
\ No newline at end of file
+def _bulkload_range(cls, keys, degree, fill_factor):
+    tree = cls.bulkload(sorted(set(keys)), degree, fill_factor)
+    return tree.root, tree.size
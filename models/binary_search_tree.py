@@ -0,0 +1,134 @@
+from models.node import Node
+
+
+# Shared plumbing for the parent-linked binary search trees that rebalance through rotations.
+# Subclasses decide what extra attributes a node carries and how it gets rebalanced.
+class BinarySearchTree:
+
+    def __init__(self):
+        self.root = None
+
+    def __str__(self):
+        return '[' + ', '.join(str(value) for value in self) + ']'
+
+    def __contains__(self, value):
+        node = self.root
+        while node:
+            if value == node.value:
+                return True
+            node = node.right if value > node.value else node.left
+
+        return False
+
+    # Note: Not fail-fast on concurrent modification.
+    def __iter__(self):
+        stack = []
+        node = self.root
+
+        while stack or node:
+            if node:
+                stack.append(node)
+                node = node.left
+            else:
+                node = stack.pop()
+                yield node.value
+                node = node.right
+
+    def is_empty(self):
+        return not self.root
+
+    def height(self, node):
+        if not node:
+            return 0
+        return max(self.height(node.left), self.height(node.right)) + 1
+
+    # Inserts a plain leaf the same way AVLTree does (equal values go left) and returns it.
+    def _insert_leaf(self, value, **kwargs):
+        node = Node(value, left=None, right=None, parent=None, **kwargs)
+
+        if not self.root:
+            self.root = node
+            return node
+
+        parent = self.root
+        while True:
+            if value > parent.value:
+                if not parent.right:
+                    parent.right = node
+                    break
+                parent = parent.right
+            else:
+                if not parent.left:
+                    parent.left = node
+                    break
+                parent = parent.left
+
+        node.parent = parent
+        return node
+
+    def left_rotate(self, node):
+        aux = node.right
+        node.right = aux.left
+
+        if aux.left:
+            aux.left.parent = node
+
+        aux.parent = node.parent
+
+        if not node.parent:
+            self.root = aux
+        elif node == node.parent.left:
+            node.parent.left = aux
+        else:
+            node.parent.right = aux
+
+        aux.left = node
+        node.parent = aux
+
+    def right_rotate(self, node):
+        aux = node.left
+        node.left = aux.right
+
+        if aux.right:
+            aux.right.parent = node
+
+        aux.parent = node.parent
+
+        if not node.parent:
+            self.root = aux
+        elif node == node.parent.right:
+            node.parent.right = aux
+        else:
+            node.parent.left = aux
+
+        aux.right = node
+        node.parent = aux
+
+    def pre_order(self):
+        return self.__pre_order_recursive(self.root)
+
+    def __pre_order_recursive(self, node):
+        main_str = ''
+
+        if node:
+            main_str += str(node.value) + ' - '
+            main_str += self.__pre_order_recursive(node.left)
+            main_str += self.__pre_order_recursive(node.right)
+
+        return main_str
+
+    def in_order(self):
+        return ''.join(str(value) + ' - ' for value in self)
+
+    def post_order(self):
+        return self.__post_order_recursive(self.root)
+
+    def __post_order_recursive(self, node):
+        main_str = ''
+
+        if node:
+            main_str += self.__post_order_recursive(node.left)
+            main_str += self.__post_order_recursive(node.right)
+            main_str += str(node.value) + ' - '
+
+        return main_str
@@ -0,0 +1,286 @@
+import numbers
+from array import array
+
+NIL = -1
+MIN_KEY = -2 ** 63
+MAX_KEY = 2 ** 63 - 1
+
+
+# AVL tree of 64-bit integers stored as a struct of arrays instead of one Node object per value.
+# Every node is an index into parallel typed arrays, which costs 21 bytes per key (8 for the key,
+# 4 each for the left, right and parent indices and 1 for the balance factor) plus the spare
+# capacity kept by array.array, against more than a hundred bytes for an AVLTree Node. The price
+# is slower inserts, since every field access goes through an array lookup.
+# Slots released by remove() are chained through the left array and reused by later inserts.
+class CompactAVLTree:
+
+    def __init__(self):
+        self.clear()
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, value):
+        return self._find(value) != NIL
+
+    # Note: Not fail-fast on concurrent modification.
+    def __iter__(self):
+        left, right, keys = self.left, self.right, self.keys
+        stack = []
+        node = self.root
+
+        while stack or node != NIL:
+            if node != NIL:
+                stack.append(node)
+                node = left[node]
+            else:
+                node = stack.pop()
+                yield keys[node]
+                node = right[node]
+
+    def __str__(self):
+        return '[' + ', '.join(str(value) for value in self) + ']'
+
+    def clear(self):
+        self.keys = array('q')
+        self.left = array('i')
+        self.right = array('i')
+        self.parent = array('i')
+        self.balance_factor = array('b')
+        self.root = NIL
+        self.free = NIL
+        self.size = 0
+
+    def is_empty(self):
+        return self.root == NIL
+
+    def add_element(self, value):
+        self._check_key(value)
+        left, right, keys = self.left, self.right, self.keys
+
+        if self.root == NIL:
+            self.root = self._allocate(value, NIL)
+            return
+
+        node = self.root
+        while True:
+            if value > keys[node]:
+                if right[node] == NIL:
+                    child = self._allocate(value, node)
+                    self.right[node] = child
+                    break
+                node = right[node]
+            else:
+                if left[node] == NIL:
+                    child = self._allocate(value, node)
+                    self.left[node] = child
+                    break
+                node = left[node]
+
+        self._retrace_insert(child)
+
+    def remove(self, value):
+        node = self._find(value)
+        if node == NIL:
+            raise KeyError(str(value))
+
+        left, right, keys = self.left, self.right, self.keys
+
+        # A node with two children takes its successor's key, and the successor is unlinked instead
+        if left[node] != NIL and right[node] != NIL:
+            successor = right[node]
+            while left[successor] != NIL:
+                successor = left[successor]
+            keys[node] = keys[successor]
+            node = successor
+
+        child = left[node] if left[node] != NIL else right[node]
+        parent = self.parent[node]
+        if child != NIL:
+            self.parent[child] = parent
+
+        if parent == NIL:
+            self.root = child
+        elif left[parent] == node:
+            left[parent] = child
+            self._retrace_remove(parent, True)
+        else:
+            right[parent] = child
+            self._retrace_remove(parent, False)
+
+        self._release(node)
+
+    def height(self, node=None):
+        node = self.root if node is None else node
+        height = 0
+        while node != NIL:
+            height += 1
+            node = self.right[node] if self.balance_factor[node] > 0 else self.left[node]
+
+        return height
+
+    def pre_order(self):
+        main_str = ''
+        stack = [self.root] if self.root != NIL else []
+
+        while stack:
+            node = stack.pop()
+            main_str += str(self.keys[node]) + ' - '
+            if self.right[node] != NIL:
+                stack.append(self.right[node])
+            if self.left[node] != NIL:
+                stack.append(self.left[node])
+
+        return main_str
+
+    def in_order(self):
+        return ''.join(str(value) + ' - ' for value in self)
+
+    def post_order(self):
+        values = []
+        stack = [self.root] if self.root != NIL else []
+
+        # Reversed (root, right, left) order is post-order
+        while stack:
+            node = stack.pop()
+            values.append(str(self.keys[node]))
+            if self.left[node] != NIL:
+                stack.append(self.left[node])
+            if self.right[node] != NIL:
+                stack.append(self.right[node])
+
+        return ''.join(value + ' - ' for value in reversed(values))
+
+    def _find(self, value):
+        left, right, keys = self.left, self.right, self.keys
+        node = self.root
+
+        while node != NIL:
+            key = keys[node]
+            if value == key:
+                return node
+            node = right[node] if value > key else left[node]
+
+        return NIL
+
+    @staticmethod
+    def _check_key(value):
+        if type(value) is not int and not isinstance(value, numbers.Integral):
+            raise TypeError('This tree supports only integers.')
+        if not MIN_KEY <= value <= MAX_KEY:
+            raise ValueError('Value does not fit in 64 bits.')
+
+    # The key is stored first, so nothing has changed yet if the array rejects it.
+    def _allocate(self, value, parent):
+        if self.free == NIL:
+            self.keys.append(value)
+            self.left.append(NIL)
+            self.right.append(NIL)
+            self.parent.append(parent)
+            self.balance_factor.append(0)
+            self.size += 1
+            return len(self.keys) - 1
+
+        node = self.free
+        self.keys[node] = value
+        self.free = self.left[node]
+        self.size += 1
+        self.left[node] = NIL
+        self.right[node] = NIL
+        self.parent[node] = parent
+        self.balance_factor[node] = 0
+        return node
+
+    def _release(self, node):
+        self.size -= 1
+        self.left[node] = self.free
+        self.free = node
+
+    def _retrace_insert(self, node):
+        balance_factor = self.balance_factor
+        parent = self.parent[node]
+
+        while parent != NIL:
+            balance_factor[parent] += 1 if self.right[parent] == node else -1
+
+            if balance_factor[parent] == 0:
+                return
+            elif balance_factor[parent] in (-2, 2):
+                self._balance(parent)
+                return
+
+            node = parent
+            parent = self.parent[node]
+
+    def _retrace_remove(self, node, from_left):
+        balance_factor = self.balance_factor
+
+        while node != NIL:
+            balance_factor[node] += 1 if from_left else -1
+
+            if balance_factor[node] in (-1, 1):
+                return  # Height of this subtree did not change
+            elif balance_factor[node] in (-2, 2):
+                node = self._balance(node)
+                if balance_factor[node] != 0:
+                    return
+
+            parent = self.parent[node]
+            if parent != NIL:
+                from_left = self.left[parent] == node
+            node = parent
+
+    # Returns the index of the node that took the place of the given one.
+    def _balance(self, node):
+        if self.balance_factor[node] > 0:
+            if self.balance_factor[self.right[node]] < 0:
+                self._right_rotate(self.right[node])
+            return self._left_rotate(node)
+        else:
+            if self.balance_factor[self.left[node]] > 0:
+                self._left_rotate(self.left[node])
+            return self._right_rotate(node)
+
+    def _replace_child(self, parent, old, new):
+        if parent == NIL:
+            self.root = new
+        elif self.left[parent] == old:
+            self.left[parent] = new
+        else:
+            self.right[parent] = new
+
+    def _left_rotate(self, node):
+        left, right, parent, balance_factor = self.left, self.right, self.parent, self.balance_factor
+        aux = right[node]
+        right[node] = left[aux]
+
+        if left[aux] != NIL:
+            parent[left[aux]] = node
+
+        parent[aux] = parent[node]
+        self._replace_child(parent[node], node, aux)
+
+        left[aux] = node
+        parent[node] = aux
+
+        balance_factor[node] = balance_factor[node] - 1 - max(0, balance_factor[aux])
+        balance_factor[aux] = balance_factor[aux] - 1 + min(0, balance_factor[node])
+        return aux
+
+    def _right_rotate(self, node):
+        left, right, parent, balance_factor = self.left, self.right, self.parent, self.balance_factor
+        aux = left[node]
+        left[node] = right[aux]
+
+        if right[aux] != NIL:
+            parent[right[aux]] = node
+
+        parent[aux] = parent[node]
+        self._replace_child(parent[node], node, aux)
+
+        right[aux] = node
+        parent[node] = aux
+
+        balance_factor[node] = balance_factor[node] + 1 - min(0, balance_factor[aux])
+        balance_factor[aux] = balance_factor[aux] + 1 + max(0, balance_factor[node])
+        return aux
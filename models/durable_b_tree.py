@@ -0,0 +1,159 @@
+import os
+
+from models.b_tree import BTree
+from models.write_ahead_log import WriteAheadLog, encode_record, read_records
+
+INSERT, REMOVE, CLEAR = 1, 2, 3
+
+
+# BTree that survives restarts. Every insert, remove and clear that changes the tree is appended
+# to a log before the call returns, and the log is fsynced in groups (see WriteAheadLog), so at
+# most the last unsynced batch is lost on a crash. Operations are applied in memory first, so a
+# rejected key (say, one that cannot be compared with the others) never reaches the log.
+# checkpoint() writes the sorted keys to a snapshot file and empties the log; reopening the
+# directory bulk-loads the snapshot and replays the log on top.
+class DurableBTree(BTree):
+
+    def __init__(self, directory, degree, batch_size=64, batch_interval=0.01, checkpoint_every=None):
+        self.log = None
+        super().__init__(degree)
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.checkpoint_path = os.path.join(directory, 'checkpoint')
+        self.checkpoint_every = checkpoint_every
+        self.logged = 0
+
+        # Recover: snapshot first, then every logged operation after it
+        if os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path, 'rb') as snapshot:
+                loaded = BTree.bulkload((key for _, key, _ in read_records(snapshot)), degree)
+            self.root, self.size = loaded.root, loaded.size
+
+        self.log = WriteAheadLog(os.path.join(directory, 'wal'), batch_size, batch_interval)
+        # A record that cannot be applied means the log is damaged; refuse to open rather than drop
+        # it. Replayed records count towards checkpoint_every, so a long log gets checkpointed.
+        try:
+            for op, key in self.log.replay():
+                if op == INSERT:
+                    super().insert(key)
+                elif op == REMOVE:
+                    super()._remove(key)
+                else:
+                    super().clear()
+                self.logged += 1
+        except BaseException:
+            self.log.close()
+            raise
+        self._checkpoint_if_due()
+
+    # Creates a tree in an empty directory from strictly increasing keys, see BTree.bulkload. The
+    # keys go straight into a checkpoint instead of one log record each.
+    @classmethod
+    def bulkload(cls, directory, sorted_iterable, degree, fill_factor=1.0, **options):
+        return cls._adopt(directory, BTree.bulkload(sorted_iterable, degree, fill_factor), options)
+
+    # Creates a tree in an empty directory from unsorted keys, see BTree.parallel_build.
+    @classmethod
+    def parallel_build(cls, directory, iterable, degree, processes=None, fill_factor=1.0, **options):
+        return cls._adopt(directory, BTree.parallel_build(iterable, degree, processes, fill_factor), options)
+
+    @classmethod
+    def _adopt(cls, directory, loaded, options):
+        tree = cls(directory, loaded.minkeys + 1, **options)
+        if len(tree) > 0:
+            tree.close()
+            raise ValueError("Directory already holds a non-empty tree")
+        tree.root, tree.size = loaded.root, loaded.size
+        tree.checkpoint()
+        return tree
+
+    @classmethod
+    def open(cls, directory, degree, batch_size=64, batch_interval=0.01, checkpoint_every=None):
+        return cls(directory, degree, batch_size, batch_interval, checkpoint_every)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def clear(self):
+        if self.log is None:  # Still inside BTree.__init__
+            super().clear()
+            return
+        self._log(CLEAR, None)
+        super().clear()
+        self._checkpoint_if_due()
+
+    def insert(self, obj):
+        size = self.size
+        super().insert(obj)
+        if self.size != size:
+            self._log(INSERT, obj)
+            self._checkpoint_if_due()
+
+    def _remove(self, obj):
+        if not super()._remove(obj):
+            return False
+        self._log(REMOVE, obj)
+        self._checkpoint_if_due()
+        return True
+
+    # Applies the batch in one pass, then logs the keys that changed the tree.
+    def insert_many(self, objs):
+        objs = [obj for obj in sorted(set(objs)) if obj not in self]
+        added = super().insert_many(objs)
+        for obj in objs:
+            self._log(INSERT, obj)
+        self._checkpoint_if_due()
+        return added
+
+    def remove_many(self, objs):
+        objs = [obj for obj in sorted(set(objs)) if obj in self]
+        removed = super().remove_many(objs)
+        for obj in objs:
+            self._log(REMOVE, obj)
+        self._checkpoint_if_due()
+        return removed
+
+    def concat(self, other):
+        self._concat_order(other)
+        objs = list(other)
+        super().concat(other)
+        for obj in objs:
+            self._log(INSERT, obj)
+        self._checkpoint_if_due()
+
+    # Blocks until every operation so far is on disk.
+    def commit(self):
+        self.log.sync()
+
+    # Atomically replaces the snapshot with the current keys, then empties the log. The directory is
+    # fsynced too, otherwise the rename itself could be lost on a crash after the log is emptied.
+    def checkpoint(self):
+        self.log.sync()
+        temporary = self.checkpoint_path + '.tmp'
+        with open(temporary, 'wb') as snapshot:
+            for key in self:
+                snapshot.write(encode_record(INSERT, key))
+            snapshot.flush()
+            os.fsync(snapshot.fileno())
+        os.replace(temporary, self.checkpoint_path)
+        directory = os.open(self.directory, os.O_RDONLY)
+        try:
+            os.fsync(directory)
+        finally:
+            os.close(directory)
+        self.log.truncate()
+        self.logged = 0
+
+    def close(self):
+        self.log.close()
+
+    def _log(self, op, key):
+        self.log.append(op, key)
+        self.logged += 1
+
+    def _checkpoint_if_due(self):
+        if self.checkpoint_every and self.logged >= self.checkpoint_every:
+            self.checkpoint()
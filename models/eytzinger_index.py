@@ -0,0 +1,85 @@
+import numbers
+from array import array
+
+MIN_KEY = -2 ** 63
+MAX_KEY = 2 ** 63 - 1
+
+
+# Immutable sorted set laid out in Eytzinger (breadth-first) order: the children of slot k are
+# slots 2k and 2k + 1, slot 0 is unused. A lookup walks down with one comparison per level and no
+# early exit, so the first levels, which every lookup touches, sit next to each other in memory.
+# Integer keys that fit in 64 bits are stored unboxed in an array('q'), anything else in a list.
+class EytzingerIndex(object):
+
+    def __init__(self, sorted_keys):
+        keys = list(sorted_keys)
+        for i in range(1, len(keys)):
+            if not keys[i - 1] < keys[i]:
+                raise ValueError("Keys must be sorted and distinct")
+        self.size = len(keys)
+
+        slots = [keys[0] if keys else 0] * (self.size + 1)
+        stack = []
+        k = 1
+        i = 0
+        while len(stack) > 0 or k <= self.size:  # In-order walk of the implicit tree
+            while k <= self.size:
+                stack.append(k)
+                k *= 2
+            k = stack.pop()
+            slots[k] = keys[i]
+            i += 1
+            k = k * 2 + 1
+
+        if all(isinstance(key, numbers.Integral) and MIN_KEY <= key <= MAX_KEY for key in keys):
+            self.slots = array('q', slots)
+        else:
+            self.slots = slots
+
+    def __len__(self):
+        return self.size
+
+    def __contains__(self, obj):
+        k = self._lower_bound(obj)
+        return k != 0 and self.slots[k] == obj
+
+    # Returns one boolean per object. Binds everything to locals once for the whole batch.
+    def contains_many(self, objs):
+        slots = self.slots
+        size = self.size
+        result = []
+        append = result.append
+        for obj in objs:
+            k = 1
+            while k <= size:
+                k = k * 2 + (slots[k] < obj)
+            k >>= (~k & (k + 1)).bit_length()
+            append(k != 0 and slots[k] == obj)
+        return result
+
+    # Returns the smallest key >= obj, or None if there is none.
+    def ceiling(self, obj):
+        k = self._lower_bound(obj)
+        return self.slots[k] if k != 0 else None
+
+    def __iter__(self):
+        stack = []
+        k = 1
+        while len(stack) > 0 or k <= self.size:
+            while k <= self.size:
+                stack.append(k)
+                k *= 2
+            k = stack.pop()
+            yield self.slots[k]
+            k = k * 2 + 1
+
+    # Returns the slot of the smallest key >= obj, or 0 if there is none. The walk goes right
+    # whenever the slot's key is smaller; the answer is where it last went left, which is found by
+    # stripping the trailing right turns (1 bits) plus that left turn off the final position.
+    def _lower_bound(self, obj):
+        slots = self.slots
+        size = self.size
+        k = 1
+        while k <= size:
+            k = k * 2 + (slots[k] < obj)
+        return k >> (~k & (k + 1)).bit_length()
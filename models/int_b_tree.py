@@ -0,0 +1,39 @@
+import numbers
+from array import array
+
+from models.b_tree import BTree
+
+MIN_KEY = -2 ** 63
+MAX_KEY = 2 ** 63 - 1
+
+
+# BTree specialized for 64-bit signed integers. Each node keeps its keys unboxed in an
+# array('q') instead of a list of int objects, which takes 8 bytes per key instead of about 36,
+# and turns the key copies of splits and merges into plain memory moves. The in-node search is
+# still bisect, which runs over the array without creating any objects.
+class IntBTree(BTree):
+
+    def insert(self, obj):
+        IntBTree._check_key(obj)
+        super().insert(obj)
+
+    def insert_many(self, objs):
+        objs = list(objs)
+        for obj in objs:
+            IntBTree._check_key(obj)
+        return super().insert_many(objs)
+
+    @staticmethod
+    def _check_key(obj):
+        if type(obj) is not int and not isinstance(obj, numbers.Integral):
+            raise TypeError("Only integer keys are supported")
+        if not MIN_KEY <= obj <= MAX_KEY:
+            raise ValueError("Key does not fit in 64 bits")
+
+    # ---- Helper class ----
+
+    class Node(BTree.Node):
+
+        def __init__(self, maxkeys, leaf):
+            super().__init__(maxkeys, leaf)
+            self.keys = array('q')
@@ -0,0 +1,109 @@
+from models.b_tree import BTree
+
+
+# BTree with lazy deletes. Removing a key only records it as a tombstone, and the dead keys stay in
+# the nodes until compact() takes them all out in one sorted, bottom-up pass (BTree.remove_many),
+# which runs automatically once tombstones make up compact_threshold of the stored keys (None
+# turns that off). Until then lookups and scans skip tombstoned keys, so they pay for walking
+# past them; the order statistics (rank, select, count_range) compact first.
+class LazyBTree(BTree):
+
+    def __init__(self, degree, coll=None, compact_threshold=0.25):
+        self.compact_threshold = compact_threshold
+        super().__init__(degree, coll)
+
+    def __len__(self):
+        return self.size - len(self.tombstones)
+
+    def clear(self):
+        super().clear()
+        self.tombstones = set()
+
+    # Physically removes every tombstoned key and returns how many there were.
+    def compact(self):
+        count = len(self.tombstones)
+        if count > 0:
+            super().remove_many(self.tombstones)
+            self.tombstones = set()
+        return count
+
+    def __contains__(self, obj):
+        return obj not in self.tombstones and super().__contains__(obj)
+
+    def insert(self, obj):
+        if obj in self.tombstones:  # Still stored, just revive it
+            self.tombstones.remove(obj)
+        else:
+            super().insert(obj)
+
+    def insert_many(self, objs):
+        objs = set(objs)
+        revived = objs & self.tombstones
+        self.tombstones -= revived
+        return len(revived) + super().insert_many(objs - revived)
+
+    def _remove(self, obj):
+        if obj not in self:
+            return False
+        self.tombstones.add(obj)
+        self._compact_if_due()
+        return True
+
+    def remove_many(self, objs):
+        removed = 0
+        for obj in set(objs):
+            if obj in self:
+                self.tombstones.add(obj)
+                removed += 1
+        self._compact_if_due()
+        return removed
+
+    def concat(self, other):
+        self._concat_order(other)
+        self.compact()
+        other.compact()
+        super().concat(other)
+
+    def __iter__(self):
+        tombstones = self.tombstones
+        for obj in super().__iter__():
+            if obj not in tombstones:
+                yield obj
+
+    def irange(self, lo=None, hi=None, reverse=False):
+        tombstones = self.tombstones
+        for obj in super().irange(lo, hi, reverse):
+            if obj not in tombstones:
+                yield obj
+
+    def min(self):
+        for obj in self.irange():
+            return obj
+        raise ValueError("Empty tree")
+
+    def max(self):
+        for obj in self.irange(reverse=True):
+            return obj
+        raise ValueError("Empty tree")
+
+    def floor(self, obj):
+        return next(self.irange(hi=obj, reverse=True), None)
+
+    def ceiling(self, obj):
+        return next(self.irange(lo=obj), None)
+
+    def rank(self, obj):
+        self.compact()
+        return super().rank(obj)
+
+    def select(self, index):
+        self.compact()
+        return super().select(index)
+
+    def count_range(self, lo=None, hi=None):
+        self.compact()
+        return super().count_range(lo, hi)
+
+    def _compact_if_due(self):
+        if self.compact_threshold is not None and len(self.tombstones) > self.compact_threshold * self.size:
+            self.compact()
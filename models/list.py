@@ -3,7 +3,14 @@ from models.node import Node
 
 class List:
 
-    def __init__(self):
+    # Nodes come from and go back to pool (a NodePool) if one is given.
+    def __init__(self, pool=None):
+        self.head = None
+        self.pool = pool
+
+    def clear(self):
+        if self.pool is not None:
+            self.pool.release_chain(self.head)
         self.head = None
 
     def remove(self, value):
@@ -12,19 +19,20 @@ class List:
             if aux.value == value:
                 if aux == self.head:
                     self.head = aux.next_node
-                    return
                 else:
                     previous = self.head
                     while previous.next_node != aux:
                         previous = previous.next_node
                     previous.next_node = aux.next_node
-                    return
+                if self.pool is not None:
+                    self.pool.release(aux)
+                return
 
             else:
                 aux = aux.next_node
 
     def insert_ordered(self, value):
-        node = Node(value, next_node=None)
+        node = self.__new_node(value)
 
         if not self.head:
             self.head = node
@@ -53,7 +61,7 @@ class List:
                 node.next_node = next
 
     def insert_beginning(self, value):
-        node = Node(value, next_node=None)
+        node = self.__new_node(value)
 
         if not self.head:
             self.head = node
@@ -63,7 +71,7 @@ class List:
             self.head = node
 
     def insert_end(self, value):
-        node = Node(value, next_node=None)
+        node = self.__new_node(value)
 
         if not self.head:
             self.head = node
@@ -79,6 +87,11 @@ class List:
 
             aux.next_node = node
 
+    def __new_node(self, value):
+        if self.pool is not None:
+            return self.pool.acquire(value, next_node=None)
+        return Node(value, next_node=None)
+
     def __str__(self):
         displayed = '['
 
@@ -0,0 +1,48 @@
+from models.node import Node
+
+
+# Free list of Node objects for structures that are emptied and refilled over and over. A released
+# node drops every attribute, so it keeps no value alive and takes part in no reference cycle, and
+# acquire() hands it out again instead of allocating a new one. capacity bounds the free list.
+class NodePool:
+
+    def __init__(self, capacity=None):
+        self.free = []
+        self.capacity = capacity
+        self.allocated = 0
+        self.reused = 0
+
+    def acquire(self, value, **kwargs):
+        if not self.free:
+            self.allocated += 1
+            return Node(value, **kwargs)
+
+        node = self.free.pop()
+        node.value = value
+        for key, field in kwargs.items():
+            setattr(node, key, field)
+        self.reused += 1
+        return node
+
+    def release(self, node):
+        node.__dict__.clear()
+        if self.capacity is None or len(self.free) < self.capacity:
+            self.free.append(node)
+
+    # Releases every node of a next_node chain.
+    def release_chain(self, node):
+        while node:
+            next_node = node.next_node
+            self.release(node)
+            node = next_node
+
+    # Releases every node of a binary tree.
+    def release_tree(self, root):
+        stack = [root] if root else []
+        while stack:
+            node = stack.pop()
+            if node.left:
+                stack.append(node.left)
+            if node.right:
+                stack.append(node.right)
+            self.release(node)
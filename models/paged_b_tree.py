@@ -0,0 +1,426 @@
+import bisect
+import mmap
+import numbers
+import os
+import struct
+from collections import OrderedDict
+
+MAGIC = b'BTPG'
+FILE_HEADER = struct.Struct('<4sIIqqqq')  # Magic, page size, maxkeys, root, size, page count, free list head
+PAGE_HEADER = struct.Struct('<BxH')  # Page kind, number of keys
+LEAF, INTERNAL, FREE = 0, 1, 2
+NO_PAGE = -1
+MIN_KEY = -2 ** 63
+MAX_KEY = 2 ** 63 - 1
+
+
+# Persistent B-tree set of 64-bit signed integers. Every node is a fixed-size page of a file that
+# is accessed through mmap, page 0 holds the file header. Decoded pages are kept in a bounded LRU
+# buffer pool and dirty pages are only encoded back into the mapping when they are evicted or on
+# flush(), so the file is only guaranteed to be consistent after flush() or close().
+#
+# Page layout: kind and key count, then maxkeys little-endian int64 key slots, then maxkeys + 1
+# int64 child page numbers. maxkeys is the largest odd number that fits in the page size.
+#
+# It mirrors BTree's algorithms instead of running them on page-backed nodes. BTree moves children
+# between nodes as plain list edits (steals, the inline merges of remove_many, concat's grafts), so
+# an adapter could not tell a page that moved from one that was dropped and must be freed, and it
+# would have to mark pages dirty on every list mutation. Order statistics (rank, select) are left
+# out as well, since the page layout has no room for subtree sizes.
+class PagedBTree(object):
+
+    # Opens the tree stored at path, or creates it if the file does not exist. page_size is only
+    # used for new files, an existing file keeps the page size it was created with.
+    def __init__(self, path, page_size=4096, cache_pages=256):
+        if cache_pages < 1:
+            raise ValueError("Buffer pool needs at least one page")
+        self.path = path
+        self.cache_pages = cache_pages
+        self.pool = OrderedDict()
+
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            self.file = open(path, 'r+b')
+            header = self.file.read(FILE_HEADER.size)
+            if len(header) < FILE_HEADER.size or header[:len(MAGIC)] != MAGIC:
+                self.file.close()
+                raise ValueError("Not a paged B-tree file")
+            _, self.page_size, self.maxkeys, self.root, self.size, self.page_count, self.free_head = \
+                FILE_HEADER.unpack(header)
+            self.minkeys = self.maxkeys // 2
+            self.map = mmap.mmap(self.file.fileno(), 0)
+        else:
+            maxkeys = (page_size - PAGE_HEADER.size - 8) // 16
+            maxkeys -= 1 - maxkeys % 2
+            if maxkeys < 3 or page_size < FILE_HEADER.size:
+                raise ValueError("Page size too small")
+            self.file = open(path, 'w+b')
+            self.page_size = page_size
+            self.maxkeys = maxkeys
+            self.minkeys = maxkeys // 2
+            self.root = NO_PAGE
+            self.size = 0
+            self.page_count = 1  # The file header
+            self.free_head = NO_PAGE
+            self.file.truncate(page_size * 16)
+            self.map = mmap.mmap(self.file.fileno(), 0)
+            self.root = self._new_page(True).id
+            self.flush()
+
+    @classmethod
+    def open(cls, path, page_size=4096, cache_pages=256):
+        return cls(path, page_size, cache_pages)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self.size
+
+    def flush(self):
+        for page in self.pool.values():
+            if page.dirty:
+                self._write_page(page)
+        FILE_HEADER.pack_into(self.map, 0, MAGIC, self.page_size, self.maxkeys, self.root, self.size,
+                              self.page_count, self.free_head)
+        self.map.flush()
+
+    def close(self):
+        if self.map is not None:
+            self.flush()
+            self.map.close()
+            self.file.close()
+            self.map = None
+            self.pool.clear()
+
+    def __contains__(self, obj):
+        node = self._page(self.root)
+        while True:
+            index = bisect.bisect_left(node.keys, obj)
+            if index < len(node.keys) and node.keys[index] == obj:
+                found = True
+                break
+            elif node.leaf:
+                found = False
+                break
+            node = self._page(node.children[index])
+        self._trim()
+        return found
+
+    def insert(self, obj):
+        PagedBTree._check_key(obj)
+
+        # Special preprocessing to split root node
+        root = self._page(self.root)
+        if len(root.keys) == self.maxkeys:
+            child = root
+            root = self._new_page(False)  # Increment tree height
+            root.children.append(child.id)
+            self.root = root.id
+            self._split_child(root, 0)
+
+        # Walk down the tree
+        node = root
+        while True:
+            index = bisect.bisect_left(node.keys, obj)
+            if index < len(node.keys) and node.keys[index] == obj:
+                break  # Key already exists in tree
+
+            if node.leaf:  # Simple insertion into leaf
+                node.keys.insert(index, obj)
+                node.dirty = True
+                self.size += 1
+                break
+
+            child = self._page(node.children[index])
+            if len(child.keys) == self.maxkeys:  # Split child node
+                self._split_child(node, index)
+                if obj == node.keys[index]:
+                    break  # Key already exists in tree
+                elif obj > node.keys[index]:
+                    child = self._page(node.children[index + 1])
+            node = child
+
+        self._trim()
+
+    @staticmethod
+    def _check_key(obj):
+        if not isinstance(obj, numbers.Integral):
+            raise TypeError("Only integer keys are supported")
+        if not MIN_KEY <= obj <= MAX_KEY:
+            raise ValueError("Key does not fit in 64 bits")
+
+    def remove(self, obj):
+        if not self._remove(obj):
+            raise KeyError(str(obj))
+
+    def discard(self, obj):
+        self._remove(obj)
+
+    # Same top-down algorithm as BTree._remove, working on pages. Returns whether obj was removed.
+    def _remove(self, obj):
+        node = self._page(self.root)
+        index = bisect.bisect_left(node.keys, obj)
+        found = index < len(node.keys) and node.keys[index] == obj
+        while True:
+            if node.leaf:
+                if found:  # Simple removal from leaf
+                    del node.keys[index]
+                    node.dirty = True
+                    self.size -= 1
+                break
+
+            elif found:  # Key is stored at current node
+                left = self._page(node.children[index])
+                right = self._page(node.children[index + 1])
+                if len(left.keys) > self.minkeys:  # Replace key with predecessor
+                    node.keys[index] = self._remove_extreme(left, True)
+                elif len(right.keys) > self.minkeys:
+                    node.keys[index] = self._remove_extreme(right, False)
+                else:  # Merge key and right node into left node, then continue there
+                    self._merge_children(node, index)
+                    node = left
+                    index = self.minkeys
+                    continue
+                node.dirty = True
+                self.size -= 1
+                break
+
+            else:  # Key might be found in some child
+                node = self._ensure_child_remove(node, index)
+                index = bisect.bisect_left(node.keys, obj)
+                found = index < len(node.keys) and node.keys[index] == obj
+
+        self._trim()
+        return found
+
+    def __iter__(self):
+        return self.irange()
+
+    def __reversed__(self):
+        return self.irange(reverse=True)
+
+    # Lazily generates the keys in [lo, hi] (None means unbounded), in descending order if reverse,
+    # like BTree.irange. The stack holds page numbers, not pages, and the pool is trimmed before
+    # every key is handed out, so a long scan never pins more than one root-to-leaf path.
+    # Note: Not fail-fast on concurrent modification.
+    def irange(self, lo=None, hi=None, reverse=False):
+        # Every entry is (page number, index): the subtree left of keys[index] (right of
+        # keys[index - 1] if reverse) has been descended into already
+        stack = []
+
+        def descend(page_id, bounded):
+            while True:
+                node = self._page(page_id)
+                if reverse:
+                    index = bisect.bisect_right(node.keys, hi) if bounded and hi is not None else len(node.keys)
+                else:
+                    index = bisect.bisect_left(node.keys, lo) if bounded and lo is not None else 0
+                stack.append((page_id, index))
+                if node.leaf:
+                    return
+                page_id = node.children[index]
+
+        descend(self.root, True)
+        while stack:
+            page_id, index = stack.pop()
+            node = self._page(page_id)
+            if node.leaf:
+                keys = node.keys[:index][::-1] if reverse else node.keys[index:]
+            elif reverse and index > 0:
+                keys = [node.keys[index - 1]]
+                stack.append((page_id, index - 1))
+                descend(node.children[index - 1], False)
+            elif not reverse and index < len(node.keys):
+                keys = [node.keys[index]]
+                stack.append((page_id, index + 1))
+                descend(node.children[index + 1], False)
+            else:
+                continue
+
+            self._trim()
+            for obj in keys:
+                if (lo is not None and obj < lo) if reverse else (hi is not None and obj > hi):
+                    return
+                yield obj
+
+    def min(self):
+        for obj in self.irange():
+            return obj
+        raise ValueError("Empty tree")
+
+    def max(self):
+        for obj in self.irange(reverse=True):
+            return obj
+        raise ValueError("Empty tree")
+
+    # Batch updates in sorted order, so consecutive keys mostly hit pages that are still in the
+    # pool. Unlike BTree they descend from the root for every key. All keys are checked before
+    # the first one is inserted. Both return how many keys changed the tree.
+    def insert_many(self, objs):
+        objs = sorted(set(objs))
+        for obj in objs:
+            PagedBTree._check_key(obj)
+        size = self.size
+        for obj in objs:
+            self.insert(obj)
+        return self.size - size
+
+    def remove_many(self, objs):
+        return sum(1 for obj in sorted(set(objs)) if self._remove(obj))
+
+    # ---- Tree surgery, mirroring BTree.Node ----
+
+    def _split_child(self, parent, index):
+        left = self._page(parent.children[index])
+        right = self._new_page(left.leaf)
+        minkeys = self.minkeys
+
+        if not left.leaf:
+            right.children.extend(left.children[minkeys + 1:])
+            del left.children[minkeys + 1:]
+        parent.keys.insert(index, left.keys[minkeys])
+        parent.children.insert(index + 1, right.id)
+        right.keys.extend(left.keys[minkeys + 1:])
+        del left.keys[minkeys:]
+        parent.dirty = left.dirty = True
+
+    # Makes sure the child at index has more than minkeys keys and returns the child to continue in.
+    def _ensure_child_remove(self, parent, index):
+        minkeys = self.minkeys
+        child = self._page(parent.children[index])
+        if len(child.keys) > minkeys:
+            return child
+
+        left = self._page(parent.children[index - 1]) if index >= 1 else None
+        right = self._page(parent.children[index + 1]) if index < len(parent.keys) else None
+
+        if left is not None and len(left.keys) > minkeys:  # Steal rightmost item from left sibling
+            if not child.leaf:
+                child.children.insert(0, left.children.pop())
+            child.keys.insert(0, parent.keys[index - 1])
+            parent.keys[index - 1] = left.keys.pop()
+        elif right is not None and len(right.keys) > minkeys:  # Steal leftmost item from right sibling
+            if not child.leaf:
+                child.children.append(right.children.pop(0))
+            child.keys.append(parent.keys[index])
+            parent.keys[index] = right.keys.pop(0)
+            right.dirty = True
+        elif left is not None:  # Merge child into left sibling
+            self._merge_children(parent, index - 1)
+            return left
+        else:  # Merge right sibling into child
+            self._merge_children(parent, index)
+            return child
+
+        if left is not None:
+            left.dirty = True
+        parent.dirty = child.dirty = True
+        return child
+
+    # Merges the child at index + 1 into the child at index, releasing the right page. Shrinks the
+    # tree if that empties the root.
+    def _merge_children(self, parent, index):
+        left = self._page(parent.children[index])
+        right = self._page(parent.children[index + 1])
+        if not left.leaf:
+            left.children.extend(right.children)
+        del parent.children[index + 1]
+        left.keys.append(parent.keys.pop(index))
+        left.keys.extend(right.keys)
+        parent.dirty = left.dirty = True
+        self._free_page(right)
+
+        if parent.id == self.root and len(parent.keys) == 0:
+            self.root = left.id  # Decrement tree height
+            self._free_page(parent)
+
+    # Removes and returns the minimum (or maximum) key of the subtree at node, which must
+    # already have more than minkeys keys.
+    def _remove_extreme(self, node, maximum):
+        while not node.leaf:
+            node = self._ensure_child_remove(node, len(node.children) - 1 if maximum else 0)
+        node.dirty = True
+        return node.keys.pop() if maximum else node.keys.pop(0)
+
+    # ---- Buffer pool ----
+
+    def _page(self, page_id):
+        page = self.pool.get(page_id)
+        if page is None:
+            page = self._read_page(page_id)
+            self.pool[page_id] = page
+        else:
+            self.pool.move_to_end(page_id)
+        return page
+
+    # Evicts least recently used pages until the pool is within its capacity. Only called between
+    # operations, so no page that an operation is still holding can be evicted under it.
+    def _trim(self):
+        while len(self.pool) > self.cache_pages:
+            _, page = self.pool.popitem(last=False)
+            if page.dirty:
+                self._write_page(page)
+
+    def _new_page(self, leaf):
+        if self.free_head != NO_PAGE:
+            page_id = self.free_head
+            self.free_head = self._page(page_id).keys[0]
+        else:
+            page_id = self.page_count
+            self.page_count += 1
+            if self.page_count * self.page_size > len(self.map):
+                self._grow()
+
+        page = PagedBTree.Page(page_id, LEAF if leaf else INTERNAL)
+        page.dirty = True
+        self.pool[page_id] = page
+        self.pool.move_to_end(page_id)
+        return page
+
+    # Freed pages are chained through their first key slot.
+    def _free_page(self, page):
+        page.kind = FREE
+        page.keys = [self.free_head]
+        page.children = None
+        page.leaf = False
+        page.dirty = True
+        self.free_head = page.id
+
+    def _grow(self):
+        self.map.close()
+        self.file.truncate(max(self.page_count * self.page_size, os.path.getsize(self.path) * 2))
+        self.map = mmap.mmap(self.file.fileno(), 0)
+
+    def _read_page(self, page_id):
+        offset = page_id * self.page_size
+        kind, count = PAGE_HEADER.unpack_from(self.map, offset)
+        page = PagedBTree.Page(page_id, kind)
+        offset += PAGE_HEADER.size
+        page.keys = list(struct.unpack_from('<%dq' % count, self.map, offset))
+        if kind == INTERNAL:
+            page.children = list(struct.unpack_from('<%dq' % (count + 1), self.map, offset + 8 * self.maxkeys))
+        return page
+
+    def _write_page(self, page):
+        offset = page.id * self.page_size
+        PAGE_HEADER.pack_into(self.map, offset, page.kind, len(page.keys))
+        offset += PAGE_HEADER.size
+        struct.pack_into('<%dq' % len(page.keys), self.map, offset, *page.keys)
+        if page.kind == INTERNAL:
+            struct.pack_into('<%dq' % len(page.children), self.map, offset + 8 * self.maxkeys, *page.children)
+        page.dirty = False
+
+    # ---- Helper class ----
+
+    class Page(object):
+
+        def __init__(self, page_id, kind):
+            self.id = page_id
+            self.kind = kind
+            self.leaf = kind == LEAF
+            self.keys = []
+            self.children = [] if kind == INTERNAL else None
+            self.dirty = False
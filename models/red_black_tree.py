@@ -0,0 +1,52 @@
+from models.binary_search_tree import BinarySearchTree
+
+RED = 'red'
+BLACK = 'black'
+
+
+# Red-black tree with the same interface as AVLTree. Its looser balance (height at most
+# 2 log n) means an insertion needs at most two rotations and only recolors on the way up.
+class RedBlackTree(BinarySearchTree):
+
+    def add_element(self, value):
+        node = self._insert_leaf(value, color=RED)
+        self.__fix_insert(node)
+        return node
+
+    def __fix_insert(self, node):
+        while node.parent and node.parent.color == RED:
+            parent = node.parent
+            grandparent = parent.parent  # Exists because the root is always black
+
+            if parent == grandparent.left:
+                uncle = grandparent.right
+                if uncle and uncle.color == RED:
+                    parent.color = BLACK
+                    uncle.color = BLACK
+                    grandparent.color = RED
+                    node = grandparent
+                else:
+                    if node == parent.right:
+                        node = parent
+                        self.left_rotate(node)
+                        parent = node.parent
+                    parent.color = BLACK
+                    grandparent.color = RED
+                    self.right_rotate(grandparent)
+            else:
+                uncle = grandparent.left
+                if uncle and uncle.color == RED:
+                    parent.color = BLACK
+                    uncle.color = BLACK
+                    grandparent.color = RED
+                    node = grandparent
+                else:
+                    if node == parent.left:
+                        node = parent
+                        self.right_rotate(node)
+                        parent = node.parent
+                    parent.color = BLACK
+                    grandparent.color = RED
+                    self.left_rotate(grandparent)
+
+        self.root.color = BLACK
@@ -3,11 +3,21 @@ from models.node import Node
 
 class Stack:
 
-    def __init__(self):
+    # Nodes come from and go back to pool (a NodePool) if one is given.
+    def __init__(self, pool=None):
+        self.head = None
+        self.pool = pool
+
+    def clear(self):
+        if self.pool is not None:
+            self.pool.release_chain(self.head)
         self.head = None
 
     def push(self, value):
-        node = Node(value, next_node=None)
+        if self.pool is not None:
+            node = self.pool.acquire(value, next_node=None)
+        else:
+            node = Node(value, next_node=None)
 
         if not self.head:
             self.head = node
@@ -25,7 +35,10 @@ class Stack:
         else:
             current_head = self.head
             self.head = current_head.next_node
-            return current_head.value
+            value = current_head.value
+            if self.pool is not None:
+                self.pool.release(current_head)
+            return value
 
     def __str__(self):
         displayed = '['
@@ -0,0 +1,23 @@
+import random
+
+from models.binary_search_tree import BinarySearchTree
+
+
+# Treap with the same interface as AVLTree: a binary search tree on the values and a max-heap on
+# random priorities, so it is balanced in expectation without storing any balance information.
+class Treap(BinarySearchTree):
+
+    def __init__(self, seed=None):
+        super().__init__()
+        self.random = random.Random(seed)
+
+    def add_element(self, value):
+        node = self._insert_leaf(value, priority=self.random.random())
+
+        while node.parent and node.parent.priority < node.priority:
+            if node == node.parent.left:
+                self.right_rotate(node.parent)
+            else:
+                self.left_rotate(node.parent)
+
+        return node
@@ -0,0 +1,187 @@
+import threading
+
+from models.b_tree import BTree
+
+
+# BTree with O(1) snapshots through path copying. Every node remembers the write token of the tree
+# that created it, and a tree only ever mutates nodes carrying its current token. snapshot() just
+# hands out new tokens, so from then on the first write to any shared node copies it (and, on the
+# way down, every node above it) instead of changing it, and the snapshot keeps seeing the old
+# version. Versions nobody references any more are reclaimed by the garbage collector.
+#
+# Writes and snapshot() are serialized by a lock; reading a snapshot needs no locking at all.
+class VersionedBTree(BTree):
+
+    def __init__(self, degree, coll=None):
+        self.token = object()
+        self.lock = threading.Lock()
+        super().__init__(degree, coll)
+
+    def clear(self):
+        super().clear()
+        self.root.owner = self.token
+
+    # Returns an independent VersionedBTree with the current contents in O(1). Writes to either
+    # tree never show up in the other.
+    def snapshot(self):
+        with self.lock:
+            self.token = object()
+            version = VersionedBTree.__new__(VersionedBTree)
+            version.minkeys = self.minkeys
+            version.maxkeys = self.maxkeys
+            version.root = self.root
+            version.size = self.size
+            version.token = object()
+            version.lock = threading.Lock()
+            return version
+
+    def insert(self, obj):
+        with self.lock:
+            # Special preprocessing to split root node
+            root = self._writable_root()
+            if len(root.keys) == self.maxkeys:
+                child = root
+                self.root = root = self._new_node(False)  # Increment tree height
+                root.children.append(child)
+                root.size = child.size
+                self._split_child(root, 0)
+
+            # Walk down the tree
+            node = root
+            path = []
+            while True:
+                found, index = node.search(obj)
+                if found:
+                    return  # Key already exists in tree
+                path.append(node)
+
+                if node.is_leaf():  # Simple insertion into leaf
+                    node.keys.insert(index, obj)
+                    self.size += 1
+                    for node in path:
+                        node.size += 1
+                    return  # Successfully added
+
+                if len(node.children[index].keys) == self.maxkeys:  # Split child node
+                    self._split_child(node, index)
+                    if obj == node.keys[index]:
+                        return  # Key already exists in tree
+                    elif obj > node.keys[index]:
+                        index += 1
+                node = self._writable_child(node, index)
+
+    # The batch operations of BTree rebalance bottom-up along a cached path, which does not mix with
+    # copying on the way down, so here they just apply the keys one at a time.
+    def insert_many(self, objs):
+        size = self.size
+        for obj in sorted(set(objs)):
+            self.insert(obj)
+        return self.size - size
+
+    def remove_many(self, objs):
+        size = self.size
+        for obj in sorted(set(objs)):
+            self._remove(obj)
+        return size - self.size
+
+    # Grafting would leave both trees holding the same nodes without copying them, so the keys of
+    # other are moved over one by one instead.
+    def concat(self, other):
+        self._concat_order(other)
+        self.insert_many(list(other))
+        other.clear()
+
+    # Same walk as BTree._remove, making every node writable before touching it.
+    def _remove(self, obj):
+        with self.lock:
+            root = self._writable_root()
+            found, index = root.search(obj)
+            node = root
+            path = []
+            while True:
+                path.append(node)
+                if node.is_leaf():
+                    if found:  # Simple removal from leaf
+                        node.remove_key(index)
+                        self.size -= 1
+                        for node in path:
+                            node.size -= 1
+                    return found
+
+                elif found:  # Key is stored at current node
+                    left = self._writable_child(node, index)
+                    if len(left.keys) > self.minkeys:  # Replace key with predecessor
+                        node.keys[index] = self._remove_extreme(left, True)
+                        self.size -= 1
+                        for node in path:
+                            node.size -= 1
+                        return True
+                    elif len(node.children[index + 1].keys) > self.minkeys:
+                        node.keys[index] = self._remove_extreme(self._writable_child(node, index + 1), False)
+                        self.size -= 1
+                        for node in path:
+                            node.size -= 1
+                        return True
+                    else:  # Merge key and right node into left node, then recurse
+                        node.merge_children(self.minkeys, index)
+                        if node is root and len(root.keys) == 0:
+                            self.root = root = left  # Decrement tree height
+                        node = left
+                        index = self.minkeys  # Index known due to merging; no need to search
+
+                else:  # Key might be found in some child
+                    child = self._ensure_child_remove(node, index)
+                    if node is root and len(root.keys) == 0:
+                        self.root = root = root.children[0]  # Decrement tree height
+                    node = child
+                    found, index = node.search(obj)
+
+    # ---- Copy on write ----
+
+    def _new_node(self, leaf):
+        node = BTree.Node(self.maxkeys, leaf)
+        node.owner = self.token
+        return node
+
+    def _copy(self, node):
+        copy = self._new_node(node.is_leaf())
+        copy.keys = list(node.keys)
+        copy.size = node.size
+        if not node.is_leaf():
+            copy.children = list(node.children)
+        return copy
+
+    def _writable_root(self):
+        if getattr(self.root, 'owner', None) is not self.token:
+            self.root = self._copy(self.root)
+        return self.root
+
+    # The parent must already be writable.
+    def _writable_child(self, parent, index):
+        child = parent.children[index]
+        if getattr(child, 'owner', None) is not self.token:
+            child = parent.children[index] = self._copy(child)
+        return child
+
+    def _split_child(self, parent, index):
+        self._writable_child(parent, index)
+        parent.split_child(self.minkeys, self.maxkeys, index)
+        parent.children[index + 1].owner = self.token
+
+    # BTree.Node.ensure_child_remove may change the child and either sibling.
+    def _ensure_child_remove(self, parent, index):
+        child = self._writable_child(parent, index)
+        if len(child.keys) > self.minkeys:
+            return child
+        if index >= 1:
+            self._writable_child(parent, index - 1)
+        if index < len(parent.keys):
+            self._writable_child(parent, index + 1)
+        return parent.ensure_child_remove(self.minkeys, index)
+
+    def _remove_extreme(self, node, maximum):
+        while not node.is_leaf():
+            node.size -= 1
+            node = self._ensure_child_remove(node, len(node.children) - 1 if maximum else 0)
+        node.size -= 1
+        return node.remove_key(len(node.keys) - 1 if maximum else 0)
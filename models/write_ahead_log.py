@@ -0,0 +1,109 @@
+import os
+import pickle
+import struct
+import threading
+import time
+import zlib
+
+RECORD_HEADER = struct.Struct('<IIB')  # CRC32 of op + payload, payload length, op
+
+
+# Append-only log of (op, key) records with group commit: appended records are buffered and made
+# durable together by one fsync, once batch_size records are pending, once the oldest pending one
+# is batch_interval seconds old (checked by a background thread), or when sync() is called.
+# Every record carries a CRC, so replay stops cleanly at a torn write left by a crash.
+class WriteAheadLog(object):
+
+    def __init__(self, path, batch_size=64, batch_interval=0.01):
+        if batch_size < 1:
+            raise ValueError("Batch size must be at least 1")
+        self.path = path
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self.lock = threading.Lock()
+        self.pending = 0
+        self.oldest_pending = None
+        self.syncs = 0
+
+        self.file = open(path, 'ab')
+
+        self.closed = threading.Event()
+        self.flusher = None
+        if batch_interval:
+            self.flusher = threading.Thread(target=self._flush_periodically, daemon=True)
+            self.flusher.start()
+
+    # Yields the (op, key) records that made it to disk, in order, then cuts off a torn record
+    # left at the end by a crash. Must run to completion before anything new is appended.
+    def replay(self):
+        valid_length = 0
+        with open(self.path, 'rb') as log:
+            for op, key, end in read_records(log):
+                valid_length = end
+                yield op, key
+
+        with self.lock:
+            self.file.truncate(valid_length)
+
+    def append(self, op, key):
+        record = encode_record(op, key)
+        with self.lock:
+            self.file.write(record)
+            self.pending += 1
+            if self.oldest_pending is None:
+                self.oldest_pending = time.monotonic()
+            if self.pending >= self.batch_size:
+                self._sync()
+
+    def sync(self):
+        with self.lock:
+            self._sync()
+
+    # Empties the log, once its records are covered by a checkpoint.
+    def truncate(self):
+        with self.lock:
+            self.file.truncate(0)
+            self._sync(force=True)
+
+    def close(self):
+        self.closed.set()
+        if self.flusher is not None:
+            self.flusher.join()
+        with self.lock:
+            self._sync()
+            self.file.close()
+
+    def _sync(self, force=False):
+        if self.pending or force:
+            self.file.flush()
+            os.fsync(self.file.fileno())
+            self.syncs += 1
+            self.pending = 0
+            self.oldest_pending = None
+
+    def _flush_periodically(self):
+        while not self.closed.wait(self.batch_interval / 2):
+            with self.lock:
+                if self.oldest_pending is not None and \
+                        time.monotonic() - self.oldest_pending >= self.batch_interval:
+                    self._sync()
+
+
+def encode_record(op, key):
+    payload = pickle.dumps(key, pickle.HIGHEST_PROTOCOL)
+    return RECORD_HEADER.pack(zlib.crc32(payload, zlib.crc32(bytes((op, )))), len(payload), op) + payload
+
+
+# Yields (op, key, end offset) for every complete, uncorrupted record of a file opened in binary mode.
+def read_records(stream):
+    offset = 0
+    while True:
+        header = stream.read(RECORD_HEADER.size)
+        if len(header) < RECORD_HEADER.size:
+            return
+        crc, length, op = RECORD_HEADER.unpack(header)
+        payload = stream.read(length)
+        if len(payload) < length or zlib.crc32(payload, zlib.crc32(bytes((op, )))) != crc:
+            return
+        offset += RECORD_HEADER.size + length
+        yield op, pickle.loads(payload), offset
@@ -0,0 +1,131 @@
+import os
+import zlib
+from multiprocessing import Pipe, Process
+
+from controllers import StructureController
+from generic_utils.exists import exists
+
+# Structure name used in contains() -> StructureController attribute
+STRUCTURES = {
+    'list': 'main_list',
+    'queue': 'main_queue',
+    'stack': 'main_stack',
+    'avl': 'avl_tree',
+    'btree': 'b_tree',
+}
+TREES = ('avl', 'btree')
+
+
+# Spreads named StructureController instances over worker processes, one process per shard. An
+# instance lives on the shard picked by a stable hash of its name and is created on first use.
+# execute_many() sends every shard its part of a batch at once, so the shards work in parallel,
+# and reads that span all instances (contains, print_all) are scattered to every shard and the
+# answers gathered. Commands use the batch syntax of StructureController.execute_command.
+class ShardedController:
+
+    def __init__(self, shards=None):
+        self.connections = []
+        self.workers = []
+        for _ in range(shards or os.cpu_count() or 1):
+            connection, worker_connection = Pipe()
+            worker = Process(target=_run_shard, args=(worker_connection, ), daemon=True)
+            worker.start()
+            self.connections.append(connection)
+            self.workers.append(worker)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def shard_of(self, name):
+        return zlib.crc32(name.encode('utf-8')) % len(self.connections)
+
+    # Returns (valid, output) for one command on the named instance.
+    def execute(self, name, line):
+        return self.execute_many([(name, line)])[0]
+
+    # Runs (name, command) pairs and returns their (valid, output) results in the same order.
+    # Commands for the same instance run in the order given.
+    def execute_many(self, requests):
+        batches = [[] for _ in self.connections]
+        positions = [[] for _ in self.connections]
+        for position, (name, line) in enumerate(requests):
+            shard = self.shard_of(name)
+            batches[shard].append((name, line))
+            positions[shard].append(position)
+
+        for connection, batch in zip(self.connections, batches):
+            if batch:
+                connection.send(('execute', batch))
+        results = [None] * len(requests)
+        for connection, batch, shard_positions in zip(self.connections, batches, positions):
+            if batch:
+                for position, result in zip(shard_positions, connection.recv()):
+                    results[position] = result
+        return results
+
+    # Returns the sorted names of the instances whose structure ('list', 'queue', 'stack', 'avl'
+    # or 'btree') holds value.
+    def contains(self, structure, value):
+        if structure not in STRUCTURES:
+            raise ValueError('Unknown structure ' + str(structure) + '.')
+        return sorted(name for names in self._scatter(('contains', (structure, value))) for name in names)
+
+    # Returns {name: printed structures} for every instance.
+    def print_all(self):
+        outputs = {}
+        for shard_outputs in self._scatter(('print', None)):
+            outputs.update(shard_outputs)
+        return outputs
+
+    def instances(self):
+        return sorted(name for names in self._scatter(('instances', None)) for name in names)
+
+    def close(self):
+        for connection, worker in zip(self.connections, self.workers):
+            connection.send(('close', None))
+            worker.join()
+            connection.close()
+        self.connections, self.workers = [], []
+
+    def _scatter(self, message):
+        for connection in self.connections:
+            connection.send(message)
+        return [connection.recv() for connection in self.connections]
+
+
+def _run_shard(connection):
+    controllers = {}
+    while True:
+        kind, argument = connection.recv()
+        if kind == 'execute':
+            results = []
+            for name, line in argument:
+                if name not in controllers:
+                    controllers[name] = StructureController()
+                results.append(controllers[name].execute_captured(line))
+            connection.send(results)
+
+        elif kind == 'contains':
+            structure, value = argument
+            if structure in TREES:
+                try:
+                    value = int(value)
+                except ValueError:
+                    connection.send([])
+                    continue
+            connection.send([name for name, controller in controllers.items()
+                             if exists(value, getattr(controller, STRUCTURES[structure]))])
+
+        elif kind == 'print':
+            connection.send({name: controller.execute_captured('print')[1] for name, controller in controllers.items()})
+
+        elif kind == 'instances':
+            connection.send(list(controllers))
+
+        else:
+            connection.close()
+            return
+
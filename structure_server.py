@@ -0,0 +1,126 @@
+import asyncio
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from controllers import StructureController
+
+DEFAULT_PORT = 8765
+READ_SIZE = 65536
+MAX_LINE = 8192  # Longer requests are answered with ERR, so a client cannot make the buffer grow without bound
+
+
+# Shares one StructureController between any number of clients. The protocol is line based:
+# every request is a batch command (see controllers.BATCH_COMMANDS) ending in a newline, and every
+# response is "OK <length>" or "ERR <length>" on its own line followed by that many bytes of UTF-8
+# output, the text the menu would have printed. Responses come back in request order, so clients
+# can pipeline; all requests that arrive in one read are answered with one write. A request
+# longer than MAX_LINE bytes is discarded as it arrives and answered with ERR.
+#
+# The socket is unauthenticated, so save and load are refused unless the server was given a
+# snapshot directory, and then only take a plain file name inside it.
+class StructureServer:
+
+    def __init__(self, controller=None, snapshot_directory=None):
+        if snapshot_directory is not None and len(snapshot_directory.split()) != 1:
+            raise ValueError('Snapshot directory path must not contain whitespace')  # Commands split on it
+        self.controller = controller or StructureController()
+        self.snapshot_directory = snapshot_directory
+        # A single worker keeps commands from interleaving, while the event loop stays free to
+        # serve other clients during a long save, load or print
+        self.executor = ThreadPoolExecutor(max_workers=1)
+
+    async def handle_client(self, reader, writer):
+        pending = b''
+        oversized = False  # Whether the bytes before pending belonged to a line already over MAX_LINE
+        try:
+            while True:
+                data = await reader.read(READ_SIZE)
+                if not data:
+                    break
+                lines = (pending + data).split(b'\n')
+                pending = lines.pop()
+                if oversized and lines:
+                    lines[0] = None
+                    oversized = False
+                lines = [None if line is not None and len(line) > MAX_LINE else line for line in lines]
+                if len(pending) > MAX_LINE:
+                    pending = b''
+                    oversized = True
+                if lines:
+                    response = await asyncio.get_running_loop().run_in_executor(
+                        self.executor, self.respond_all, lines)
+                    writer.write(response)
+                    await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def respond_all(self, lines):
+        return b''.join(self.respond(line) for line in lines)
+
+    # line is the raw request without its newline, or None for one that was longer than MAX_LINE.
+    def respond(self, line):
+        if line is None:
+            return self.encode(False, 'Request is longer than ' + str(MAX_LINE) + ' bytes.')
+        try:
+            line = line.decode('utf-8')
+        except UnicodeDecodeError as error:
+            valid, output = False, str(error)
+        else:
+            words = line.split()
+            if words and words[0] in ('save', 'load'):
+                line = self.snapshot_command(words)
+            if line is None:
+                valid, output = False, 'Snapshots are disabled or the file name is not allowed.'
+            else:
+                valid, output = self.controller.execute_captured(line)
+        return self.encode(valid, output)
+
+    @staticmethod
+    def encode(valid, output):
+        body = output.encode('utf-8')
+        return ('OK ' if valid else 'ERR ').encode('ascii') + str(len(body)).encode('ascii') + b'\n' + body
+
+    # Rewrites "save <name>" or "load <name>" to a path inside the snapshot directory, or returns
+    # None if snapshots are disabled or name is not a plain file name.
+    def snapshot_command(self, words):
+        if self.snapshot_directory is None or len(words) != 2:
+            return None
+        name = words[1]
+        if name in ('.', '..') or os.path.basename(name) != name or (os.altsep and os.altsep in name):
+            return None
+        return words[0] + ' ' + os.path.join(self.snapshot_directory, name)
+
+
+# address is a TCP port on localhost, or the path of a Unix domain socket. save and load are only
+# served if snapshot_directory is given.
+async def serve(address, snapshot_directory=None):
+    server = StructureServer(snapshot_directory=snapshot_directory)
+    if isinstance(address, int):
+        listener = await asyncio.start_server(server.handle_client, '127.0.0.1', address)
+    else:
+        listener = await asyncio.start_unix_server(server.handle_client, address)
+    async with listener:
+        await listener.serve_forever()
+
+
+# Opens a connection to a server started with serve(); returns (reader, writer).
+async def connect(address):
+    if isinstance(address, int):
+        return await asyncio.open_connection('127.0.0.1', address)
+    return await asyncio.open_unix_connection(address)
+
+
+def parse_address(argument):
+    return int(argument) if argument.isdigit() else argument
+
+
+if __name__ == '__main__':
+    # python structure_server.py [port | unix socket path] [snapshot directory]
+    try:
+        asyncio.run(serve(parse_address(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_PORT,
+                          sys.argv[2] if len(sys.argv) > 2 else None))
+    except KeyboardInterrupt:
+        pass
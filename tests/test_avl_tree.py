@@ -0,0 +1,124 @@
+import random
+import unittest
+
+from models.augmented_avl_tree import AugmentedAVLTree, SUM, MIN, COUNT
+from models.avl_tree import AVLTree
+
+
+# Checks the parent links, balance factors and ordering of every node, and the aggregates of an
+# augmented tree.
+def check_structure(tree):
+    def check(node, parent, low, high):
+        if not node:
+            return 0
+        assert node.parent is parent, 'Invalid parent link'
+        assert (low is None or low < node.value) and (high is None or node.value < high), 'Invalid ordering'
+        left_height = check(node.left, node, low, node.value)
+        right_height = check(node.right, node, node.value, high)
+        assert node.balance_factor == right_height - left_height, 'Invalid balance factor'
+        assert abs(node.balance_factor) <= 1, 'Unbalanced node'
+        if isinstance(tree, AugmentedAVLTree):
+            combine = tree.monoid.combine
+            assert node.aggregate == combine(combine(tree._aggregate_of(node.left), tree.monoid.lift(node.value)),
+                                             tree._aggregate_of(node.right)), 'Invalid aggregate'
+        return max(left_height, right_height) + 1
+
+    check(tree.root, None, None, None)
+
+
+class AVLTreeTest(unittest.TestCase):
+
+    def setUp(self):
+        self.random = random.Random(1)
+
+    def new_tree(self, values):
+        # Alternate between incremental and linear-time construction
+        if self.random.random() < 0.5:
+            return AVLTree.from_iterable(values)
+        tree = AVLTree()
+        for value in values:
+            tree.add_element(value)
+        return tree
+
+    def from_sorted(self, values):
+        return AVLTree.from_sorted(values)
+
+    def assert_matches(self, tree, reference):
+        check_structure(tree)
+        self.assertEqual(list(tree), sorted(reference))
+
+    def random_set(self):
+        return set(self.random.sample(range(400), self.random.randint(0, 120)))
+
+    def test_from_sorted_builds_a_balanced_tree(self):
+        for size in range(70):
+            tree = self.from_sorted(range(size))
+            self.assert_matches(tree, range(size))
+            self.assertLessEqual(tree.height(tree.root), size.bit_length())
+            tree.add_element(size)
+            self.assert_matches(tree, range(size + 1))
+        with self.assertRaises(ValueError):
+            self.from_sorted([1, 3, 2])
+
+    def test_set_operations(self):
+        for _ in range(100):
+            first, second = self.random_set(), self.random_set()
+            for operation, expected in (('union', first | second), ('intersection', first & second),
+                                        ('difference', first - second)):
+                tree, other = self.new_tree(first), self.new_tree(second)
+                getattr(tree, operation)(other)
+                self.assert_matches(tree, expected)
+
+    def test_split_and_join(self):
+        for _ in range(100):
+            values, pivot = self.random_set(), self.random.randrange(400)
+            smaller, found, greater = self.new_tree(values).split(pivot)
+            self.assertEqual(found, pivot in values)
+            self.assert_matches(smaller, {value for value in values if value < pivot})
+            self.assert_matches(greater, {value for value in values if value > pivot})
+
+            joined = type(smaller).join(smaller, pivot, greater)
+            self.assert_matches(joined, values | {pivot})
+            joined.add_element(1000)
+            self.assert_matches(joined, values | {pivot, 1000})
+
+
+class AugmentedAVLTreeTest(AVLTreeTest):
+
+    def setUp(self):
+        super().setUp()
+        self.monoid = SUM
+
+    def new_tree(self, values):
+        if self.random.random() < 0.5:
+            return AugmentedAVLTree.from_iterable(values, self.monoid)
+        tree = AugmentedAVLTree(self.monoid)
+        for value in values:
+            tree.add_element(value)
+        return tree
+
+    def from_sorted(self, values):
+        return AugmentedAVLTree.from_sorted(values, self.monoid)
+
+    def assert_matches(self, tree, reference):
+        super().assert_matches(tree, reference)
+        for _ in range(5):
+            low, high = sorted(self.random.sample(range(-5, 405), 2))
+            selected = [value for value in reference if low <= value <= high]
+            expected = {SUM: sum(selected), MIN: min(selected, default=MIN.identity), COUNT: len(selected)}
+            self.assertEqual(tree.aggregate(low, high), expected[self.monoid])
+
+    def test_other_monoids(self):
+        for self.monoid in (MIN, COUNT):
+            self.test_set_operations()
+            self.test_split_and_join()
+
+    def test_rejects_mismatched_operands(self):
+        with self.assertRaises(ValueError):
+            AugmentedAVLTree.from_sorted([1], SUM).union(AugmentedAVLTree.from_sorted([2], MIN))
+        with self.assertRaises(TypeError):
+            AugmentedAVLTree.from_sorted([1], SUM).union(AVLTree.from_sorted([2]))
+
+
+if __name__ == '__main__':
+    unittest.main()
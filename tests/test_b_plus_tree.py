@@ -0,0 +1,84 @@
+import random
+import unittest
+
+from models.b_plus_tree import BPlusTree
+
+
+# The reference is a sorted list of (key, insertion number, value), so duplicate keys keep their
+# insertion order like the tree does.
+class BPlusTreeTest(unittest.TestCase):
+
+    def setUp(self):
+        self.random = random.Random(1)
+
+    def assert_matches(self, tree, reference):
+        tree.check_structure()
+        self.assertEqual(list(tree.items()), [(key, value) for key, _, value in reference])
+        self.assertEqual(list(reversed(tree)), [key for key, _, _ in reversed(reference)])
+        self.assertEqual(len(tree), len(reference))
+
+    def test_mixed_operations(self):
+        for _ in range(60):
+            degree, universe = self.random.randint(2, 5), self.random.choice((10, 50, 500))
+            if self.random.random() < 0.3:
+                keys = sorted(self.random.randint(0, universe) for _ in range(self.random.randint(0, 200)))
+                reference = [(key, i, 'v' + str(i)) for i, key in enumerate(keys)]
+                tree = BPlusTree.bulkload([(key, value) for key, _, value in reference], degree,
+                                          self.random.choice((1.0, 0.5, 0.01)))
+            else:
+                tree, reference = BPlusTree(degree), []
+            sequence = len(reference)
+
+            for _ in range(200):
+                key = self.random.randint(0, universe)
+                if self.random.random() < 0.55:
+                    tree.insert(key, 'v' + str(sequence))
+                    reference.append((key, sequence, 'v' + str(sequence)))
+                    reference.sort()
+                    sequence += 1
+                else:
+                    first = next((entry for entry in reference if entry[0] == key), None)
+                    if first is None:
+                        with self.assertRaises(KeyError):
+                            tree.remove(key)
+                    else:
+                        self.assertEqual(tree.remove(key), first[2])
+                        reference.remove(first)
+            self.assert_matches(tree, reference)
+
+            for _ in range(20):
+                low = self.random.randint(-2, universe + 2)
+                high = self.random.randint(low - 2, universe + 3)
+                expected = [(key, value) for key, _, value in reference if low <= key <= high]
+                self.assertEqual(list(tree.irange(low, high)), expected)
+                self.assertEqual(list(tree.irange(low, high, reverse=True)), expected[::-1])
+                self.assertEqual(tree.getlist(low), [value for key, _, value in reference if key == low])
+
+    def test_assignment_replaces_first_pair(self):
+        tree = BPlusTree(2)
+        tree[1] = 'a'
+        tree[1] = 'b'
+        self.assertEqual(tree[1], 'b')
+        self.assertEqual(len(tree), 1)
+
+        for i in range(20):
+            tree.insert(5, i)
+        tree[5] = 'first'
+        self.assertEqual(tree.getlist(5), ['first'] + list(range(1, 20)))
+        tree.check_structure()
+
+    def test_assignment_matches_dict(self):
+        tree, reference = BPlusTree(3), {}
+        for _ in range(2000):
+            key = self.random.randrange(300)
+            if self.random.random() < 0.7:
+                tree[key] = reference[key] = self.random.random()
+            elif key in reference:
+                del tree[key]
+                del reference[key]
+        tree.check_structure()
+        self.assertEqual(list(tree.items()), sorted(reference.items()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+import bisect
+import random
+import unittest
+from unittest import mock
+
+from models.b_tree import BTree
+
+
+# Runs random single and batch inserts and removes against a reference set, checking the node
+# invariants (key counts, ordering, uniform leaf depth, subtree sizes) after every step.
+class BTreeTest(unittest.TestCase):
+
+    tree_class = BTree
+
+    def setUp(self):
+        self.random = random.Random(1)
+
+    def new_tree(self, degree):
+        return self.tree_class(degree)
+
+    def assert_matches(self, tree, reference):
+        tree.check_structure()
+        self.assertEqual(list(tree), sorted(reference))
+        self.assertEqual(len(tree), len(reference))
+
+    def random_batch(self, universe):
+        base = self.random.randrange(universe)
+        return [base + self.random.randint(-50, 150) for _ in range(self.random.randint(0, 120))]
+
+    def test_mixed_operations(self):
+        for _ in range(40):
+            tree, reference = self.new_tree(self.random.randint(2, 6)), set()
+            for _ in range(40):
+                choice = self.random.random()
+                if choice < 0.3:
+                    key = self.random.randrange(1000)
+                    tree.insert(key)
+                    reference.add(key)
+                elif choice < 0.5:
+                    key = self.random.randrange(1000)
+                    tree.discard(key)
+                    reference.discard(key)
+                elif choice < 0.75:
+                    batch = self.random_batch(1000)
+                    self.assertEqual(tree.insert_many(batch), len(set(batch) - reference))
+                    reference.update(batch)
+                else:
+                    batch = self.random_batch(1000)
+                    self.assertEqual(tree.remove_many(batch), len(set(batch) & reference))
+                    reference.difference_update(batch)
+                self.assert_matches(tree, reference)
+
+            self.assertEqual(tree.remove_many(list(reference)), len(reference))
+            self.assert_matches(tree, set())
+
+    # The gated per-step asserts must hold too, not just the final structure
+    def test_mixed_operations_with_invariant_checks(self):
+        with mock.patch.object(BTree, 'check_invariants', True):
+            self.test_mixed_operations()
+
+    def test_bulkload(self):
+        for size in list(range(40)) + [500, 2000]:
+            for degree in (2, 3, 5):
+                for fill_factor in (0.5, 1.0):
+                    tree = self.tree_class.bulkload(range(size), degree, fill_factor)
+                    self.assert_matches(tree, set(range(size)))
+        tree = self.tree_class.bulkload(range(0, 600, 2), 3, 0.6)
+        tree.insert_many(range(1, 600, 2))
+        tree.remove_many(range(0, 600, 3))
+        self.assert_matches(tree, set(range(600)) - set(range(0, 600, 3)))
+        for keys, fill_factor in (([1, 1], 1.0), ([2, 1], 1.0), ([1, 2], 0), ([1, 2], 1.5)):
+            with self.assertRaises(ValueError):
+                self.tree_class.bulkload(keys, 3, fill_factor)
+
+    def test_range_queries(self):
+        tree = self.new_tree(2)
+        for method in (tree.min, tree.max):
+            with self.assertRaises(ValueError):
+                method()
+        self.assertEqual((tree.floor(1), tree.ceiling(1), list(tree.irange())), (None, None, []))
+        keys = sorted(self.random.sample(range(0, 3000, 3), 400))
+        tree.insert_many(keys)
+        tree.remove_many(keys[::7])
+        del keys[::7]
+        self.assertEqual((tree.min(), tree.max(), list(reversed(tree))), (keys[0], keys[-1], keys[::-1]))
+        for _ in range(300):
+            lo, hi = self.random.choice((None, self.random.randrange(-10, 3010))), \
+                self.random.choice((None, self.random.randrange(-10, 3010)))
+            expected = [key for key in keys if (lo is None or lo <= key) and (hi is None or key <= hi)]
+            self.assertEqual(list(tree.irange(lo, hi)), expected)
+            self.assertEqual(list(tree.irange(lo, hi, reverse=True)), expected[::-1])
+            probe = self.random.randrange(-10, 3010)
+            i = bisect.bisect_right(keys, probe)
+            self.assertEqual(tree.floor(probe), keys[i - 1] if i > 0 else None)
+            i = bisect.bisect_left(keys, probe)
+            self.assertEqual(tree.ceiling(probe), keys[i] if i < len(keys) else None)
+
+    def test_remove_missing_raises(self):
+        tree = self.new_tree(3)
+        tree.insert_many(range(20))
+        with self.assertRaises(KeyError):
+            tree.remove(20)
+
+    def test_order_statistics(self):
+        tree = self.new_tree(3)
+        keys = sorted(set(self.random.randrange(5000) for _ in range(800)))
+        tree.insert_many(keys)
+        for _ in range(200):
+            key = self.random.randrange(-10, 5010)
+            rank = sum(1 for k in keys if k < key)
+            self.assertEqual(tree.rank(key), rank)
+            if rank < len(keys):
+                self.assertEqual(tree.select(rank), keys[rank])
+            low, high = sorted((key, self.random.randrange(5000)))
+            self.assertEqual(tree.count_range(low, high), sum(1 for k in keys if low <= k <= high))
+
+    def test_concat(self):
+        for _ in range(60):
+            degree = self.random.randint(2, 5)
+            split = self.random.randrange(2000)
+            low_keys = set(self.random.randrange(split) for _ in range(self.random.randint(0, 300))) if split else set()
+            high_keys = set(self.random.randrange(split, 4000) for _ in range(self.random.randint(0, 300)))
+            low, high = self.new_tree(degree), self.new_tree(degree)
+            low.insert_many(low_keys)
+            high.insert_many(high_keys)
+
+            # Either tree may be the one that keeps the keys
+            if self.random.random() < 0.5:
+                low.concat(high)
+                result, emptied = low, high
+            else:
+                high.concat(low)
+                result, emptied = high, low
+            self.assert_matches(result, low_keys | high_keys)
+            self.assert_matches(emptied, set())
+
+            result.insert_many(self.random_batch(4000))
+            result.check_structure()
+
+    def test_parallel_build(self):
+        keys = [self.random.randrange(20000) for _ in range(5000)]
+        for processes in (1, 3):
+            tree = self.tree_class.parallel_build(keys, 3, processes, fill_factor=0.8)
+            self.assert_matches(tree, set(keys))
+            tree.insert_many(range(0, 20000, 5))
+            self.assert_matches(tree, set(keys) | set(range(0, 20000, 5)))
+
+    def test_concat_rejects_overlap(self):
+        left, right = self.new_tree(3), self.new_tree(3)
+        left.insert_many([1, 5])
+        right.insert_many([3, 9])
+        with self.assertRaises(ValueError):
+            left.concat(right)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import random
+import unittest
+
+from models.compact_avl_tree import CompactAVLTree, NIL
+
+
+# Checks parent links, balance factors and ordering of every reachable slot, and that the
+# reachable and the free slots together account for every slot exactly once.
+def check_structure(tree):
+    reachable = set()
+
+    def check(node, parent, low, high):
+        if node == NIL:
+            return 0
+        reachable.add(node)
+        key = tree.keys[node]
+        assert tree.parent[node] == parent, 'Invalid parent link'
+        assert (low is None or low < key) and (high is None or key < high), 'Invalid ordering'
+        left_height = check(tree.left[node], node, low, key)
+        right_height = check(tree.right[node], node, key, high)
+        assert tree.balance_factor[node] == right_height - left_height, 'Invalid balance factor'
+        assert abs(right_height - left_height) <= 1, 'Unbalanced node'
+        return max(left_height, right_height) + 1
+
+    check(tree.root, NIL, None, None)
+    free = set()
+    node = tree.free
+    while node != NIL:
+        assert node not in free and node not in reachable, 'Slot both free and in use'
+        free.add(node)
+        node = tree.left[node]
+    assert len(reachable) == tree.size == len(tree), 'Invalid size'
+    assert len(reachable) + len(free) == len(tree.keys), 'Lost slot'
+
+
+class CompactAVLTreeTest(unittest.TestCase):
+
+    def setUp(self):
+        self.random = random.Random(1)
+
+    def assert_matches(self, tree, reference):
+        check_structure(tree)
+        self.assertEqual(list(tree), sorted(reference))
+
+    def test_mixed_operations(self):
+        for _ in range(30):
+            tree, reference = CompactAVLTree(), set()
+            for _ in range(300):
+                value = self.random.randrange(-200, 200)
+                if self.random.random() < 0.6:
+                    if value not in reference:
+                        tree.add_element(value)
+                        reference.add(value)
+                elif value in reference:
+                    tree.remove(value)
+                    reference.remove(value)
+                else:
+                    with self.assertRaises(KeyError):
+                        tree.remove(value)
+                self.assertEqual(value in tree, value in reference)
+            self.assert_matches(tree, reference)
+
+    def test_rejected_key_leaves_tree_intact(self):
+        tree = CompactAVLTree()
+        for value in ('1', 1.5, 2 ** 70):
+            with self.assertRaises((TypeError, ValueError)):
+                tree.add_element(value)
+        self.assert_matches(tree, set())
+
+        tree.add_element(1)
+        tree.add_element(2)
+        tree.remove(2)
+        for value in ('1', 1.5, 2 ** 70, -2 ** 63 - 1):
+            with self.assertRaises((TypeError, ValueError)):
+                tree.add_element(value)
+        self.assert_matches(tree, {1})
+        tree.add_element(2)
+        self.assert_matches(tree, {1, 2})
+        self.assertEqual(len(tree.keys), 2)  # The freed slot was reused
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import io
+import random
+import unittest
+from contextlib import redirect_stdout
+
+from controllers import StructureController, BATCH_COMMANDS
+from generic_utils.snapshot import linked_values
+
+
+class BatchModeTest(unittest.TestCase):
+
+    def run_batch(self, controller, lines):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            executed = controller.run_batch(lines)
+        return executed, output.getvalue()
+
+    def test_commands_reach_the_structures(self):
+        controller = StructureController()
+        executed, _ = self.run_batch(controller, ['add-list 3', 'add-list 1', '# comment', '', 'add-queue 7',
+                                                  'move-queue-stack', 'add-avl 5', 'add-btree 9', 'add-btree 9'])
+        self.assertEqual(executed, 7)
+        self.assertEqual(list(linked_values(controller.main_list.head)), ['1', '3'])
+        self.assertEqual(list(linked_values(controller.main_stack.head)), ['7'])
+        self.assertIsNone(controller.main_queue.head)
+        self.assertEqual(list(controller.avl_tree), [5])
+        self.assertEqual(list(controller.b_tree), [9])
+
+    def test_failing_lines_are_reported_and_skipped(self):
+        controller = StructureController()
+        executed, output = self.run_batch(controller, ['add-list 3', 'move-stack-list', 'move-stack-list', 'bogus',
+                                                       'add-list', 'add-list 4'])
+        self.assertEqual(executed, 2)
+        self.assertIn('Line 2: command "move-stack-list" failed', output)
+        self.assertIn('Line 3: command "move-stack-list" failed', output)
+        self.assertIn('Line 4: invalid command "bogus"', output)
+        self.assertIn('Line 5: invalid command "add-list"', output)
+        self.assertEqual(list(linked_values(controller.main_list.head))[-2:], ['3', '4'])
+
+    def test_random_batches_never_stop(self):
+        generator = random.Random(1)
+        names = [name for name in BATCH_COMMANDS if name not in ('save', 'load')]
+        for _ in range(50):
+            controller = StructureController(pooled=generator.random() < 0.5, print_limit=5)
+            lines = []
+            for _ in range(100):
+                name = generator.choice(names)
+                value = generator.choice(('1', '2', '3', 'x', '-4', str(2 ** 70)))
+                lines.append(name + ' ' + value if BATCH_COMMANDS[name][1] else name)
+            executed, output = self.run_batch(controller, lines)
+            self.assertEqual(executed + output.count('failed: '), len(lines))
+
+    def test_execute_captured(self):
+        controller = StructureController()
+        self.assertEqual(controller.execute_captured('add-btree 4'), (True, ''))
+        self.assertEqual(controller.execute_captured('bogus'), (False, 'Invalid command.'))
+        valid, output = controller.execute_captured('add-btree x')
+        self.assertTrue(valid)
+        self.assertIn('only integers', output)
+        valid, output = controller.execute_captured('print')
+        self.assertIn('B Tree: [4, ]', output)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from models.durable_b_tree import DurableBTree, INSERT
+from models.write_ahead_log import WriteAheadLog
+
+
+class DurableBTreeTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.random = random.Random(1)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_recovers_after_reopen(self):
+        reference = set()
+        for _ in range(5):
+            with DurableBTree(self.directory, 3, batch_interval=0, checkpoint_every=150) as tree:
+                tree.check_structure()
+                self.assertEqual(list(tree), sorted(reference))
+                for _ in range(100):
+                    batch = [self.random.randrange(500) for _ in range(self.random.randint(1, 10))]
+                    if self.random.random() < 0.6:
+                        tree.insert_many(batch)
+                        reference.update(batch)
+                    else:
+                        tree.remove_many(batch)
+                        reference.difference_update(batch)
+
+        with DurableBTree(self.directory, 3) as tree:
+            tree.check_structure()
+            self.assertEqual(list(tree), sorted(reference))
+
+    def test_rejected_key_is_not_logged(self):
+        with DurableBTree(self.directory, 3) as tree:
+            tree.insert(1)
+            with self.assertRaises(TypeError):
+                tree.insert('x')
+        with DurableBTree(self.directory, 3) as tree:
+            self.assertEqual(list(tree), [1])
+
+    def test_replay_fails_on_bad_records(self):
+        DurableBTree(self.directory, 3).close()
+        log = WriteAheadLog(os.path.join(self.directory, 'wal'), batch_interval=0)
+        for key in (1, 'x', 2):
+            log.append(INSERT, key)
+        log.close()
+        with self.assertRaises(TypeError):
+            DurableBTree(self.directory, 3)
+
+    def test_long_log_is_checkpointed_on_open(self):
+        with DurableBTree(self.directory, 3, batch_interval=0) as tree:
+            tree.insert_many(range(100))
+        wal = os.path.join(self.directory, 'wal')
+        self.assertGreater(os.path.getsize(wal), 0)
+        with DurableBTree(self.directory, 3, checkpoint_every=50) as tree:
+            self.assertEqual(os.path.getsize(wal), 0)
+            self.assertEqual(list(tree), list(range(100)))
+
+    def test_bulkload_writes_a_checkpoint(self):
+        DurableBTree.bulkload(self.directory, range(100), 3).close()
+        with DurableBTree(self.directory, 3) as tree:
+            tree.check_structure()
+            self.assertEqual(list(tree), list(range(100)))
+            with self.assertRaises(ValueError):
+                DurableBTree.bulkload(self.directory, range(5), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
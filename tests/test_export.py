@@ -0,0 +1,95 @@
+import io
+import json
+import random
+import re
+import unittest
+
+from generic_utils.export import json_lines, dot_lines, write_json_lines, write_dot
+from models.augmented_avl_tree import AugmentedAVLTree
+from models.avl_tree import AVLTree
+from models.b_tree import BTree
+from models.lazy_b_tree import LazyBTree
+from models.list import List
+from models.queue import Queue
+
+
+class ExportTest(unittest.TestCase):
+
+    def setUp(self):
+        self.random = random.Random(1)
+
+    def test_avl_tree_json_lines_rebuild_the_tree(self):
+        values = self.random.sample(range(10000), 500)
+        tree = AVLTree()
+        for value in values:
+            tree.add_element(value)
+
+        records = [json.loads(line) for line in json_lines(tree)]
+        self.assertEqual(len(records), len(values))
+        self.assertIsNone(records[0]['parent'])
+        children = {}
+        for record in records[1:]:
+            self.assertNotIn((record['parent'], record['side']), children)
+            children[(record['parent'], record['side'])] = record
+
+        def in_order(record):
+            if record is None:
+                return []
+            return (in_order(children.get((record['id'], 'left'))) + [record['value']] +
+                    in_order(children.get((record['id'], 'right'))))
+        self.assertEqual(in_order(records[0]), sorted(values))
+
+    def test_b_tree_json_lines_match_the_nodes(self):
+        tree = BTree.bulkload(range(1000), 3)
+        records = [json.loads(line) for line in json_lines(tree)]
+        self.assertEqual(sorted(key for record in records for key in record['keys']), list(range(1000)))
+        self.assertEqual(sum(1 for record in records if record['parent'] is None), 1)
+
+    def test_linear_structures(self):
+        structure = List()
+        for value in (3, 1, 2):
+            structure.insert_ordered(value)
+        queue = Queue()
+        for value in ('a', None, 'c'):
+            queue.receive(value)
+        self.assertEqual([json.loads(line)['value'] for line in json_lines(structure)], [1, 2, 3])
+        self.assertEqual([json.loads(line)['value'] for line in json_lines(queue)], ['a', None, 'c'])
+
+    def test_dot_is_well_formed(self):
+        for tree in (AVLTree.from_sorted(range(100)), AugmentedAVLTree.from_sorted(range(100)),
+                     BTree.bulkload(range(100), 2)):
+            output = io.StringIO()
+            write_dot(tree, output)
+            lines = output.getvalue().splitlines()
+            self.assertTrue(lines[0].startswith('digraph') and lines[-1] == '}')
+            nodes = sum(1 for line in lines if '[label=' in line and '->' not in line)
+            edges = sum(1 for line in lines if '->' in line)
+            self.assertEqual(edges, nodes - 1)
+        with self.assertRaises(TypeError):
+            dot_lines(List())
+
+    def test_dot_labels_keep_unicode(self):
+        tree = AVLTree()
+        tree.add_element('ñandú')
+        self.assertIn('ñandú', ''.join(dot_lines(tree)))
+
+    def test_lazy_b_tree_exports_live_keys_only(self):
+        tree = LazyBTree(2, range(60), compact_threshold=None)
+        removed = set(self.random.sample(range(60), 20))
+        tree.remove_many(removed)
+        output = io.StringIO()
+        write_json_lines(tree, output)
+        keys = [key for line in output.getvalue().splitlines() for key in json.loads(line)['keys']]
+        self.assertEqual(sorted(keys), [key for key in range(60) if key not in removed])
+
+        labels = re.findall(r'label="([^"]*)"', ''.join(dot_lines(tree)))
+        dot_keys = [int(key) for label in labels for key in label.split(' | ') if key]
+        self.assertEqual(sorted(dot_keys), sorted(keys))
+
+        # Exporting is read-only: the tombstones are still there
+        self.assertEqual(tree.tombstones, removed)
+        tree.check_structure()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import bisect
+import random
+import unittest
+from array import array
+
+from models.b_tree import BTree
+from models.eytzinger_index import EytzingerIndex
+from models.int_b_tree import IntBTree
+
+
+class EytzingerIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.random = random.Random(1)
+
+    def assert_matches(self, index, keys):
+        self.assertEqual(len(index), len(keys))
+        self.assertEqual(list(index), keys)
+        probes = [self.random.randint(-5, 2 * len(keys) + 5) for _ in range(50)] + keys
+        self.assertEqual(index.contains_many(probes), [probe in keys for probe in probes])
+        for probe in probes:
+            self.assertEqual(probe in index, probe in keys)
+            i = bisect.bisect_left(keys, probe)
+            self.assertEqual(index.ceiling(probe), keys[i] if i < len(keys) else None)
+
+    # Every size up to a few full levels, so each shape of the last level is covered
+    def test_matches_sorted_list(self):
+        for size in range(70):
+            keys = sorted(self.random.sample(range(2 * size + 1), size))
+            self.assert_matches(EytzingerIndex(keys), keys)
+        keys = sorted(self.random.sample(range(10 ** 6), 5000))
+        self.assert_matches(EytzingerIndex(keys), keys)
+
+    def test_storage(self):
+        self.assertIsInstance(EytzingerIndex([1, 2, 2 ** 63 - 1]).slots, array)
+        self.assertIsInstance(EytzingerIndex([1, 2, 2 ** 63]).slots, list)
+        index = EytzingerIndex(['a', 'b', 'd'])
+        self.assertEqual((index.ceiling('c'), 'b' in index, 'c' in index), ('d', True, False))
+
+    def test_rejects_unsorted_keys(self):
+        for keys in ([1, 1], [2, 1]):
+            with self.assertRaises(ValueError):
+                EytzingerIndex(keys)
+
+    def test_freeze_snapshots_the_tree(self):
+        for tree_class in (BTree, IntBTree):
+            tree = tree_class(3)
+            tree.insert_many(self.random.sample(range(1000), 300))
+            index = tree.freeze()
+            keys = list(tree)
+            tree.insert(1000)
+            self.assert_matches(index, keys)
+
+
+if __name__ == '__main__':
+    unittest.main()
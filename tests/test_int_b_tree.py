@@ -0,0 +1,45 @@
+import unittest
+from array import array
+
+from models.int_b_tree import IntBTree
+from tests import test_b_tree
+
+
+def all_nodes(node):
+    yield node
+    for child in node.children or ():
+        yield from all_nodes(child)
+
+
+class IntBTreeTest(test_b_tree.BTreeTest):
+
+    tree_class = IntBTree
+
+    def test_rejects_non_integers(self):
+        tree = self.new_tree(3)
+        with self.assertRaises(TypeError):
+            tree.insert('1')
+        with self.assertRaises(ValueError):
+            tree.insert(2 ** 63)
+
+    def test_rejected_batch_changes_nothing(self):
+        tree = IntBTree(3, range(10))
+        for batch in ([20, 21, '22'], [20, 2 ** 63]):
+            with self.assertRaises((TypeError, ValueError)):
+                tree.insert_many(batch)
+        self.assert_matches(tree, set(range(10)))
+
+    # Every way of building nodes must keep the keys unboxed
+    def test_nodes_store_keys_in_arrays(self):
+        trees = [IntBTree.bulkload(range(500), 3), IntBTree(2, range(300))]
+        trees[1].remove_many(range(0, 300, 2))
+        left, right = IntBTree.bulkload(range(100), 2), IntBTree.bulkload(range(200, 900), 2)
+        left.concat(right)
+        trees.append(left)
+        for tree in trees:
+            tree.check_structure()
+            self.assertTrue(all(type(node.keys) is array for node in all_nodes(tree.root)))
+
+
+if __name__ == '__main__':
+    unittest.main()
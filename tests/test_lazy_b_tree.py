@@ -0,0 +1,41 @@
+import unittest
+
+from models.lazy_b_tree import LazyBTree
+from tests import test_b_tree
+
+
+class LazyBTreeTest(test_b_tree.BTreeTest):
+
+    tree_class = LazyBTree
+
+    def test_tombstones_are_compacted(self):
+        tree = LazyBTree(3, range(100), compact_threshold=None)
+        tree.remove_many(range(0, 100, 2))
+        self.assertEqual(len(tree.tombstones), 50)
+        self.assertEqual(list(tree), list(range(1, 100, 2)))
+        self.assertEqual(tree.compact(), 50)
+        self.assert_matches(tree, set(range(1, 100, 2)))
+
+    def test_compaction_runs_at_the_threshold(self):
+        tree = LazyBTree(3, range(100), compact_threshold=0.25)
+        for key in range(25):
+            tree.remove(key)
+        self.assertEqual(len(tree.tombstones), 25)
+        tree.remove(25)
+        self.assertEqual(len(tree.tombstones), 0)
+        self.assert_matches(tree, set(range(26, 100)))
+
+    def test_tombstoned_keys_can_come_back(self):
+        tree = LazyBTree(3, range(20), compact_threshold=None)
+        tree.remove_many(range(10))
+        self.assertEqual((tree.min(), len(tree)), (10, 10))
+        tree.insert(3)
+        self.assertEqual(tree.insert_many([4, 5, 30]), 3)
+        self.assertEqual(sorted(tree.tombstones), [0, 1, 2, 6, 7, 8, 9])
+        self.assertEqual(tree.rank(15), 8)  # Order statistics compact first
+        self.assertEqual(tree.tombstones, set())
+        self.assert_matches(tree, {3, 4, 5, 30} | set(range(10, 20)))
+
+
+if __name__ == '__main__':
+    unittest.main()
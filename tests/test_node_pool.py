@@ -0,0 +1,77 @@
+import random
+import unittest
+
+from generic_utils.snapshot import linked_values
+from models.avl_tree import AVLTree
+from models.list import List
+from models.node_pool import NodePool
+from models.queue import Queue
+from models.stack import Stack
+
+
+class NodePoolTest(unittest.TestCase):
+
+    def setUp(self):
+        self.random = random.Random(1)
+
+    def test_released_nodes_are_reused_blank(self):
+        pool = NodePool(capacity=2)
+        nodes = [pool.acquire(i, next_node=None) for i in range(3)]
+        for node in nodes:
+            pool.release(node)
+        self.assertEqual(len(pool.free), 2)
+        self.assertEqual(vars(pool.free[0]), {})
+
+        node = pool.acquire('x', left=None)
+        self.assertIn(node, nodes)
+        self.assertEqual(vars(node), {'value': 'x', 'left': None})
+        self.assertEqual((pool.allocated, pool.reused), (3, 1))
+
+    def test_pooled_structures_behave_like_unpooled(self):
+        for _ in range(20):
+            pooled = [List(NodePool()), Queue(NodePool()), Stack(NodePool()), AVLTree(NodePool())]
+            plain = [List(), Queue(), Stack(), AVLTree()]
+            for _ in range(10):
+                for _ in range(self.random.randint(0, 100)):
+                    value = self.random.randrange(1000)
+                    for structures in (pooled, plain):
+                        structures[0].insert_ordered(value)
+                        structures[1].receive(value)
+                        structures[2].push(value)
+                        if value not in structures[3]:
+                            structures[3].add_element(value)
+                for _ in range(self.random.randint(0, 30)):
+                    value = self.random.randrange(1000)
+                    for structures in (pooled, plain):
+                        structures[0].remove(value)
+                        if structures[1].head:
+                            structures[1].send()
+                        if structures[2].head:
+                            structures[2].pop()
+
+                for mine, theirs in zip(pooled[:3], plain[:3]):
+                    self.assertEqual(list(linked_values(mine.head)), list(linked_values(theirs.head)))
+                self.assertEqual(list(pooled[3]), list(plain[3]))
+
+                if self.random.random() < 0.3:
+                    for structure in pooled + plain:
+                        structure.clear()
+
+            # Every node is either in a structure or back in its pool
+            for structure in pooled:
+                structure.clear()
+                self.assertEqual(len(structure.pool.free), structure.pool.allocated)
+
+    def test_join_takes_its_node_from_the_pool(self):
+        pool = NodePool()
+        left, right = AVLTree.from_sorted(range(10), pool), AVLTree.from_sorted(range(11, 20), pool)
+        pool.release(pool.acquire(None))
+        allocated, reused = pool.allocated, pool.reused
+        joined = AVLTree.join(left, 10, right)
+        self.assertEqual(list(joined), list(range(20)))
+        self.assertEqual((pool.allocated, pool.reused), (allocated, reused + 1))
+        self.assertIs(joined.pool, pool)
+
+
+if __name__ == '__main__':
+    unittest.main()
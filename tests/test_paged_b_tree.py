@@ -0,0 +1,118 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from models.paged_b_tree import PagedBTree
+
+
+# Walks every page from the root, checking key counts, ordering and uniform leaf depth, and that
+# no page is reachable twice or both reachable and on the free list.
+def check_structure(tree):
+    reachable = set()
+    leaf_depths = set()
+
+    def check(page_id, depth, low, high):
+        assert page_id not in reachable, 'Page reachable twice'
+        reachable.add(page_id)
+        node = tree._page(page_id)
+        keys = node.keys
+        assert page_id == tree.root or tree.minkeys <= len(keys), 'Underfull page'
+        assert len(keys) <= tree.maxkeys, 'Overfull page'
+        assert all(a < b for a, b in zip(keys, keys[1:])), 'Unsorted page'
+        assert all((low is None or low < key) and (high is None or key < high) for key in keys), 'Key out of range'
+        if node.leaf:
+            leaf_depths.add(depth)
+            return len(keys)
+        assert len(node.children) == len(keys) + 1, 'Invalid child count'
+        bounds = [low] + list(keys) + [high]
+        return len(keys) + sum(check(child, depth + 1, bounds[i], bounds[i + 1])
+                               for i, child in enumerate(node.children))
+
+    assert check(tree.root, 0, None, None) == len(tree), 'Invalid size'
+    assert len(leaf_depths) == 1, 'Leaves at different depths'
+    free, page_id = set(), tree.free_head
+    while page_id != -1:
+        assert page_id not in reachable and page_id not in free, 'Invalid free list'
+        free.add(page_id)
+        page_id = tree._page(page_id).keys[0]
+    tree._trim()
+
+
+class PagedBTreeTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'tree')
+        self.random = random.Random(1)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def open(self):
+        # Small pages and a tiny pool, so the tree is several levels deep and pages get evicted
+        return PagedBTree(self.path, page_size=128, cache_pages=4)
+
+    def assert_matches(self, tree, reference):
+        check_structure(tree)
+        self.assertEqual(list(tree), sorted(reference))
+        self.assertEqual(list(reversed(tree)), sorted(reference, reverse=True))
+
+    def test_mixed_operations_survive_reopening(self):
+        reference = set()
+        for _ in range(6):
+            with self.open() as tree:
+                self.assert_matches(tree, reference)
+                for _ in range(400):
+                    key = self.random.randrange(-3000, 3000)
+                    choice = self.random.random()
+                    if choice < 0.45:
+                        tree.insert(key)
+                        reference.add(key)
+                    elif choice < 0.8:
+                        tree.discard(key)
+                        reference.discard(key)
+                    elif choice < 0.9:
+                        batch = [key + self.random.randrange(200) for _ in range(30)]
+                        self.assertEqual(tree.insert_many(batch), len(set(batch) - reference))
+                        reference.update(batch)
+                    else:
+                        batch = [key + self.random.randrange(200) for _ in range(30)]
+                        self.assertEqual(tree.remove_many(batch), len(set(batch) & reference))
+                        reference.difference_update(batch)
+                    self.assertEqual(key in tree, key in reference)
+                self.assert_matches(tree, reference)
+
+    def test_irange_min_max(self):
+        with self.open() as tree:
+            with self.assertRaises(ValueError):
+                tree.min()
+            keys = sorted(set(self.random.randrange(10000) for _ in range(1500)))
+            tree.insert_many(keys)
+            self.assertEqual((tree.min(), tree.max()), (keys[0], keys[-1]))
+            for _ in range(200):
+                lo, hi = self.random.choice((None, self.random.randrange(-10, 10010))), \
+                    self.random.choice((None, self.random.randrange(-10, 10010)))
+                expected = [key for key in keys if (lo is None or lo <= key) and (hi is None or key <= hi)]
+                self.assertEqual(list(tree.irange(lo, hi)), expected)
+                self.assertEqual(list(tree.irange(lo, hi, reverse=True)), expected[::-1])
+
+    def test_rejected_batch_changes_nothing(self):
+        with self.open() as tree:
+            tree.insert_many([1, 2, 3])
+            for batch in ([4, 'x'], [5, 2 ** 63]):
+                with self.assertRaises((TypeError, ValueError)):
+                    tree.insert_many(batch)
+            self.assert_matches(tree, {1, 2, 3})
+
+    def test_rejects_foreign_files(self):
+        for data in (b'not a tree', b'x' * 4096):
+            with open(self.path, 'wb') as stream:
+                stream.write(data)
+            with self.assertRaises(ValueError):
+                self.open()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import random
+import unittest
+
+from controllers import StructureController
+from generic_utils.exists import exists
+from sharded_controller import ShardedController, STRUCTURES
+
+
+# Runs the same requests through a ShardedController and through one local StructureController
+# per instance name, and expects the same answers from both.
+class ShardedControllerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.random = random.Random(1)
+        self.names = ['instance-' + str(i) for i in range(7)]
+        self.commands = ['add-list ', 'add-stack ', 'add-queue ', 'add-avl ', 'add-btree ']
+
+    def random_request(self):
+        name = self.random.choice(self.names)
+        if self.random.random() < 0.1:
+            return name, self.random.choice(('move-stack-list', 'move-queue-stack', 'add-avl x', 'bogus'))
+        return name, self.random.choice(self.commands) + str(self.random.randrange(30))
+
+    def test_matches_local_controllers(self):
+        local = {}
+        with ShardedController(3) as controller:
+            for _ in range(10):
+                requests = [self.random_request() for _ in range(self.random.randint(1, 60))]
+                expected = [local.setdefault(name, StructureController()).execute_captured(line)
+                            for name, line in requests]
+                self.assertEqual(controller.execute_many(requests), expected)
+
+            self.assertEqual(controller.instances(), sorted(local))
+            self.assertEqual(controller.print_all(),
+                             {name: local_controller.execute_captured('print')[1]
+                              for name, local_controller in local.items()})
+            for structure, attribute in STRUCTURES.items():
+                for value in ('3', '17', 'x'):
+                    if structure in ('avl', 'btree'):
+                        if not value.isdigit():  # Never in an integer tree
+                            self.assertEqual(controller.contains(structure, value), [])
+                            continue
+                        lookup = int(value)
+                    else:
+                        lookup = value
+                    self.assertEqual(controller.contains(structure, value),
+                                     sorted(name for name, local_controller in local.items()
+                                            if exists(lookup, getattr(local_controller, attribute))))
+            with self.assertRaises(ValueError):
+                controller.contains('heap', '3')
+
+    def test_commands_for_one_instance_keep_their_order(self):
+        with ShardedController(2) as controller:
+            results = controller.execute_many([('a', 'add-stack 1'), ('b', 'add-stack 3'), ('a', 'add-stack 2'),
+                                               ('a', 'move-stack-list'), ('b', 'bogus')])
+            self.assertEqual([valid for valid, _ in results], [True, True, True, True, False])
+            self.assertEqual(controller.contains('list', '2'), ['a'])
+            self.assertEqual(controller.contains('stack', '1'), ['a'])
+            self.assertEqual(controller.execute('b', 'add-btree 4'), (True, ''))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import io
+import os
+import random
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from controllers import StructureController
+from generic_utils.snapshot import MAGIC, load_structures, save_structures, linked_values, write_values
+
+
+class SnapshotTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'snapshot')
+        self.random = random.Random(1)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def random_value(self):
+        return self.random.choice((None, self.random.randrange(-10 ** 6, 10 ** 6), 2 ** 80 + self.random.randrange(9),
+                                   'value ' + str(self.random.randrange(100)), 'ñandú'))
+
+    def test_round_trip(self):
+        controller = StructureController()
+        for _ in range(200):
+            controller.main_list.insert_end(self.random_value())
+            controller.main_queue.receive(self.random_value())
+            controller.main_stack.push(self.random_value())
+        for value in self.random.sample(range(-10 ** 6, 10 ** 6), 300) + [2 ** 70]:
+            controller.avl_tree.add_element(value)
+        controller.b_tree.insert_many(self.random.getrandbits(64) - 2 ** 63 for _ in range(300))
+
+        structures = (controller.main_list, controller.main_queue, controller.main_stack, controller.avl_tree,
+                      controller.b_tree)
+        save_structures(self.path, *structures)
+        loaded = load_structures(self.path)
+        for original, copy in zip(structures[:3], loaded[:3]):
+            self.assertEqual(list(linked_values(copy.head)), list(linked_values(original.head)))
+        self.assertEqual(list(loaded[3]), list(controller.avl_tree))
+        self.assertEqual(list(loaded[4]), list(controller.b_tree))
+        loaded[4].check_structure()
+
+        # The queue's tail is relinked too, so it keeps working
+        loaded[1].receive('last')
+        self.assertEqual(list(linked_values(loaded[1].head))[-1], 'last')
+
+    def write_snapshot(self, avl_values, b_tree_values):
+        with open(self.path, 'wb') as stream:
+            stream.write(MAGIC)
+            for values in ([], [], [], avl_values, b_tree_values):
+                write_values(stream, len(values), values)
+
+    def test_rejects_non_integer_tree_values(self):
+        for avl_values, b_tree_values in ((['a', 'b'], []), ([], ['a', 'b']), ([], [None]), ([], [2 ** 70])):
+            self.write_snapshot(avl_values, b_tree_values)
+            with self.assertRaises(ValueError):
+                load_structures(self.path)
+
+    def test_rejects_unsorted_tree_values(self):
+        self.write_snapshot([], [2, 1])
+        with self.assertRaises(ValueError):
+            load_structures(self.path)
+
+    def test_rejects_truncated_and_foreign_files(self):
+        controller = StructureController()
+        controller.b_tree.insert_many(range(100))
+        controller.save(self.path)
+        with open(self.path, 'rb') as stream:
+            data = stream.read()
+        for broken in (data[:-3], b'nope' + data[4:], b''):
+            with open(self.path, 'wb') as stream:
+                stream.write(broken)
+            with self.assertRaises(ValueError):
+                load_structures(self.path)
+
+    def test_menu_reports_corrupt_snapshot(self):
+        self.write_snapshot([], ['a', 'b'])
+        controller = StructureController()
+        controller.b_tree.insert(1)
+        output = io.StringIO()
+        with redirect_stdout(output):
+            controller.main_menu_selection(17, self.path)
+        self.assertIn('Corrupt snapshot', output.getvalue())
+        self.assertEqual(list(controller.b_tree), [1])
+
+
+if __name__ == '__main__':
+    unittest.main()
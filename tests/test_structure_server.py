@@ -0,0 +1,63 @@
+import asyncio
+import os
+import shutil
+import tempfile
+import unittest
+
+from structure_server import MAX_LINE, StructureServer, connect
+
+
+class StructureServerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.address = os.path.join(self.directory, 'socket')
+        self.snapshots = os.path.join(self.directory, 'snapshots')
+        os.mkdir(self.snapshots)
+        self.server = StructureServer(snapshot_directory=self.snapshots)
+
+    def tearDown(self):
+        self.server.executor.shutdown()
+        shutil.rmtree(self.directory)
+
+    # Sends the chunks as they are, one write each, and returns the (status, output) responses.
+    def exchange(self, chunks, expected):
+        async def run():
+            listener = await asyncio.start_unix_server(self.server.handle_client, self.address)
+            async with listener:
+                reader, writer = await connect(self.address)
+                for chunk in chunks:
+                    writer.write(chunk)
+                    await writer.drain()
+                responses = []
+                for _ in range(expected):
+                    status, length = (await reader.readline()).split()
+                    responses.append((status.decode('ascii'), (await reader.readexactly(int(length))).decode()))
+                writer.close()
+                return responses
+        return asyncio.run(run())
+
+    def test_pipelined_requests_are_answered_in_order(self):
+        responses = self.exchange([b'add-btree 3\nadd-btree 1\nbogus\n', b'add-list 2\n'], 4)
+        self.assertEqual([status for status, _ in responses], ['OK', 'OK', 'ERR', 'OK'])
+        self.assertEqual(list(self.server.controller.b_tree), [1, 3])
+
+    def test_oversized_requests_are_rejected(self):
+        long_line = b'add-list ' + b'9' * MAX_LINE
+        chunks = [b'add-btree 1\n' + long_line[:100], long_line[100:] * 20, b'\nadd-btree 2\n' + long_line + b'\n',
+                  b'add-btree 3\n']
+        responses = self.exchange(chunks, 5)
+        self.assertEqual([status for status, _ in responses], ['OK', 'ERR', 'OK', 'ERR', 'OK'])
+        self.assertIn('longer than', responses[1][1])
+        self.assertEqual(list(self.server.controller.b_tree), [1, 2, 3])
+        self.assertIsNone(self.server.controller.main_list.head)
+
+    def test_snapshots_stay_in_their_directory(self):
+        responses = self.exchange([b'add-btree 5\nsave state\nsave ../state\nsave /tmp/state\nload state\n'], 5)
+        self.assertEqual([status for status, _ in responses], ['OK', 'OK', 'ERR', 'ERR', 'OK'])
+        self.assertEqual(os.listdir(self.snapshots), ['state'])
+        self.assertEqual(list(self.server.controller.b_tree), [5])
+
+
+if __name__ == '__main__':
+    unittest.main()
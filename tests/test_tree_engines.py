@@ -0,0 +1,86 @@
+import math
+import random
+import unittest
+
+from generic_utils.exists import exists
+from models.red_black_tree import BLACK, RED, RedBlackTree
+from models.treap import Treap
+
+
+def nodes(node):
+    if node:
+        yield node
+        yield from nodes(node.left)
+        yield from nodes(node.right)
+
+
+def check_links(tree):
+    assert tree.root is None or tree.root.parent is None, 'Root has a parent'
+    for node in nodes(tree.root):
+        for child in (node.left, node.right):
+            assert child is None or child.parent is node, 'Broken parent link'
+
+
+# Returns the number of black nodes on every path from node down to a missing child.
+def black_height(node):
+    if not node:
+        return 1
+    assert node.color in (RED, BLACK), 'Invalid color'
+    if node.color == RED:
+        assert all(not child or child.color == BLACK for child in (node.left, node.right)), 'Red node with red child'
+    left, right = black_height(node.left), black_height(node.right)
+    assert left == right, 'Unequal black heights'
+    return left + (node.color == BLACK)
+
+
+class TreeEnginesTest(unittest.TestCase):
+
+    def setUp(self):
+        self.random = random.Random(1)
+
+    def insert_all(self, tree, values, check):
+        for value in values:
+            tree.add_element(value)
+            check_links(tree)
+            check(tree)
+            self.assertIn(value, tree)
+        self.assertEqual(list(tree), sorted(values))
+        self.assertTrue(all(exists(value, tree) for value in values))
+        self.assertFalse(exists(max(values) + 1, tree))
+
+    def workloads(self):
+        yield list(range(300))
+        yield list(range(300, 0, -1))
+        yield [self.random.randrange(100) for _ in range(300)]  # Many duplicates
+        yield self.random.sample(range(10 ** 6), 300)
+
+    def test_red_black_tree_invariants(self):
+        def check(tree):
+            self.assertEqual(tree.root.color, BLACK)
+            black_height(tree.root)
+
+        for values in self.workloads():
+            tree = RedBlackTree()
+            self.insert_all(tree, values, check)
+            self.assertLessEqual(tree.height(tree.root), 2 * math.log2(len(values) + 1))
+
+    def test_treap_invariants(self):
+        def check(tree):
+            for node in nodes(tree.root):
+                for child in (node.left, node.right):
+                    self.assertTrue(child is None or child.priority <= node.priority)
+
+        for values in self.workloads():
+            self.insert_all(Treap(seed=7), values, check)
+
+    def test_treap_seed_fixes_the_shape(self):
+        values = self.random.sample(range(1000), 200)
+        first, second = Treap(seed=3), Treap(seed=3)
+        for value in values:
+            first.add_element(value)
+            second.add_element(value)
+        self.assertEqual(first.pre_order(), second.pre_order())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,39 @@
+import unittest
+
+from models.versioned_b_tree import VersionedBTree
+from tests import test_b_tree
+
+
+class VersionedBTreeTest(test_b_tree.BTreeTest):
+
+    tree_class = VersionedBTree
+
+    def test_snapshots_are_isolated(self):
+        tree, reference = VersionedBTree(3), set()
+        snapshots = []
+        for _ in range(60):
+            if self.random.random() < 0.2:
+                snapshots.append((tree.snapshot(), set(reference)))
+            batch = self.random_batch(2000)
+            if self.random.random() < 0.6:
+                tree.insert_many(batch)
+                reference.update(batch)
+            else:
+                tree.remove_many(batch)
+                reference.difference_update(batch)
+            self.assert_matches(tree, reference)
+
+        for snapshot, contents in snapshots:
+            self.assert_matches(snapshot, contents)
+
+    def test_writes_to_a_snapshot_stay_there(self):
+        tree = VersionedBTree(2, range(200))
+        snapshot = tree.snapshot()
+        snapshot.remove_many(range(0, 200, 3))
+        snapshot.insert_many(range(200, 250))
+        self.assert_matches(tree, set(range(200)))
+        self.assert_matches(snapshot, set(range(250)) - set(range(0, 200, 3)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import io
+import random
+import re
+import unittest
+
+from controllers import StructureController
+from views import print_all_structures, write_avl_tree, write_values
+
+
+def written(function, *args, **kwargs):
+    stream = io.StringIO()
+    function(stream, *args, **kwargs)
+    return stream.getvalue()
+
+
+class ViewsTest(unittest.TestCase):
+
+    def setUp(self):
+        self.random = random.Random(1)
+        self.controller = StructureController()
+        for value in self.random.sample(range(1000), 60):
+            self.controller.add_to_structure(value, self.controller.main_list)
+            self.controller.add_to_structure(value, self.controller.main_stack)
+            self.controller.add_to_structure(value, self.controller.main_queue)
+            self.controller.avl_tree.add_element(value)
+            self.controller.b_tree.insert(value)
+
+    def test_unlimited_output_matches_str(self):
+        controller = self.controller
+        output = io.StringIO()
+        print_all_structures(controller.main_list, controller.main_queue, controller.main_stack,
+                             controller.avl_tree, controller.b_tree, stream=output)
+        self.assertEqual(output.getvalue(), 'List: ' + str(controller.main_list) + '\nQueue: ' +
+                         str(controller.main_queue) + '\nStack: ' + str(controller.main_stack) + '\nAVL Tree: ' +
+                         str(controller.avl_tree) + '\nB Tree: [' + ''.join(str(value) + ', ' for value in
+                                                                             controller.b_tree) + ']\n')
+
+    def test_limit_keeps_head_and_tail(self):
+        self.assertEqual(written(write_values, range(10), 4), '[0, 1, ... (6 more) ..., 8, 9, ]')
+        self.assertEqual(written(write_values, range(3), 4), '[0, 1, 2, ]')
+
+    def test_pages_cover_the_values(self):
+        for offset, expected in ((0, '[0, 1, 2, ..., ]'), (4, '[..., 4, 5, 6, ..., ]'), (8, '[..., 8, 9, ]'),
+                                 (12, '[..., ]')):
+            self.assertEqual(written(write_values, range(10), 3, offset), expected)
+
+    def test_avl_pages_cover_the_tree_in_pre_order(self):
+        tree = self.controller.avl_tree
+        self.assertEqual(written(write_avl_tree, tree.root), str(tree))
+        pre_order = [int(value) for value in tree.pre_order().split(' - ') if value]
+        shown = []
+        for offset in range(0, len(pre_order), 7):
+            page = written(write_avl_tree, tree.root, 7, offset)
+            shown.extend(int(value) for value in re.findall(r'Value: (-?\d+)', page))
+            self.assertEqual(page.startswith('\n...'), offset > 0)
+        self.assertEqual(shown, pre_order)
+
+    def test_offset_needs_a_limit(self):
+        with self.assertRaises(ValueError):
+            written(write_values, range(10), offset=3)
+        with self.assertRaises(ValueError):
+            written(write_avl_tree, self.controller.avl_tree.root, offset=3)
+
+
+if __name__ == '__main__':
+    unittest.main()
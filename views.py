@@ -1,3 +1,12 @@
+import itertools
+import sys
+from collections import deque
+
+from generic_utils.snapshot import linked_values
+
+_END = object()
+
+
 def main_menu_view():
     print('#####################################################')
     print('#####################################################')
@@ -20,6 +29,8 @@ def main_menu_view():
     print('13. Add and element to the B tree.')
     print('14. Print all structures.')
     print('15. Reset all structures.')
+    print('16. Save all structures to a file.')
+    print('17. Load all structures from a file.')
     return input('Select an option: ')
 
 
@@ -39,16 +50,125 @@ def remove_value_view():
     return input('Type the value you want to remove: ')
 
 
+def path_view():
+    return input('Type the file path: ')
+
+
 def invalid_selection_view():
     print('Invalid selection, please choose an option from the menu.')
 
 
-def print_all_structures(list, queue, stack, avl_tree, b_tree):
-    print('List: ' + str(list))
-    print('Queue: ' + str(queue))
-    print('Stack: ' + str(stack))
-    print('AVL Tree: ' + str(avl_tree))
-    print('B Tree: ' + str(b_tree))
+def invalid_command_view(line_number, line, error=None):
+    if error is None:
+        print('Line ' + str(line_number) + ': invalid command "' + line + '".')
+    else:
+        print('Line ' + str(line_number) + ': command "' + line + '" failed: ' + str(error))
+
+
+def batch_summary_view(operations, seconds):
+    print('Executed ' + str(operations) + ' operations in ' + '{:.3f}'.format(seconds) + ' s (' +
+          '{:.0f}'.format(operations / seconds if seconds > 0 else 0) + ' ops/sec).')
+
+
+# Writes every structure to stream (stdout by default) piece by piece, without building the whole
+# text first. With a limit, long structures are cut down to their first and last values (or the
+# first AVL tree nodes), and with an offset as well, to the page of limit values (or AVL tree nodes,
+# in pre-order) starting there.
+def print_all_structures(list, queue, stack, avl_tree, b_tree, stream=None, limit=None, offset=None):
+    _check_page(limit, offset)
+    stream = stream or sys.stdout
+    for title, values in (('List: ', linked_values(list.head)), ('Queue: ', linked_values(queue.head)),
+                          ('Stack: ', linked_values(stack.head))):
+        stream.write(title)
+        write_values(stream, values, limit, offset)
+        stream.write('\n')
+
+    stream.write('AVL Tree: ')
+    write_avl_tree(stream, avl_tree.root, limit, offset)
+    stream.write('\nB Tree: ')
+    write_values(stream, b_tree, limit, offset)
+    stream.write('\n')
+
+
+def _check_page(limit, offset):
+    if offset is not None and limit is None:
+        raise ValueError('An offset needs a limit.')
+
+
+# Writes values as "[a, b, ]" like the structures' __str__. limit keeps only the first and last
+# values (only those are held in memory); offset switches to showing limit values from there.
+def write_values(stream, values, limit=None, offset=None):
+    _check_page(limit, offset)
+    values = iter(values)
+    stream.write('[')
+    if limit is None:
+        for value in values:
+            stream.write(str(value) + ', ')
+
+    elif offset is not None:
+        if sum(1 for _ in itertools.islice(values, offset)):
+            stream.write('..., ')
+        for value in itertools.islice(values, limit):
+            stream.write(str(value) + ', ')
+        if next(values, _END) is not _END:
+            stream.write('..., ')
+
+    else:
+        for value in itertools.islice(values, limit - limit // 2):
+            stream.write(str(value) + ', ')
+        tail = deque(itertools.islice(values, limit // 2), limit // 2)
+        skipped = 0
+        for value in values:
+            tail.append(value)
+            skipped += 1
+        if skipped:
+            stream.write('... (' + str(skipped) + ' more) ..., ')
+        for value in tail:
+            stream.write(str(value) + ', ')
+    stream.write(']')
+
+
+# Writes the same nested layout as AVLTree.__str__, walking the tree with an explicit stack of
+# pending text and subtrees. With a limit, stops after that many nodes; with an offset as well,
+# first skips that many nodes in pre-order. Pending text carries the number of the node that
+# produced it, so the text of skipped nodes is dropped along with them.
+def write_avl_tree(stream, root, limit=None, offset=None):
+    _check_page(limit, offset)
+    if not root:
+        stream.write('{}')
+        return
+
+    offset = offset or 0
+    pending = [(root, 0)]
+    visited = 0
+    while pending:
+        item = pending.pop()
+        if isinstance(item[1], str):
+            if item[0] >= offset:
+                stream.write(item[1])
+            continue
+        if limit is not None and visited == offset + limit:
+            stream.write('\n...')
+            return
+
+        node, level = item
+        number = visited
+        visited += 1
+        tabs = '\t' * level
+        if number == offset and offset:
+            stream.write('\n...')
+        if number >= offset:
+            stream.write('\n' + tabs + 'Value: ' + str(node.value) + '\n')
+            stream.write(tabs + 'Balance Factor: ' + str(node.balance_factor) + '\n')
+
+        if node.right:
+            pending.extend(((node.right, level + 1), (number, tabs + 'Right: ')))
+        else:
+            pending.append((number, tabs + 'Right: None'))
+        if node.left:
+            pending.extend(((number, '\n'), (node.left, level + 1), (number, tabs + 'Left: ')))
+        else:
+            pending.append((number, tabs + 'Left: None \n'))
 
 
 def repeated_value():
@@ -63,3 +183,7 @@ def print_tree_orders(tree):
 
 def int_only_tree_error():
     print('This tree supports only integers.')
+
+
+def snapshot_error(error):
+    print('Could not save or load the structures: ' + str(error))